@@ -1,6 +1,11 @@
-from flask import Flask, jsonify, request, abort, send_from_directory, g
+from flask import Flask, Response, jsonify, request, abort, send_from_directory, g, stream_with_context
 from flask_cors import CORS
+import click
+import csv
+import hashlib
+import io
 import os
+import threading
 from typing import Optional
 from docx import Document
 from reportlab.pdfgen import canvas
@@ -8,6 +13,7 @@ from reportlab.lib.pagesizes import letter
 from dotenv import load_dotenv
 from . import table_service
 from . import models
+from . import arrow_export
 try:
     from flask_authorize import Authorize
 except Exception:
@@ -31,7 +37,8 @@ if origins_env:
     allowed_origins = [o for o in allowed_origins if not (o in seen or seen.add(o))]
 
 # Apply CORS globally so headers are set on all endpoints consistently
-CORS(app, origins=allowed_origins, supports_credentials=True)
+CORS(app, origins=allowed_origins, supports_credentials=True,
+     expose_headers=['X-Export-Watermark'])
 
 # Initialize Flask-Authorize if available
 authorize = None
@@ -69,6 +76,15 @@ def get_offset(default: int = 0) -> int:
         return default
 
 
+def _positive_int_arg(name: str) -> Optional[int]:
+    """Return a positive integer query parameter, or None when absent/invalid."""
+    try:
+        value = int(request.args.get(name, ''))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
 def ensure_pdf(doc_path: str, pdf_path: str) -> None:
     """Create a PDF from a doc/docx file if the PDF does not exist."""
     if os.path.exists(pdf_path):
@@ -108,6 +124,100 @@ if os.getenv("KEYCLOAK_REALM"):
     except Exception:
         keycloak_openid = None
 
+# Bearer tokens are verified locally against the realm's cached signing keys
+# (set KEYCLOAK_LOCAL_VERIFY=0 to ask Keycloak's userinfo endpoint instead).
+token_verifier = None
+if keycloak_openid is not None and os.getenv("KEYCLOAK_LOCAL_VERIFY", "1") != "0":
+    try:
+        from .jwt_auth import JWKSCache, TokenVerifier  # defer import
+
+        _jwks = JWKSCache(keycloak_openid.certs)
+        token_verifier = TokenVerifier(
+            _jwks,
+            issuer=os.getenv("KEYCLOAK_ISSUER") or "{}/realms/{}".format(
+                os.getenv("KEYCLOAK_URL", "http://localhost:8080/").rstrip("/"),
+                os.getenv("KEYCLOAK_REALM"),
+            ),
+            audience=os.getenv("KEYCLOAK_AUDIENCE") or os.getenv("KEYCLOAK_CLIENT_ID"),
+            introspect=(
+                keycloak_openid.introspect
+                if os.getenv("KEYCLOAK_INTROSPECT_FALLBACK") == "1"
+                else None
+            ),
+        )
+        _jwks.start_refresher(float(os.getenv("KEYCLOAK_JWKS_REFRESH", "300")))
+    except Exception:
+        app.logger.exception("Local token verification unavailable; using userinfo")
+        token_verifier = None
+
+
+# Optionally keep the local patients mirror current from inside the app. The
+# thread is started by the first request so CLI commands (``flask
+# sync-patients`` among them) never run a second sync alongside their own.
+_patients_sync_interval = float(os.getenv("PATIENTS_SYNC_INTERVAL", "0"))
+_patients_sync_lock = threading.Lock()
+_patients_sync_thread = None
+
+
+@app.before_request
+def _start_patients_sync():
+    global _patients_sync_thread
+    if _patients_sync_interval <= 0 or _patients_sync_thread is not None:
+        return
+    with _patients_sync_lock:
+        if _patients_sync_thread is None:
+            _patients_sync_thread = table_service.start_patients_sync_thread(
+                _patients_sync_interval
+            )
+
+
+def _verify_bearer_token(token: str) -> None:
+    """Raise unless ``token`` is valid; keep its claims on ``g.token_claims``."""
+    if token_verifier is not None:
+        g.token_claims = token_verifier.verify(token)
+    else:
+        keycloak_openid.userinfo(token)
+
+
+def _read_actor() -> str:
+    """Identify the caller for read-your-writes routing (not for auth)."""
+    for header in ("X-Remote-User", "X-Dev-User"):
+        value = request.headers.get(header)
+        if value:
+            return f"user:{value}"
+    auth = request.headers.get("Authorization")
+    if auth:
+        return "token:" + hashlib.sha256(auth.encode()).hexdigest()
+    return f"addr:{request.remote_addr}"
+
+
+@app.before_request
+def _bind_read_actor():
+    g.read_actor_token = table_service.set_read_actor(_read_actor())
+
+
+@app.before_request
+def _begin_request_sessions():
+    g.request_sessions_token = table_service.begin_request_sessions()
+
+
+@app.teardown_appcontext
+def _close_request_sessions(_exc=None):
+    token = g.pop("request_sessions_token", None)
+    if token is not None:
+        table_service.end_request_sessions(token)
+
+
+@app.teardown_request
+def _unbind_read_actor(_exc=None):
+    token = g.pop("read_actor_token", None)
+    if token is not None:
+        try:
+            table_service.reset_read_actor(token)
+        except ValueError:
+            # Reset from a different context (e.g. a streamed response).
+            pass
+
 
 def _load_user_from_remote_header() -> Optional[dict]:
     """Return user dict from X-Remote-User header if present, else None.
@@ -118,25 +228,12 @@ def _load_user_from_remote_header() -> Optional[dict]:
     remote_user = request.headers.get("X-Remote-User")
     if not remote_user:
         return None
-    session = models.get_session()
-    try:
-        # Use the login column per application-level authorization rules
-        user = session.query(models.Users).filter_by(login=remote_user).first()
-        if user is None:
-            abort(403)
-        auth_user = {
-            "id": user.id,
-            "username": user.username,
-            "admin": bool(user.admin_flag),
-            "uploader": bool(user.uploader_flag),
-            "reviewer": bool(user.reviewer_flag),
-            "third_reviewer": bool(user.third_reviewer_flag),
-            "site": user.site,
-        }
-        g.auth_user = auth_user
-        return auth_user
-    finally:
-        session.close()
+    # Use the login column per application-level authorization rules
+    auth_user = table_service.get_auth_user(remote_user)
+    if auth_user is None:
+        abort(403)
+    g.auth_user = auth_user
+    return auth_user
 
     
 
@@ -166,22 +263,10 @@ def requires_auth(func):
             dev_login = request.headers.get("X-Dev-User")
             if dev_login:
                 # Reuse the same logic as header-based auth but with explicit login
-                session = models.get_session()
-                try:
-                    user = session.query(models.Users).filter_by(login=dev_login).first()
-                    if user is None:
-                        abort(403)
-                    g.auth_user = {
-                        "id": user.id,
-                        "username": user.username,
-                        "admin": bool(user.admin_flag),
-                        "uploader": bool(user.uploader_flag),
-                        "reviewer": bool(user.reviewer_flag),
-                        "third_reviewer": bool(user.third_reviewer_flag),
-                        "site": user.site,
-                    }
-                finally:
-                    session.close()
+                auth_user = table_service.get_auth_user(dev_login)
+                if auth_user is None:
+                    abort(403)
+                g.auth_user = auth_user
                 return func(*args, **kwargs)
 
         # Fallback to Keycloak if configured: require a valid Bearer token
@@ -191,7 +276,7 @@ def requires_auth(func):
                 abort(401)
             token = auth.split(" ", 1)[1]
             try:
-                keycloak_openid.userinfo(token)
+                _verify_bearer_token(token)
             except Exception:
                 abort(401)
             return func(*args, **kwargs)
@@ -301,11 +386,17 @@ def get_events():
               type: array
               items:
                 type: object
+            degraded:
+              type: boolean
+              description: Present when patient sites timed out (site is null)
     """
     limit = get_limit()
     offset = get_offset()
     try:
         rows = table_service.get_events_with_patient_site(limit, offset)
+        if getattr(rows, 'degraded', False):
+            # Sites could not be resolved in time; rows carry site: null.
+            return jsonify({'data': rows, 'degraded': True})
         return jsonify({'data': rows})
     except Exception:
         app.logger.exception("Failed to fetch event data")
@@ -403,6 +494,12 @@ def events_need_reupload():
 def events_status_summary():
     """Summary counts of events grouped by status.
     ---
+    parameters:
+      - name: by_site
+        in: query
+        type: boolean
+        required: false
+        description: Break each status down by patient site
     responses:
       200:
         description: Event summary
@@ -414,14 +511,40 @@ def events_status_summary():
               additionalProperties:
                 type: integer
     """
+    by_site = request.args.get('by_site', '').lower() in ('1', 'true', 'yes')
     try:
-        summary = table_service.get_event_status_summary()
+        summary = table_service.get_event_status_summary(by_site=by_site)
         return jsonify({'data': summary})
     except Exception:
         app.logger.exception("Failed to fetch table data")
         return jsonify({'error': 'Failed to fetch table data'}), 500
 
 
+@app.route('/api/events/pipeline_summary')
+@requires_auth
+@requires_roles('admin')
+def events_pipeline_summary():
+    """Number of events waiting in each workflow phase.
+    ---
+    parameters:
+      - name: by_site
+        in: query
+        type: boolean
+        required: false
+        description: Break the counts down by patient site
+    responses:
+      200:
+        description: Counts keyed by phase (or by site, then phase)
+    """
+    by_site = request.args.get('by_site', '').lower() in ('1', 'true', 'yes')
+    try:
+        summary = table_service.get_pipeline_summary_cached(by_site=by_site)
+        return jsonify({'data': summary})
+    except Exception:
+        app.logger.exception("Failed to fetch pipeline summary")
+        return jsonify({'error': 'Failed to fetch table data'}), 500
+
+
 # Generic endpoint to fetch events by status with pagination
 _ALLOWED_EVENT_STATUSES = {
     'created',
@@ -440,23 +563,144 @@ _ALLOWED_EVENT_STATUSES = {
 }
 
 
+@app.route('/api/events/by_status')
 @app.route('/api/events/by_status/<status>')
 @requires_auth
 @requires_any_role('reviewer', 'uploader', 'admin')
-def events_by_status(status: str):
-    status = (status or '').strip()
-    if status not in _ALLOWED_EVENT_STATUSES:
-        abort(400)
+def events_by_status(status: Optional[str] = None):
+    """Events with the given status(es), paged by offset or by ``after`` cursor.
+    ---
+    parameters:
+      - name: status
+        in: path
+        type: string
+        required: false
+        description: One status, or several comma-separated (also accepted as ``?status=``)
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: Cursor from the previous page's ``next`` field
+      - name: match
+        in: query
+        type: string
+        required: false
+        description: "``smart`` (default) id/date/site_patient_id search or ``contains`` substring search"
+    responses:
+      200:
+        description: Event rows with total count and next-page cursor
+    """
+    statuses = []
+    for value in (status or request.args.get('status') or '').split(','):
+        value = value.strip()
+        if value not in _ALLOWED_EVENT_STATUSES:
+            abort(400)
+        if value not in statuses:
+            statuses.append(value)
+    status = statuses[0] if len(statuses) == 1 else statuses
     limit = get_limit()
     offset = get_offset()
+    q = request.args.get('q') or None
+    site = request.args.get('site') or None
+    after = request.args.get('after') or None
+    match = request.args.get('match') or None
     try:
-        rows = table_service.get_events_by_status(status, limit, offset)
-        return jsonify({'data': rows})
+        rows, total = table_service.get_events_by_status_with_total(
+            status, limit, offset, q, site, after, match
+        )
+        return jsonify({
+            'data': rows,
+            'total': total,
+            'next': table_service.next_cursor(rows, limit=limit) if limit is not None else None,
+        })
+    except table_service.ValidationError as ve:
+        return jsonify({'error': str(ve)}), 400
     except Exception:
         app.logger.exception("Failed to fetch events by status %s", status)
         return jsonify({'error': 'Failed to fetch table data'}), 500
 
 
+def _csv_chunks(rows, chunk_bytes: int = 64 * 1024, fieldnames: Optional[list] = None):
+    """Encode dict rows as CSV, yielding roughly ``chunk_bytes`` at a time.
+
+    With ``fieldnames`` the header is written up front, so even no rows
+    produce a header line; otherwise it is taken from the first row.
+    """
+    buf = io.StringIO()
+    writer = None
+    if fieldnames is not None:
+        writer = csv.DictWriter(buf, fieldnames=fieldnames)
+        writer.writeheader()
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buf, fieldnames=list(row.keys()))
+            writer.writeheader()
+        writer.writerow(row)
+        if buf.tell() >= chunk_bytes:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue()
+
+
+@app.route('/api/events/export')
+@app.route('/api/events/export.csv', defaults={'fmt': 'csv'})
+@app.route('/api/events/export.parquet', defaults={'fmt': 'parquet'})
+@app.route('/api/events/export.arrow', defaults={'fmt': 'arrow'})
+@requires_auth
+@requires_roles('admin')
+def events_export(fmt: Optional[str] = None):
+    """Stream the adjudication export as CSV, Parquet or an Arrow IPC stream.
+    ---
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        description: csv (default), parquet or arrow; implied by the path suffix
+      - name: since
+        in: query
+        type: string
+        required: false
+        description: Only export events changed at or after this watermark
+    responses:
+      200:
+        description: One row per event; X-Export-Watermark holds the next since
+      501:
+        description: Columnar format requested but pyarrow is not installed
+    """
+    fmt = fmt or request.args.get('format', 'csv')
+    if fmt != 'csv' and fmt not in arrow_export.FORMATS:
+        abort(400)
+    if fmt != 'csv':
+        try:
+            arrow_export.export_schema()
+        except arrow_export.PyArrowUnavailable as exc:
+            return jsonify({'error': str(exc)}), 501
+    try:
+        watermark = table_service.export_watermark()
+        rows = table_service.iter_events_export_rows(
+            _positive_int_arg('chunk_size'),
+            _positive_int_arg('workers'),
+            since=request.args.get('since'),
+        )
+    except table_service.ValidationError as ve:
+        return jsonify({'error': str(ve)}), 400
+    headers = {
+        'Content-Disposition': f'attachment; filename=events_export.{fmt}',
+        'X-Export-Watermark': watermark,
+    }
+    if fmt == 'csv':
+        chunks = _csv_chunks(rows, fieldnames=arrow_export.export_column_names())
+        return Response(stream_with_context(chunks), mimetype='text/csv', headers=headers)
+    return Response(
+        stream_with_context(arrow_export.iter_export_chunks(rows, fmt)),
+        mimetype=arrow_export.FORMATS[fmt],
+        headers=headers,
+    )
+
+
 @app.route('/api/users', methods=['POST'])
 @requires_auth
 @requires_roles('admin')
@@ -471,6 +715,71 @@ def add_user():
         return jsonify({'error': 'Failed to create user'}), 500
 
 
+@app.route('/api/health/cache')
+@requires_auth
+@requires_roles('admin')
+def health_cache():
+    """Hit/miss counters for the backend's in-process caches.
+    ---
+    responses:
+      200:
+        description: Cache statistics keyed by cache name
+    """
+    return jsonify({'data': table_service.get_cache_stats()})
+
+
+@app.route('/api/health/cache/purge', methods=['POST'])
+@requires_auth
+@requires_roles('admin')
+def health_cache_purge():
+    """Empty an in-process cache (all of them without ``name``).
+    ---
+    parameters:
+      - name: name
+        in: query
+        type: string
+        required: false
+        description: results, auth_users or patient_sites
+    responses:
+      200:
+        description: Names of the purged caches
+      400:
+        description: Unknown cache name
+    """
+    try:
+        purged = table_service.purge_cache(request.args.get('name') or None)
+    except table_service.ValidationError as ve:
+        return jsonify({'error': str(ve)}), 400
+    return jsonify({'data': {'purged': purged}})
+
+
+@app.route('/api/health/db')
+@requires_auth
+@requires_roles('admin')
+def health_db():
+    """Connection pool statistics for each database engine in use.
+    ---
+    responses:
+      200:
+        description: Pool size, checked-out connections, overflow, checkout
+          wait times and pre-ping failures keyed by engine
+    """
+    return jsonify({'data': models.get_pool_stats()})
+
+
+@app.route('/api/health/external')
+@requires_auth
+@requires_roles('admin')
+def health_external():
+    """Circuit breaker state of the external patient database.
+    ---
+    responses:
+      200:
+        description: closed, open or half_open, with failure counters
+    """
+    return jsonify({'data': table_service.external_breaker.snapshot()})
+
+
 @app.route('/api/auth/me')
 @requires_auth
 def auth_me():
@@ -500,6 +809,106 @@ def get_file(filename: str):
         abort(404)
     return send_from_directory(FILES_DIR, filename)
 
+@app.cli.command('rebuild-search-index')
+@click.option('--batch-size', default=500, show_default=True, help='Events per batch.')
+@click.option('--pending', is_flag=True, help='Only reindex events queued in event_search_pending.')
+def rebuild_search_index_command(batch_size: int, pending: bool):
+    """Backfill the event_search table from events, patients and criterias."""
+    if pending:
+        count = table_service.reindex_pending_search(batch_size)
+    else:
+        count = table_service.rebuild_search_index(batch_size)
+    click.echo(f"Indexed {count} events")
+
+
+@app.cli.command('rebuild-criteria-summary')
+def rebuild_criteria_summary_command():
+    """Repopulate event_criteria_summary from the criterias table."""
+    count = table_service.rebuild_criteria_summary()
+    click.echo(f"Wrote {count} criteria summaries")
+
+
+@app.cli.command('check-criteria-summary')
+@click.option('--fix', is_flag=True, help='Recompute the summaries that differ.')
+def check_criteria_summary_command(fix: bool):
+    """Report events whose criteria summary disagrees with criterias."""
+    report = table_service.check_criteria_summary()
+    click.echo(f"Mismatched events: {report['mismatched'] or 'none'}")
+    click.echo(f"Orphaned summaries: {report['orphaned'] or 'none'}")
+    if not (report['mismatched'] or report['orphaned']):
+        return
+    if fix:
+        count = table_service.repair_all_criteria_summaries()
+        click.echo(f"Repaired {count} summaries")
+    else:
+        raise SystemExit(1)
+
+
+@app.cli.command('check-status-counts')
+@click.option('--fix', is_flag=True, help='Recount event_status_counts from events.')
+def check_status_counts_command(fix: bool):
+    """Report event_status_counts rows that disagree with the events table."""
+    drift = table_service.check_status_counts()
+    for row in drift:
+        click.echo(
+            f"{row['status']}/{row['site'] or '-'}: stored {row['stored']}, actual {row['actual']}"
+        )
+    if not drift:
+        click.echo("Status counts match")
+        return
+    if fix:
+        count = table_service.rebuild_status_counts()
+        click.echo(f"Rebuilt {count} status counts")
+    else:
+        raise SystemExit(1)
+
+
+@app.cli.command('sync-event-sites')
+@click.option('--batch-size', default=1000, show_default=True, type=int)
+def sync_event_sites_command(batch_size: int):
+    """Copy patient sites into events.site (backfill and resync)."""
+    result = table_service.sync_event_sites(batch_size=batch_size)
+    click.echo(f"Scanned {result['scanned']} events, updated {result['updated']}")
+
+
+@app.cli.command('sync-patients')
+@click.option('--batch-size', default=1000, show_default=True, type=int)
+@click.option('--full', is_flag=True, help='Re-copy every patient, ignoring the watermark.')
+@click.option('--verify', is_flag=True, help='Compare row counts and checksums afterwards.')
+def sync_patients_command(batch_size: int, full: bool, verify: bool):
+    """Pull changed patients from the external database into patients."""
+    result = table_service.sync_patients(batch_size=batch_size, full=full)
+    click.echo(f"Synced {result['synced']} patients, watermark {result['watermark']}")
+    if verify:
+        check = table_service.verify_patients_mirror()
+        click.echo(
+            f"local {check['local']['count']} rows / {check['local']['checksum']}, "
+            f"external {check['external']['count']} rows / {check['external']['checksum']}"
+        )
+        if not check['match']:
+            click.echo("Patients mirror differs from the external database; run with --full")
+            raise SystemExit(1)
+
+
+@app.cli.command('explain-queries')
+@click.option('--verbose', is_flag=True, help='Print every plan row, not only full scans.')
+def explain_queries_command(verbose: bool):
+    """EXPLAIN the table_service read queries; fail on full table scans."""
+    from . import explain_check
+
+    results = explain_check.run_explain_checks()
+    violations = [r for r in results if r['violation']]
+    for r in results:
+        if verbose or r['violation']:
+            flag = 'FULL SCAN' if r['violation'] else 'ok'
+            click.echo(f"{flag:9} {r['probe']:22} {r['table']} type={r['type']} key={r['key']} rows={r['rows']}")
+            if r['violation']:
+                click.echo(f"          {' '.join(r['sql'].split())[:240]}")
+    click.echo(f"{len(results)} plan rows checked, {len(violations)} full table scans")
+    if violations:
+        raise SystemExit(1)
+
+
 # Placeholder for OpenAPI generation scripts
 swagger = None
 
@@ -0,0 +1,191 @@
+"""Columnar (Parquet / Arrow IPC) encoding of the adjudication export.
+
+The Arrow schema is derived from the export query in ``table_service`` and
+the SQLAlchemy column types in ``models``: Enums become dictionary-encoded
+strings, ``TINYINT(1)`` flags booleans and Dates ``date32``. Rows are encoded
+in record batches and the encoded bytes are yielded as soon as each batch is
+written, so memory stays bounded by the batch size.
+
+``pyarrow`` is optional; :func:`iter_export_chunks` raises
+:class:`PyArrowUnavailable` when it is not installed.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Enum, Float
+from sqlalchemy.dialects.mysql import INTEGER, TINYINT
+
+from . import models
+from . import table_service
+
+FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+_SELECT_COLUMN_RE = re.compile(r"^\s*(\w+)\.(\w+)(?:\s+AS\s+(\w+))?,?\s*$")
+_TABLE_ALIAS_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)\s+(\w+)\b")
+
+
+class PyArrowUnavailable(RuntimeError):
+    """Raised when a columnar export is requested but pyarrow is missing."""
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise PyArrowUnavailable("pyarrow is required for Parquet/Arrow exports") from exc
+    return pyarrow
+
+
+def _export_columns() -> list[tuple[str, Optional[object]]]:
+    """Return ``(name, sqlalchemy column or None)`` for each export column.
+
+    Parsed from ``table_service._EXPORT_SQL`` so the schema follows the query;
+    computed columns (the criteria pivots) have no model column.
+    """
+    sql = table_service._EXPORT_SQL
+    select_list = sql[sql.index("\nSELECT\n") + 8:sql.index("\nFROM events e")]
+    tables = {
+        alias: table
+        for table, alias in _TABLE_ALIAS_RE.findall(sql[sql.index("\nFROM events e"):])
+        if alias != "ON"
+    }
+    columns = []
+    for line in select_list.splitlines():
+        match = _SELECT_COLUMN_RE.match(line)
+        if not match:
+            continue
+        alias, column, name = match.groups()
+        table = models.Base.metadata.tables.get(tables.get(alias, ""))
+        columns.append((name or column, table.c[column] if table is not None else None))
+    return columns
+
+
+def export_column_names() -> list[str]:
+    """Return the export's column names in query order."""
+    return [name for name, _ in _export_columns()]
+
+
+def _arrow_field(pa, name: str, column):
+    """Return ``(pyarrow field, value converter or None)`` for one column."""
+    col_type = column.type if column is not None else None
+    if isinstance(col_type, Enum):
+        values = list(col_type.enums)
+        index_type = pa.int8() if len(values) < 128 else pa.int16()
+        return pa.field(name, pa.dictionary(index_type, pa.string())), values
+    if isinstance(col_type, TINYINT) and col_type.display_width == 1:
+        return pa.field(name, pa.bool_()), bool
+    if isinstance(col_type, INTEGER):
+        return pa.field(name, pa.uint32() if col_type.unsigned else pa.int32()), None
+    if isinstance(col_type, DateTime):
+        return pa.field(name, pa.timestamp("s")), None
+    if isinstance(col_type, Date):
+        return pa.field(name, pa.date32()), None
+    if isinstance(col_type, Float):
+        return pa.field(name, pa.float64()), None
+    return pa.field(name, pa.string()), None
+
+
+def export_schema():
+    """Return the Arrow schema of the adjudication export."""
+    pa = _require_pyarrow()
+    return pa.schema([_arrow_field(pa, name, column)[0] for name, column in _export_columns()])
+
+
+def _batch_builder(pa):
+    fields = [_arrow_field(pa, name, column) for name, column in _export_columns()]
+    schema = pa.schema([field for field, _ in fields])
+
+    def build(rows: list[dict]):
+        arrays = []
+        for field, convert in fields:
+            values = [row.get(field.name) for row in rows]
+            if isinstance(convert, list):
+                # A fixed dictionary (the Enum's values) keeps every batch's
+                # encoding identical; values outside it (MySQL's '' for an
+                # invalid enum) are exported as null.
+                positions = {v: i for i, v in enumerate(convert)}
+                indices = pa.array([positions.get(v) for v in values], type=field.type.index_type)
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(indices, pa.array(convert, type=pa.string()))
+                )
+                continue
+            if convert is not None:
+                values = [None if v is None else convert(v) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    return schema, build
+
+
+class _ChunkSink:
+    """Write-only file that hands back what was written since the last drain.
+
+    ``tell`` keeps counting across drains because Parquet records absolute
+    offsets in its footer.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def iter_export_chunks(rows, fmt: str = "parquet", batch_size: Optional[int] = None):
+    """Encode export ``rows`` as Parquet or an Arrow IPC stream, yielding bytes.
+
+    One record batch (one Parquet row group) is written per ``batch_size``
+    rows, defaulting to ``EXPORT_CHUNK_SIZE``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported export format: {fmt}")
+    pa = _require_pyarrow()
+    batch_size = batch_size or table_service.EXPORT_CHUNK_SIZE
+    schema, build = _batch_builder(pa)
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(out, schema)
+    else:
+        writer = pa.ipc.new_stream(out, schema)
+    try:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(build(batch))
+                batch = []
+                yield sink.drain()
+        if batch:
+            writer.write_batch(build(batch))
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,95 @@
+"""A small thread-safe circuit breaker.
+
+``closed``: calls go through; ``failure_threshold`` consecutive failures open
+the circuit. ``open``: calls are refused at once for ``cooldown`` seconds.
+``half_open``: after the cooldown a single trial call is let through; its
+success closes the circuit, its failure opens it again. A trial that never
+reports back is given up after another cooldown so the circuit cannot stick.
+"""
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 30):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self.rejected = 0
+        self.total_failures = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now (claims the half-open trial)."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._state = HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and (
+                not self._trial_in_flight
+                or time.monotonic() - self._trial_started >= self.cooldown
+            ):
+                self._trial_in_flight = True
+                self._trial_started = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.total_failures += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+            self.rejected = 0
+            self.total_failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self._opened_at)), 3)
+            return {
+                "name": self.name,
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "cooldown": self.cooldown,
+                "retry_in": retry_in,
+                "rejected": self.rejected,
+                "total_failures": self.total_failures,
+            }
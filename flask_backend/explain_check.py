@@ -0,0 +1,132 @@
+"""EXPLAIN every query issued by the ``table_service`` read paths.
+
+Each probe below calls a read function with representative arguments while
+sessions are wrapped so that every SELECT is EXPLAINed before it runs. A plan
+row with ``type = ALL`` on a base table is a full table scan and is reported
+as a violation unless the probe allowlists that table alias (queries that
+read everything by design, such as the pipeline summary). Run it against a
+database seeded with realistic volumes; on near-empty tables the optimizer
+prefers scans whatever indexes exist.
+"""
+
+from contextlib import contextmanager
+from itertools import islice
+import re
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from . import models
+from . import table_service
+
+
+_READ_RE = re.compile(r"(SELECT|WITH)\b", re.IGNORECASE)
+# Server probes with nothing to plan.
+_SKIP_RE = re.compile(r"information_schema|^SELECT (VERSION|CURRENT_TIMESTAMP)\b", re.IGNORECASE)
+
+
+def _probes():
+    ts = table_service
+    after_id = ts.encode_cursor({"ID": 1})
+    after_uploaded = ts.encode_cursor({"ID": 1, "Uploaded": "2024-01-01"}, ts.UPLOADED_KEYSET)
+    after_scrubbed = ts.encode_cursor({"ID": 1, "Scrubbed": "2024-01-01"}, ts.SCRUBBED_KEYSET)
+    # (name, callable, aliases allowed to be scanned in full)
+    return [
+        ("by_status", lambda: ts.get_events_by_status_with_total("sent", 20, 0), set()),
+        ("by_status_after", lambda: ts.get_events_by_status_with_total("sent", 20, 0, after=after_id), set()),
+        ("by_status_site", lambda: ts.get_events_by_status_with_total("sent", 20, 0, site="UW"), set()),
+        ("by_status_many", lambda: ts.get_events_by_status_with_total(["sent", "reviewer1_done"], 20, 0), set()),
+        ("search_id", lambda: ts.get_events_by_status_with_total("sent", 20, 0, q="1234"), set()),
+        ("search_date", lambda: ts.get_events_by_status_with_total("sent", 20, 0, q="2024-01-15"), set()),
+        ("search_month", lambda: ts.get_events_by_status_with_total("sent", 20, 0, q="2024-01"), set()),
+        ("search_text", lambda: ts.get_events_by_status_with_total("sent", 20, 0, q="UW12"), set()),
+        ("search_contains", lambda: ts.get_events_by_status_with_total("sent", 20, 0, q="ropon", match="contains"), set()),
+        ("events_site", lambda: ts.get_events_with_patient_site_with_total(20, 0, site="UW"), set()),
+        ("to_be_scrubbed", lambda: ts.get_to_be_scrubbed_with_total(20, 0, None, None), set()),
+        ("to_be_scrubbed_after", lambda: ts.get_to_be_scrubbed_with_total(20, 0, None, None, after_uploaded), set()),
+        ("to_be_screened_after", lambda: ts.get_to_be_screened_with_total(20, 0, None, None, after_scrubbed), set()),
+        ("to_be_assigned", lambda: ts.get_to_be_assigned_with_total(20, 0, None, "UW"), set()),
+        ("to_be_sent", lambda: ts.get_to_be_sent_with_total(20, 0, None, None), set()),
+        ("to_be_reviewed", lambda: ts.get_to_be_reviewed_with_total(20, 0, None, None), set()),
+        ("event_details", lambda: ts.get_event_details(1), set()),
+        ("status_summary", lambda: ts.get_event_status_summary(), {"events", "event_status_counts"}),
+        ("status_summary_site", lambda: ts.get_event_status_summary(by_site=True), {"e", "event_status_counts"}),
+        # One pass over every event is the point of the pipeline summary.
+        ("pipeline_summary", lambda: ts.get_pipeline_summary(by_site=True), {"e"}),
+        ("export_chunk", lambda: list(islice(ts.iter_events_export_rows(chunk_size=500), 1)), set()),
+    ]
+
+
+def _explain_statement(statement):
+    """Return an ``EXPLAIN`` of ``statement`` (a text clause) or None."""
+    if not isinstance(statement, TextClause):
+        return None
+    sql = statement.text.strip()
+    if not _READ_RE.match(sql) or _SKIP_RE.search(sql):
+        return None
+    # Carry over the statement's own bind parameters (e.g. expanding IN lists).
+    return text("EXPLAIN " + sql).bindparams(*statement._bindparams.values())
+
+
+class _ExplainingSession:
+    """Session proxy that EXPLAINs each SELECT before executing it."""
+
+    def __init__(self, session, plans: list):
+        self._session = session
+        self._plans = plans
+
+    def execute(self, statement, params=None, **kwargs):
+        explain = _explain_statement(statement)
+        if explain is not None:
+            rows = self._session.execute(explain, params or {}).mappings().all()
+            self._plans.append((statement.text, [dict(r) for r in rows]))
+        return self._session.execute(statement, params, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+@contextmanager
+def _explaining_sessions(plans: list):
+    original = models.get_session
+    original_read = models.get_read_session
+    models.get_session = lambda: _ExplainingSession(original(), plans)
+    models.get_read_session = lambda: _ExplainingSession(original_read(), plans)
+    try:
+        yield
+    finally:
+        models.get_session = original
+        models.get_read_session = original_read
+
+
+def _is_base_table(name) -> bool:
+    # Derived tables and materialized subqueries show up as <derived2> etc.
+    return bool(name) and not str(name).startswith("<")
+
+
+def run_explain_checks() -> list[dict]:
+    """EXPLAIN the queries of every probe; return one dict per plan row.
+
+    Each dict carries ``probe``, ``table``, ``type``, ``key``, ``rows``,
+    ``sql`` and ``violation`` (a full scan of a base table not allowlisted).
+    """
+    results = []
+    for name, call, allowed in _probes():
+        plans: list = []
+        table_service.clear_caches()
+        with _explaining_sessions(plans):
+            call()
+        for sql, rows in plans:
+            for row in rows:
+                table = row.get("table")
+                scan = str(row.get("type") or "").upper() == "ALL"
+                results.append({
+                    "probe": name,
+                    "table": table,
+                    "type": row.get("type"),
+                    "key": row.get("key"),
+                    "rows": row.get("rows"),
+                    "sql": sql,
+                    "violation": scan and _is_base_table(table) and table not in allowed,
+                })
+    return results
@@ -0,0 +1,154 @@
+"""Local verification of Keycloak bearer tokens against a cached JWKS.
+
+Instead of asking Keycloak about every request (``userinfo``), the token's
+signature is checked against the realm's signing keys, which are fetched
+once, refreshed in the background and re-fetched when a token names a key
+id (``kid``) that is not known yet. Expiry, issuer and audience are checked
+locally as well.
+
+When the keys cannot be obtained at all, an optional ``introspect`` callable
+(Keycloak's token introspection) decides instead. Tokens that fail
+verification are never passed to it.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from jwcrypto import jwk, jwt
+
+logger = logging.getLogger(__name__)
+
+
+class TokenInvalid(Exception):
+    """Raised when a bearer token is not acceptable."""
+
+
+class KeysUnavailable(TokenInvalid):
+    """Raised when no signing keys could be loaded to verify a token."""
+
+
+class JWKSCache:
+    """Signing keys by ``kid``, loaded from ``fetch()`` (a JWKS dict).
+
+    ``min_refresh_interval`` rate-limits refetches triggered by unknown key
+    ids so forged ``kid`` values cannot hammer the identity provider.
+    """
+
+    def __init__(self, fetch: Callable[[], dict], min_refresh_interval: float = 30):
+        self._fetch = fetch
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict = {}
+        self._fetched_at = float("-inf")
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Reload the key set; keep the current keys if that fails."""
+        with self._lock:
+            self._fetched_at = time.monotonic()
+            try:
+                keyset = jwk.JWKSet()
+                keyset.import_keyset(json.dumps(self._fetch()))
+            except Exception as exc:
+                logger.warning("Failed to refresh JWKS: %s", exc)
+                return False
+            self._keys = {key.get("kid"): key for key in keyset["keys"]}
+            return True
+
+    def get(self, kid):
+        """Return the key for ``kid``, refetching once if it is unknown."""
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._fetched_at >= self.min_refresh_interval:
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None and not self._keys:
+            raise KeysUnavailable("no signing keys available")
+        return key
+
+    def start_refresher(self, interval: float) -> None:
+        """Refresh the keys every ``interval`` seconds in a daemon thread."""
+        if self._refresher is not None or interval <= 0:
+            return
+
+        def run():
+            while True:
+                self.refresh()
+                time.sleep(interval)
+
+        self._refresher = threading.Thread(target=run, name="jwks-refresh", daemon=True)
+        self._refresher.start()
+
+
+class TokenVerifier:
+    """Verify bearer tokens locally; return their claims.
+
+    ``audience`` must appear in the ``aud`` claim or be the authorized party
+    (``azp``), which is where Keycloak puts the client id of access tokens.
+    """
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        algorithms=("RS256",),
+        leeway: int = 30,
+        introspect: Optional[Callable[[str], dict]] = None,
+    ):
+        self.jwks = jwks
+        self.issuer = issuer
+        self.audience = audience
+        self.algorithms = list(algorithms)
+        self.leeway = leeway
+        self.introspect = introspect
+
+    def verify(self, token: str) -> dict:
+        try:
+            parsed = jwt.JWT(jwt=token, algs=self.algorithms, check_claims=False, expected_type="JWS")
+            kid = parsed.token.jose_header.get("kid")
+        except Exception as exc:
+            raise TokenInvalid(f"malformed token: {exc}") from exc
+        try:
+            key = self.jwks.get(kid)
+        except KeysUnavailable:
+            if self.introspect is None:
+                raise
+            return self._introspect(token)
+        if key is None:
+            raise TokenInvalid(f"unknown signing key {kid!r}")
+        try:
+            parsed.validate(key)
+            claims = json.loads(parsed.claims)
+        except Exception as exc:
+            raise TokenInvalid(f"bad signature: {exc}") from exc
+        self._check_claims(claims)
+        return claims
+
+    def _introspect(self, token: str) -> dict:
+        try:
+            result = self.introspect(token)
+        except Exception as exc:
+            raise TokenInvalid(f"introspection failed: {exc}") from exc
+        if not result or not result.get("active"):
+            raise TokenInvalid("token is not active")
+        return result
+
+    def _check_claims(self, claims: dict) -> None:
+        now = time.time()
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp < now - self.leeway:
+            raise TokenInvalid("token expired")
+        nbf = claims.get("nbf")
+        if isinstance(nbf, (int, float)) and nbf > now + self.leeway:
+            raise TokenInvalid("token not yet valid")
+        if self.issuer and claims.get("iss") != self.issuer:
+            raise TokenInvalid("unexpected issuer")
+        if self.audience:
+            aud = claims.get("aud") or []
+            if isinstance(aud, str):
+                aud = [aud]
+            if self.audience not in aud and claims.get("azp") != self.audience:
+                raise TokenInvalid("unexpected audience")
@@ -1,6 +1,7 @@
 from typing import Optional
-from sqlalchemy import Column, Date, DateTime, Enum, Float, String, TIMESTAMP, text, ForeignKey, create_engine, Table
+from sqlalchemy import Column, Date, DateTime, Enum, Float, String, TIMESTAMP, text, ForeignKey, create_engine, Table, event, exc
 from sqlalchemy.dialects.mysql import INTEGER, TINYINT, VARCHAR
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -11,6 +12,8 @@ from sqlalchemy.orm import (
 )
 import datetime
 import os
+import threading
+import time
 
 class Base(DeclarativeBase):
     pass
@@ -208,6 +211,150 @@ _engine = None
 _SessionFactory = None
 _external_engine = None
 _ExternalSessionFactory = None
+_read_engine = None
+_ReadSessionFactory = None
+
+# Pool settings per engine: ``<PREFIX>POOL_SIZE``, ``<PREFIX>MAX_OVERFLOW``,
+# ``<PREFIX>POOL_TIMEOUT`` (seconds to wait for a connection),
+# ``<PREFIX>POOL_RECYCLE`` (seconds) and ``<PREFIX>POOL_PRE_PING`` (0 to skip
+# the ping on checkout when recycle is below the server's wait_timeout).
+# The external and read engines fall back to the ``DB_`` settings.
+_POOL_DEFAULTS = {
+    "POOL_SIZE": "5",
+    "MAX_OVERFLOW": "10",
+    "POOL_TIMEOUT": "30",
+    "POOL_RECYCLE": "3600",
+    "POOL_PRE_PING": "1",
+}
+
+
+def _pool_setting(prefix: str, name: str) -> str:
+    value = os.getenv(prefix + name)
+    if value is None and prefix != "DB_":
+        value = os.getenv("DB_" + name)
+    return value if value is not None else _POOL_DEFAULTS[name]
+
+
+def pool_options(prefix: str = "DB_") -> dict:
+    """Return ``create_engine`` pool keyword arguments for an env prefix."""
+    return {
+        "pool_size": int(_pool_setting(prefix, "POOL_SIZE")),
+        "max_overflow": int(_pool_setting(prefix, "MAX_OVERFLOW")),
+        "pool_timeout": float(_pool_setting(prefix, "POOL_TIMEOUT")),
+        "pool_recycle": int(_pool_setting(prefix, "POOL_RECYCLE")),
+        "pool_pre_ping": _pool_setting(prefix, "POOL_PRE_PING").lower() not in ("0", "false", "no"),
+    }
+
+
+class PoolStats:
+    """Counters for one engine's pool, fed by SQLAlchemy pool events."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def listen(self, pool) -> None:
+        self.pool = pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, _dbapi_connection, _record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, _dbapi_connection, _record, _proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_invalidate(self, _dbapi_connection, _record, exception):
+        with self._lock:
+            self.invalidations += 1
+            # A failed pre-ping invalidates the connection with a DisconnectionError.
+            if isinstance(exception, exc.DisconnectionError):
+                self.pre_ping_failures += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            waits = self.checkouts + self.checkout_timeouts
+            return {
+                "pool_size": pool.size() if pool is not None else None,
+                "checked_out": pool.checkedout() if pool is not None else None,
+                "checked_in": pool.checkedin() if pool is not None else None,
+                # QueuePool counts unopened base slots as negative overflow.
+                "overflow": max(pool.overflow(), 0) if pool is not None else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "wait_ms_avg": round(1000 * self.wait_total / waits, 3) if waits else 0.0,
+                "wait_ms_max": round(1000 * self.wait_max, 3),
+            }
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that times each checkout, including waits for a free slot.
+
+    Pool events only fire once a connection is in hand, so the wait itself
+    is measured around :meth:`connect`.
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # The new pool inherits the event listeners; only repoint the stats.
+        pool = super().recreate()
+        if self.stats is not None:
+            pool.stats = self.stats
+            self.stats.pool = pool
+        return pool
+
+
+_pool_stats: dict[str, PoolStats] = {}
+
+
+def _create_engine(url: str, name: str, prefix: str, **kwargs):
+    """Create an engine with env-driven pool settings and pool statistics."""
+    engine = create_engine(url, poolclass=_TimedQueuePool, **pool_options(prefix), **kwargs)
+    stats = PoolStats(name)
+    engine.pool.stats = stats
+    stats.listen(engine.pool)
+    _pool_stats[name] = stats
+    return engine
+
+
+def get_pool_stats() -> dict:
+    """Return pool statistics for each engine created so far, keyed by name."""
+    return {name: stats.snapshot() for name, stats in _pool_stats.items()}
 
 
 def get_engine():
@@ -219,7 +366,7 @@ def get_engine():
         host = os.getenv("DB_HOST", "localhost")
         db = os.getenv("DB_NAME", "cnics")
         url = f"mysql+mysqlconnector://{user}:{pw}@{host}/{db}"
-        _engine = create_engine(url, pool_pre_ping=True)
+        _engine = _create_engine(url, "primary", "DB_")
     return _engine
 
 
@@ -239,7 +386,13 @@ def get_external_engine():
         url = os.getenv("EXTERNAL_DB_URL")
         if not url:
             raise RuntimeError("EXTERNAL_DB_URL is not configured")
-        _external_engine = create_engine(url, pool_pre_ping=True)
+        # Fail fast when the host is unreachable (MySQL drivers' default
+        # connect timeout is far longer than a request should wait).
+        timeout = int(os.getenv("EXTERNAL_DB_CONNECT_TIMEOUT", "5"))
+        connect_args = {"connect_timeout": timeout} if url.startswith("mysql") else {}
+        _external_engine = _create_engine(
+            url, "external", "EXTERNAL_DB_", connect_args=connect_args
+        )
     return _external_engine
 
 
@@ -251,3 +404,23 @@ def get_external_session() -> Session:
     return _ExternalSessionFactory()
 
 
+def get_read_engine():
+    """Return the read-replica engine, or None when ``DB_READ_URL`` is unset."""
+    global _read_engine
+    if _read_engine is None:
+        url = os.getenv("DB_READ_URL")
+        if not url:
+            return None
+        _read_engine = _create_engine(url, "read", "DB_READ_")
+    return _read_engine
+
+
+def get_read_session() -> Session:
+    """Return a new SQLAlchemy session on the read replica."""
+    global _ReadSessionFactory
+    if _ReadSessionFactory is None:
+        engine = get_read_engine()
+        if engine is None:
+            raise RuntimeError("DB_READ_URL is not configured")
+        _ReadSessionFactory = sessionmaker(bind=engine)
+    return _ReadSessionFactory()
@@ -1,21 +1,115 @@
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
 from types import SimpleNamespace
 from typing import Optional
 from sqlalchemy import text, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from .circuit_breaker import CircuitBreaker
+import base64
+import copy
+import json
 import logging
 import datetime
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
 
 logger = logging.getLogger(__name__)
 
 try:
     from . import models  # type: ignore
 except Exception:  # pragma: no cover - models may not be importable during tests
-    models = SimpleNamespace(get_session=lambda: None, get_external_session=lambda: None)
+    models = SimpleNamespace(
+        get_session=lambda: None,
+        get_external_session=lambda: None,
+        get_read_engine=lambda: None,
+    )
 
 
 class ValidationError(Exception):
     """Raised when inputs are invalid or required resources are unavailable."""
 
 
+# Within a request (see ``begin_request_sessions``) every call shares one
+# session per database, so auth and service code use a single connection
+# checkout. Outside a request (scripts, tests, worker threads) each call
+# gets its own session as before.
+_request_sessions: ContextVar = ContextVar("table_service_request_sessions", default=None)
+
+
+class _RequestSession:
+    """A request's shared session; ``close`` is left to the request teardown."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def close(self) -> None:
+        # Called from a ``finally`` while a database error propagates: roll
+        # back so the next caller in the request starts from a clean session.
+        if isinstance(sys.exc_info()[1], SQLAlchemyError):
+            self._session.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def begin_request_sessions():
+    """Start sharing sessions in the current context; returns a token."""
+    return _request_sessions.set({})
+
+
+def end_request_sessions(token) -> None:
+    """Close the sessions opened since ``begin_request_sessions``."""
+    sessions = _request_sessions.get() or {}
+    _request_sessions.reset(token)
+    for session in sessions.values():
+        try:
+            session.close()
+        except Exception:  # pragma: no cover - closing is best effort
+            logger.exception("Failed to close request session")
+
+
+def _shared_session(kind: str, factory):
+    sessions = _request_sessions.get()
+    if sessions is None:
+        return factory()
+    session = sessions.get(kind)
+    if session is None:
+        session = sessions[kind] = factory()
+    return _RequestSession(session)
+
+
+# Connection failures to the external database open a circuit breaker;
+# while it is open callers fall back to the primary at once instead of each
+# waiting out a connect timeout.
+external_breaker = CircuitBreaker(
+    "external_db",
+    failure_threshold=int(os.getenv("EXTERNAL_DB_FAILURE_THRESHOLD", "3")),
+    cooldown=float(os.getenv("EXTERNAL_DB_COOLDOWN", "30")),
+)
+
+
+class _ExternalUnreachable(Exception):
+    pass
+
+
+def _connect_external_session():
+    session = models.get_external_session()
+    try:
+        # Checks a connection out of the pool (pinging it): the health probe.
+        session.connection()
+    except Exception as exc:
+        session.close()
+        raise _ExternalUnreachable(exc) from exc
+    return session
+
+
 def _get_external_session_or_none():
     """Return an external DB session if configured, else None.
 
@@ -23,19 +117,1039 @@ def _get_external_session_or_none():
     database for patient lookups/creation when the external DB URL is not
     configured or the external DB is unavailable.
     """
+    if not external_breaker.allow():
+        return None
     try:
-        return models.get_external_session()
+        session = _shared_session("external", _connect_external_session)
+    except _ExternalUnreachable as exc:
+        external_breaker.record_failure()
+        logger.warning(
+            "External DB unreachable; falling back to primary DB for patients: %s",
+            exc,
+        )
+        return None
     except Exception as exc:  # pragma: no cover - depends on env config
         logger.warning(
             "External DB not available; falling back to primary DB for patients: %s",
             exc,
         )
         return None
+    return session
+
+
+@contextmanager
+def _external_guard(enabled: bool = True):
+    """Report the outcome of statements on the external database to the breaker.
+
+    Success is recorded only once the statements ran, so a database that
+    accepts connections but fails every query still opens the circuit.
+    """
+    if not enabled:
+        yield
+        return
+    try:
+        yield
+    except SQLAlchemyError:
+        external_breaker.record_failure()
+        raise
+    external_breaker.record_success()
 
 
 def get_session():
-    """Lazily create a new SQLAlchemy session."""
-    return models.get_session()
+    """Lazily create a new SQLAlchemy session (the request's, inside one)."""
+    return _shared_session("primary", models.get_session)
+
+
+# Reads go to the ``DB_READ_URL`` replica when one is configured. After a
+# write through this module the writing actor (see ``set_read_actor``) reads
+# from the primary for ``DB_READ_STICKY_SECONDS`` so it sees its own changes
+# despite replication lag; a replica that fails to connect is skipped for
+# ``DB_READ_RETRY_SECONDS``.
+READ_STICKY_SECONDS = float(os.getenv("DB_READ_STICKY_SECONDS", "5"))
+READ_RETRY_SECONDS = float(os.getenv("DB_READ_RETRY_SECONDS", "30"))
+_read_actor: ContextVar = ContextVar("table_service_read_actor", default=None)
+_sticky_until: dict = {}
+_read_state = {"last_write": float("-inf"), "replica_down_until": float("-inf")}
+_read_lock = threading.Lock()
+
+
+def set_read_actor(actor):
+    """Identify who the current context reads for; returns a reset token."""
+    return _read_actor.set(actor)
+
+
+def reset_read_actor(token) -> None:
+    _read_actor.reset(token)
+
+
+def _mark_primary_sticky() -> None:
+    now = time.monotonic()
+    with _read_lock:
+        _read_state["last_write"] = now
+        if READ_STICKY_SECONDS <= 0:
+            return
+        for actor in [a for a, until in _sticky_until.items() if until <= now]:
+            del _sticky_until[actor]
+        _sticky_until[_read_actor.get()] = now + READ_STICKY_SECONDS
+
+
+def _replica_available() -> bool:
+    """Whether reads in the current context may go to the replica."""
+    if models.get_read_engine() is None:
+        return False
+    now = time.monotonic()
+    with _read_lock:
+        if now < _read_state["replica_down_until"]:
+            return False
+        return _sticky_until.get(_read_actor.get(), now) <= now
+
+
+def _replica_may_lag() -> bool:
+    """Whether a replica read could still miss a recent write (do not cache it)."""
+    if models.get_read_engine() is None:
+        return False
+    with _read_lock:
+        return time.monotonic() - _read_state["last_write"] < READ_STICKY_SECONDS
+
+
+def _connect_read_session():
+    session = models.get_read_session()
+    try:
+        session.connection()
+    except Exception:
+        session.close()
+        raise
+    return session
+
+
+def get_read_session(replica: Optional[bool] = None):
+    """Return a session for read-only queries: the replica when usable.
+
+    ``replica`` forces the choice (e.g. so export worker threads, which do
+    not share the request context, read from where the request decided).
+    Falls back to the primary when the replica cannot be reached.
+    """
+    if replica is None:
+        replica = _replica_available()
+    if not replica:
+        return get_session()
+    try:
+        return _shared_session("read", _connect_read_session)
+    except Exception as exc:
+        logger.warning(
+            "Read replica unavailable; reading from the primary for %ss: %s",
+            READ_RETRY_SECONDS,
+            exc,
+        )
+        with _read_lock:
+            _read_state["replica_down_until"] = time.monotonic() + READ_RETRY_SECONDS
+        return get_session()
+
+
+_MISSING = object()
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+# Worklist totals and first pages are cached per process. Keys embed the
+# version of every table the query reads; write paths below call
+# ``bump_table_version`` so their own changes are visible immediately, while
+# the TTL bounds staleness from writers outside this process.
+_LIST_TABLES = ("events", "patients", "criterias")
+_table_versions: dict[str, int] = {}
+_table_versions_lock = threading.Lock()
+_result_cache = _TTLCache(
+    int(os.getenv("TOTALS_CACHE_SIZE", "512")),
+    float(os.getenv("TOTALS_CACHE_TTL", "30")),
+)
+
+
+def bump_table_version(*tables: str) -> None:
+    """Invalidate cached results that read any of ``tables``.
+
+    Also starts the current actor's read-your-writes window on the primary.
+    """
+    with _table_versions_lock:
+        for table in tables:
+            _table_versions[table] = _table_versions.get(table, 0) + 1
+    _mark_primary_sticky()
+
+
+def _table_versions_for(tables) -> tuple:
+    with _table_versions_lock:
+        return tuple(_table_versions.get(t, 0) for t in tables)
+
+
+def _freeze(params: dict) -> tuple:
+    return tuple(
+        sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items())
+    )
+
+
+# login -> auth_user role dicts for header-based auth. Only found users are
+# cached, so new users work at once; ``invalidate_auth_user`` drops an entry
+# when a user changes through this API and the TTL bounds how long a change
+# made elsewhere (e.g. a user removed in the legacy app) can go unnoticed.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+_auth_cache = _TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+
+# Patient -> site mappings from the external database hardly ever change, so
+# they are cached per process: ``("site", patient_id) -> site`` for listings
+# and ``("id", site, site_patient_id) -> patient_id`` for ``create_event``.
+# Unknown patients are not cached. ``("page", after_id, limit)`` marks a
+# prefetched next page of ``/api/events`` so it is not read again while warm.
+PATIENT_CACHE_TTL = float(os.getenv("PATIENT_CACHE_TTL", "3600"))
+PATIENT_CACHE_SIZE = int(os.getenv("PATIENT_CACHE_SIZE", "50000"))
+_patient_cache = _TTLCache(PATIENT_CACHE_SIZE, PATIENT_CACHE_TTL)
+
+
+def get_auth_user(login: str) -> Optional[dict]:
+    """Return the role flags of the user with ``login``, or None if unknown."""
+    cached = _auth_cache.get(login)
+    if cached is not _MISSING:
+        return dict(cached)
+    session = get_session()
+    try:
+        user = session.query(models.Users).filter_by(login=login).first()
+        if user is None:
+            return None
+        auth_user = {
+            "id": user.id,
+            "username": user.username,
+            "admin": bool(user.admin_flag),
+            "uploader": bool(user.uploader_flag),
+            "reviewer": bool(user.reviewer_flag),
+            "third_reviewer": bool(user.third_reviewer_flag),
+            "site": user.site,
+        }
+    finally:
+        session.close()
+    _auth_cache.set(login, auth_user)
+    return dict(auth_user)
+
+
+def invalidate_auth_user(login: Optional[str] = None) -> None:
+    """Forget the cached roles of ``login`` (of every user when None)."""
+    if login is None:
+        _auth_cache.clear()
+    else:
+        _auth_cache.pop(login)
+
+
+def get_cache_stats() -> dict:
+    """Return hit/miss counters for the in-process caches."""
+    return {
+        "results": _result_cache.stats(),
+        "auth_users": _auth_cache.stats(),
+        "patient_sites": _patient_cache.stats(),
+    }
+
+
+def purge_cache(name: Optional[str] = None) -> list[str]:
+    """Empty the named in-process cache (all of them when None).
+
+    Returns the names purged; raises ValidationError for an unknown name.
+    """
+    caches = {
+        "results": _result_cache,
+        "auth_users": _auth_cache,
+        "patient_sites": _patient_cache,
+    }
+    if name is not None and name not in caches:
+        raise ValidationError(f"unknown cache: {name}")
+    names = [name] if name is not None else list(caches)
+    for n in names:
+        caches[n].clear()
+    return names
+
+
+def clear_caches() -> None:
+    """Drop all cached results and reset their counters."""
+    _result_cache.clear()
+    _auth_cache.clear()
+    _patient_cache.clear()
+    _schema_features.clear()
+    with _read_lock:
+        _sticky_until.clear()
+        _read_state.update(last_write=float("-inf"), replica_down_until=float("-inf"))
+
+
+# Keysets describe the ORDER BY of a worklist so an opaque ``after`` cursor can
+# seek past the last row of the previous page instead of scanning and
+# discarding every earlier row with OFFSET. Entries are
+# (result column, SQL expression, direction).
+ID_KEYSET = (("ID", "e.id", "ASC"),)
+UPLOADED_KEYSET = (("Uploaded", "e.upload_date", "DESC"), ("ID", "e.id", "ASC"))
+SCRUBBED_KEYSET = (("Scrubbed", "e.scrub_date", "DESC"), ("ID", "e.id", "ASC"))
+
+
+def encode_cursor(row: dict, keyset=ID_KEYSET) -> str:
+    """Return an opaque cursor pointing just after ``row`` in ``keyset`` order."""
+    values = []
+    for column, _expr, _direction in keyset:
+        value = row.get(column)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        values.append(value)
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def next_cursor(rows: list[dict], keyset=ID_KEYSET, limit: Optional[int] = None) -> Optional[str]:
+    """Return the cursor for the page following ``rows``.
+
+    None when ``rows`` is empty or, given the page ``limit``, shorter than a
+    full page (the last page).
+    """
+    if not rows or (limit is not None and len(rows) < limit):
+        return None
+    return encode_cursor(rows[-1], keyset)
+
+
+def _decode_cursor(cursor: str, keyset) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValidationError("after must be a cursor returned by a previous page") from exc
+    if not isinstance(values, list) or len(values) != len(keyset) or None in values:
+        raise ValidationError("after must be a cursor returned by a previous page")
+    return values
+
+
+def _order_by_sql(keyset) -> str:
+    return "ORDER BY " + ", ".join(f"{expr} {direction}" for _col, expr, direction in keyset)
+
+
+def _seek_sql(keyset, cursor: str, params: dict) -> str:
+    """Return a predicate matching rows strictly after ``cursor``.
+
+    For ``(a DESC, b ASC)`` this expands to ``a < :x OR (a = :x AND b > :y)``,
+    which the optimizer can serve as a range scan on the sort columns.
+    """
+    values = _decode_cursor(cursor, keyset)
+    clauses = []
+    for i, (_col, expr, direction) in enumerate(keyset):
+        params[f"after_{i}"] = values[i]
+        op = "<" if direction == "DESC" else ">"
+        terms = [f"{keyset[j][1]} = :after_{j}" for j in range(i)]
+        terms.append(f"{expr} {op} :after_{i}")
+        clauses.append("(" + " AND ".join(terms) + ")")
+    return "(" + " OR ".join(clauses) + ")"
+
+
+def _limit_sql(limit: Optional[int], offset: int, params: dict, after: Optional[str] = None) -> str:
+    """Return the LIMIT/OFFSET suffix; cursor pages never use OFFSET."""
+    if after:
+        if limit is None:
+            return ""
+        params["limit"] = limit
+        return " LIMIT :limit"
+    if limit is not None:
+        params.update({"limit": limit, "offset": offset})
+        return " LIMIT :limit OFFSET :offset"
+    if offset:
+        params["offset"] = offset
+        return " LIMIT 18446744073709551615 OFFSET :offset"
+    return ""
+
+
+# How ``*_with_total`` functions obtain their totals: "window" returns the
+# total with the page via ``COUNT(*) OVER()`` (MariaDB 10.2+, MySQL 8.0+),
+# "separate" always issues a second COUNT query, and "auto" probes the server
+# version once per process.
+TOTALS_MODE = os.getenv("TABLE_SERVICE_TOTALS", "auto").strip().lower()
+_window_totals_supported: Optional[bool] = None
+
+
+def _version_supports_window_functions(version) -> bool:
+    if not isinstance(version, str):
+        return False
+    match = re.match(r"(\d+)\.(\d+)", version)
+    if not match:
+        return False
+    major_minor = (int(match.group(1)), int(match.group(2)))
+    if "mariadb" in version.lower():
+        return major_minor >= (10, 2)
+    return major_minor >= (8, 0)
+
+
+def _window_totals_enabled(session) -> bool:
+    global _window_totals_supported
+    if TOTALS_MODE == "window":
+        return True
+    if TOTALS_MODE == "separate":
+        return False
+    if _window_totals_supported is None:
+        try:
+            version = session.execute(text("SELECT VERSION()")).scalar()
+        except Exception as exc:  # pragma: no cover - depends on server
+            logger.warning("Could not determine server version: %s", exc)
+            return False
+        if not isinstance(version, str):
+            return False
+        _window_totals_supported = _version_supports_window_functions(version)
+        logger.debug(
+            "Server %s %s window-function totals",
+            version,
+            "supports" if _window_totals_supported else "does not support",
+        )
+    return _window_totals_supported
+
+
+def _fetch_page_and_total(
+    session,
+    select_sql: str,
+    from_sql: str,
+    tail_sql: str,
+    count_sql: str,
+    params: dict,
+    offset: int = 0,
+    after: Optional[str] = None,
+):
+    """Return (rows, total) for a page query and its matching COUNT query.
+
+    ``select_sql`` is the projection, ``from_sql`` the FROM/WHERE/GROUP BY and
+    ``tail_sql`` the ORDER BY/LIMIT of the page. When window functions are
+    available and no cursor narrows the page, the total comes back with the
+    rows in a single statement; otherwise ``count_sql`` runs separately.
+    Totals and first pages are served from the versioned result cache.
+    """
+    versions = _table_versions_for(_LIST_TABLES)
+    filter_params = {
+        k: v for k, v in params.items()
+        if k not in ("limit", "offset") and not k.startswith("after_")
+    }
+    total_key = ("total", count_sql, _freeze(filter_params), versions)
+    page_key = None
+    if not offset and not after:
+        page_key = ("page", select_sql, from_sql, tail_sql, _freeze(params), versions)
+        cached = _result_cache.get(page_key)
+        if cached is not _MISSING:
+            rows, total = cached
+            return [dict(r) for r in rows], total
+
+    cached_total = _result_cache.get(total_key)
+    if cached_total is not _MISSING:
+        query = f"SELECT {select_sql} {from_sql}{tail_sql}"
+        rows = [dict(r) for r in session.execute(text(query), params).mappings().all()]
+        total = cached_total
+    else:
+        rows, total = _query_page_and_total(
+            session, select_sql, from_sql, tail_sql, count_sql, params, offset, after
+        )
+        if not _replica_may_lag():
+            _result_cache.set(total_key, total)
+    if page_key is not None and not _replica_may_lag():
+        _result_cache.set(page_key, ([dict(r) for r in rows], total))
+    return rows, total
+
+
+def _query_page_and_total(session, select_sql, from_sql, tail_sql, count_sql, params, offset, after):
+    if not after and _window_totals_enabled(session):
+        query = f"SELECT {select_sql}, COUNT(*) OVER() AS `_total` {from_sql}{tail_sql}"
+        rows = [dict(r) for r in session.execute(text(query), params).mappings().all()]
+        if rows or not offset:
+            total = rows[0].get("_total", 0) if rows else 0
+            for r in rows:
+                r.pop("_total", None)
+            return rows, int(total or 0)
+        # A page past the end carries no window total; count it separately.
+    else:
+        query = f"SELECT {select_sql} {from_sql}{tail_sql}"
+        rows = [dict(r) for r in session.execute(text(query), params).mappings().all()]
+    total = session.execute(text(count_sql), params).scalar() or 0
+    return rows, int(total)
+
+
+# Substring search predicates used by the worklists. Each one is the
+# authoritative definition of what ``q`` matches for its list.
+_CRITERIA_LIKE_SQL = (
+    "EXISTS (SELECT 1 FROM criterias c2 WHERE c2.event_id = e.id "
+    "AND (c2.name LIKE :like OR c2.value LIKE :like))"
+)
+_STATUS_LIKE_SQL = (
+    "(CAST(e.id AS CHAR) LIKE :like "
+    "OR e.event_date LIKE :like "
+    "OR e.add_date LIKE :like "
+    "OR e.upload_date LIKE :like "
+    "OR e.scrub_date LIKE :like "
+    "OR p.site LIKE :like "
+    "OR p.site_patient_id LIKE :like "
+    f"OR {_CRITERIA_LIKE_SQL})"
+)
+_PHASE_LIKE_SQL = (
+    "(CAST(e.id AS CHAR) LIKE :like "
+    "OR CAST(e.patient_id AS CHAR) LIKE :like "
+    "OR e.event_date LIKE :like "
+    "OR e.add_date LIKE :like "
+    "OR e.upload_date LIKE :like "
+    "OR e.scrub_date LIKE :like "
+    "OR p.site LIKE :like "
+    "OR p.site_patient_id LIKE :like "
+    f"OR {_CRITERIA_LIKE_SQL})"
+)
+_EVENTS_LIKE_SQL = (
+    "(CAST(e.id AS CHAR) LIKE :like "
+    "OR CAST(e.patient_id AS CHAR) LIKE :like "
+    "OR e.event_date LIKE :like "
+    "OR p.site_patient_id LIKE :like "
+    f"OR {_CRITERIA_LIKE_SQL})"
+)
+
+# The ``event_search`` table (init/05-event-search.sql) holds the distinct
+# lowercase trigrams of every searchable field of an event: ids, workflow
+# dates, patient site/site_patient_id and criteria names/values. Any value
+# containing ``q`` contains all of ``q``'s trigrams, so the index yields a
+# superset of matches that the LIKE predicate above then confirms exactly.
+# Events queued in ``event_search_pending`` (init/14-event-search-pending.sql)
+# may have stale trigrams and are always handed to the LIKE check as well.
+_SEARCH_GRAM = 3
+_SEARCH_MAX_GRAMS = 12
+_schema_features: dict[str, bool] = {}
+
+
+def _has_table(name: str) -> bool:
+    """Return whether ``name`` exists in the primary database (cached)."""
+    key = f"table:{name}"
+    if key not in _schema_features:
+        session = get_session()
+        try:
+            found = session.execute(
+                text(
+                    "SELECT COUNT(*) FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = :name"
+                ),
+                {"name": name},
+            ).scalar()
+        except Exception as exc:  # pragma: no cover - depends on server
+            logger.warning("Could not inspect schema for table %s: %s", name, exc)
+            return False
+        finally:
+            session.close()
+        if not isinstance(found, int):
+            return False
+        _schema_features[key] = found > 0
+    return _schema_features[key]
+
+
+
+def _has_column(table: str, column: str) -> bool:
+    """Return whether ``table.column`` exists in the primary database (cached)."""
+    key = f"column:{table}.{column}"
+    if key not in _schema_features:
+        session = get_session()
+        try:
+            found = session.execute(
+                text(
+                    "SELECT COUNT(*) FROM information_schema.columns "
+                    "WHERE table_schema = DATABASE() AND table_name = :table "
+                    "AND column_name = :column"
+                ),
+                {"table": table, "column": column},
+            ).scalar()
+        except Exception as exc:  # pragma: no cover - depends on server
+            logger.warning("Could not inspect schema for column %s.%s: %s", table, column, exc)
+            return False
+        finally:
+            session.close()
+        if not isinstance(found, int):
+            return False
+        _schema_features[key] = found > 0
+    return _schema_features[key]
+
+def _has_trigger(name: str) -> bool:
+    """Return whether trigger ``name`` exists in the primary database (cached)."""
+    key = f"trigger:{name}"
+    if key not in _schema_features:
+        session = get_session()
+        try:
+            found = session.execute(
+                text(
+                    "SELECT COUNT(*) FROM information_schema.triggers "
+                    "WHERE trigger_schema = DATABASE() AND trigger_name = :name"
+                ),
+                {"name": name},
+            ).scalar()
+        except Exception as exc:  # pragma: no cover - depends on server
+            logger.warning("Could not inspect schema for trigger %s: %s", name, exc)
+            return False
+        finally:
+            session.close()
+        if not isinstance(found, int):
+            return False
+        _schema_features[key] = found > 0
+    return _schema_features[key]
+
+
+def _normalize_search_text(value) -> str:
+    decomposed = unicodedata.normalize("NFKD", str(value))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _search_grams(value) -> set[str]:
+    """Return the trigrams of one field value as stored in ``event_search``."""
+    if value is None:
+        return set()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    norm = _normalize_search_text(value)
+    return {norm[i:i + _SEARCH_GRAM] for i in range(len(norm) - _SEARCH_GRAM + 1)}
+
+
+def _query_grams(q: str) -> list[str]:
+    # LIKE wildcards typed by the user cannot be matched against trigrams.
+    if any(ch in q for ch in "%_\\"):
+        return []
+    return sorted(_search_grams(q))[:_SEARCH_MAX_GRAMS]
+
+
+def _search_filter(q: str, like_sql: str, params: dict) -> str:
+    """Return the WHERE fragment for a ``q`` substring search.
+
+    Uses the trigram index to narrow candidates when it exists and ``q`` is at
+    least three characters long, otherwise falls back to the plain LIKE scan.
+    Events awaiting reindexing are candidates regardless of their trigrams.
+    """
+    params["like"] = f"%{q}%"
+    grams = _query_grams(q)
+    if not grams or not _has_table("event_search"):
+        return like_sql
+    names = []
+    for i, gram in enumerate(grams):
+        params[f"gram_{i}"] = gram
+        names.append(f":gram_{i}")
+    params["gram_count"] = len(grams)
+    candidates = (
+        "e.id IN (SELECT es.event_id FROM event_search es "
+        f"WHERE es.gram IN ({', '.join(names)}) "
+        "GROUP BY es.event_id HAVING COUNT(*) = :gram_count)"
+    )
+    if _has_table("event_search_pending"):
+        candidates = (
+            f"({candidates} "
+            "OR e.id IN (SELECT esp.event_id FROM event_search_pending esp))"
+        )
+    return f"({candidates} AND {like_sql})"
+
+
+# Most worklist searches are an event id, a site_patient_id or a date. The
+# default "smart" match turns those into predicates the indexes on events.id,
+# events.patient_id, events.event_date and patients.site_patient_id can serve;
+# "contains" opts into the full substring search above.
+SEARCH_MATCH_MODES = ("smart", "contains")
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ISO_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _plan_search(q: str, like_sql: str, params: dict, match: Optional[str] = None) -> str:
+    """Return the WHERE fragment for ``q`` according to the ``match`` mode.
+
+    smart: digits match ``e.id``/``e.patient_id`` exactly or a
+    ``site_patient_id`` prefix, ``YYYY-MM-DD`` matches ``event_date`` exactly,
+    ``YYYY-MM`` matches that month of ``event_date``, and anything else is a
+    ``site_patient_id`` prefix. contains: substring search via ``like_sql``.
+    """
+    match = (match or "smart").strip().lower()
+    if match not in SEARCH_MATCH_MODES:
+        raise ValidationError(f"match must be one of: {', '.join(SEARCH_MATCH_MODES)}")
+    q = q.strip()
+    if not q:
+        return "1=1"
+    if match == "contains":
+        return _search_filter(q, like_sql, params)
+    if q.isdigit():
+        params["q_int"] = int(q)
+        params["q_prefix"] = f"{q}%"
+        # Each alternative is an index lookup on events; the site_patient_id
+        # prefix goes through patients' own index instead of the join.
+        return (
+            "(e.id = :q_int OR e.patient_id = :q_int OR e.patient_id IN "
+            "(SELECT id FROM patients WHERE site_patient_id LIKE :q_prefix))"
+        )
+    if _ISO_DATE_RE.match(q):
+        try:
+            params["q_date"] = datetime.date.fromisoformat(q)
+            return "e.event_date = :q_date"
+        except ValueError:
+            pass
+    month = _ISO_MONTH_RE.match(q)
+    if month and 1 <= int(month.group(2)) <= 12:
+        start = datetime.date(int(month.group(1)), int(month.group(2)), 1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        params.update({"q_from": start, "q_to": end})
+        return "(e.event_date >= :q_from AND e.event_date < :q_to)"
+    params["q_prefix"] = _escape_like(q) + "%"
+    return "p.site_patient_id LIKE :q_prefix"
+
+
+def index_events_for_search(session, event_ids: list[int]) -> int:
+    """Rebuild the ``event_search`` rows for ``event_ids``; the caller commits.
+
+    Returns the number of trigram rows written.
+    """
+    if not event_ids:
+        return 0
+    ids = bindparam("ids", expanding=True)
+    events = session.execute(
+        text(
+            "SELECT e.id, e.patient_id, e.event_date, e.add_date, e.upload_date, "
+            "e.scrub_date, p.site, p.site_patient_id "
+            "FROM events e LEFT JOIN patients p ON p.id = e.patient_id "
+            "WHERE e.id IN :ids"
+        ).bindparams(ids),
+        {"ids": list(event_ids)},
+    ).mappings().all()
+    grams_by_event = {row["id"]: set() for row in events}
+    for row in events:
+        for value in row.values():
+            grams_by_event[row["id"]] |= _search_grams(value)
+    criteria = session.execute(
+        text("SELECT event_id, name, value FROM criterias WHERE event_id IN :ids").bindparams(ids),
+        {"ids": list(event_ids)},
+    ).mappings().all()
+    for row in criteria:
+        grams = grams_by_event.setdefault(row["event_id"], set())
+        grams |= _search_grams(row["name"]) | _search_grams(row["value"])
+
+    session.execute(
+        text("DELETE FROM event_search WHERE event_id IN :ids").bindparams(ids),
+        {"ids": list(event_ids)},
+    )
+    values = [
+        {"event_id": event_id, "gram": gram}
+        for event_id, grams in grams_by_event.items()
+        for gram in grams
+    ]
+    if values:
+        session.execute(
+            text("INSERT IGNORE INTO event_search (event_id, gram) VALUES (:event_id, :gram)"),
+            values,
+        )
+    return len(values)
+
+
+def rebuild_search_index(batch_size: int = 500) -> int:
+    """Backfill ``event_search`` for every event and return the events indexed."""
+    session = get_session()
+    try:
+        last_id = 0
+        indexed = 0
+        while True:
+            ids = session.execute(
+                text("SELECT id FROM events WHERE id > :last_id ORDER BY id LIMIT :n"),
+                {"last_id": last_id, "n": batch_size},
+            ).scalars().all()
+            if not ids:
+                break
+            index_events_for_search(session, ids)
+            session.commit()
+            indexed += len(ids)
+            last_id = ids[-1]
+            logger.info("Indexed %d events for search (through id %d)", indexed, last_id)
+        bump_table_version(*_LIST_TABLES)
+        return indexed
+    finally:
+        session.close()
+
+
+def reindex_pending_search(batch_size: int = 500) -> int:
+    """Reindex the events queued in ``event_search_pending`` and drain it.
+
+    Only queue rows present when the run starts are removed, so events queued
+    while it runs stay queued for the next one. Returns the events indexed.
+    """
+    session = get_session()
+    try:
+        upto = session.execute(text("SELECT MAX(id) FROM event_search_pending")).scalar()
+        if upto is None:
+            return 0
+        event_ids = session.execute(
+            text(
+                "SELECT DISTINCT event_id FROM event_search_pending "
+                "WHERE id <= :upto ORDER BY event_id"
+            ),
+            {"upto": upto},
+        ).scalars().all()
+        for start in range(0, len(event_ids), batch_size):
+            index_events_for_search(session, event_ids[start:start + batch_size])
+            session.commit()
+        session.execute(text("DELETE FROM event_search_pending WHERE id <= :upto"), {"upto": upto})
+        session.commit()
+        logger.info("Reindexed %d pending events for search", len(event_ids))
+        return len(event_ids)
+    finally:
+        session.close()
+
+
+# ``event_criteria_summary`` (init/06-event-criteria-summary.sql) stores the
+# ``GROUP_CONCAT`` of each event's criteria names so the worklists can read
+# one row per event instead of joining criterias and grouping.
+_CRITERIA_SUMMARY_SQL = (
+    "SELECT event_id, GROUP_CONCAT(name ORDER BY name SEPARATOR ', ') AS criteria "
+    "FROM criterias {where}GROUP BY event_id"
+)
+
+
+def refresh_criteria_summary(session, event_ids: list[int]) -> None:
+    """Recompute ``event_criteria_summary`` for ``event_ids``; the caller commits."""
+    if not event_ids:
+        return
+    ids = bindparam("ids", expanding=True)
+    session.execute(
+        text("DELETE FROM event_criteria_summary WHERE event_id IN :ids").bindparams(ids),
+        {"ids": list(event_ids)},
+    )
+    session.execute(
+        text(
+            "INSERT INTO event_criteria_summary (event_id, criteria) "
+            + _CRITERIA_SUMMARY_SQL.format(where="WHERE event_id IN :ids ")
+        ).bindparams(ids),
+        {"ids": list(event_ids)},
+    )
+
+
+def rebuild_criteria_summary() -> int:
+    """Repopulate ``event_criteria_summary`` from criterias; returns rows written."""
+    session = get_session()
+    try:
+        session.execute(text("DELETE FROM event_criteria_summary"))
+        result = session.execute(
+            text(
+                "INSERT INTO event_criteria_summary (event_id, criteria) "
+                + _CRITERIA_SUMMARY_SQL.format(where="")
+            )
+        )
+        session.commit()
+        bump_table_version("criterias")
+        return result.rowcount
+    finally:
+        session.close()
+
+
+def check_criteria_summary(limit: int = 100) -> dict:
+    """Compare ``event_criteria_summary`` with criterias.
+
+    Returns ``{"mismatched": [...], "orphaned": [...]}``: events whose stored
+    summary differs from a fresh ``GROUP_CONCAT`` (missing rows included) and
+    summary rows whose event no longer exists. Both lists are capped at
+    ``limit`` ids.
+    """
+    session = get_session()
+    try:
+        mismatched = session.execute(
+            text(
+                "SELECT e.id FROM events e "
+                "LEFT JOIN event_criteria_summary ecs ON ecs.event_id = e.id "
+                f"LEFT JOIN ({_CRITERIA_SUMMARY_SQL.format(where='')}) fresh "
+                "ON fresh.event_id = e.id "
+                "WHERE NOT (ecs.criteria <=> fresh.criteria) "
+                "ORDER BY e.id LIMIT :limit"
+            ),
+            {"limit": limit},
+        ).scalars().all()
+        orphaned = session.execute(
+            text(
+                "SELECT ecs.event_id FROM event_criteria_summary ecs "
+                "LEFT JOIN events e ON e.id = ecs.event_id "
+                "WHERE e.id IS NULL ORDER BY ecs.event_id LIMIT :limit"
+            ),
+            {"limit": limit},
+        ).scalars().all()
+        return {"mismatched": list(mismatched), "orphaned": list(orphaned)}
+    finally:
+        session.close()
+
+
+def repair_criteria_summary(event_ids: list[int]) -> None:
+    """Recompute the summaries of ``event_ids`` (e.g. from ``check_criteria_summary``)."""
+    session = get_session()
+    try:
+        refresh_criteria_summary(session, event_ids)
+        session.commit()
+        bump_table_version("criterias")
+    finally:
+        session.close()
+
+
+def repair_all_criteria_summaries(limit: int = 100) -> int:
+    """Repair drift ``limit`` ids at a time until the check comes back clean.
+
+    Returns the number of summaries recomputed. Raises ``RuntimeError`` when a
+    pass leaves exactly the same ids mismatched, which means the repair is not
+    taking (rather than new drift arriving from concurrent writes).
+    """
+    repaired = 0
+    previous = None
+    while True:
+        report = check_criteria_summary(limit)
+        event_ids = report["mismatched"] + report["orphaned"]
+        if not event_ids:
+            return repaired
+        if event_ids == previous:
+            raise RuntimeError(f"Criteria summaries still differ after repair: {event_ids}")
+        repair_criteria_summary(event_ids)
+        repaired += len(event_ids)
+        previous = event_ids
+
+
+_PATIENT_REF_RE = re.compile(r"\bp\.")
+
+
+def _site_column() -> str:
+    """Return the site expression: denormalized ``e.site`` when it exists."""
+    return "e.site" if _has_column("events", "site") else "p.site"
+
+
+def _events_from_sql(where_sql: str) -> str:
+    """Return the ``FROM`` for events filtered by ``where_sql``.
+
+    ``patients`` is joined only while events have no ``site`` column or
+    ``where_sql`` still reads patient fields (site_patient_id searches).
+    """
+    if _has_column("events", "site") and not _PATIENT_REF_RE.search(where_sql):
+        return "FROM events e"
+    return "FROM events e JOIN patients p ON e.patient_id = p.id"
+
+
+def _criteria_summary_current() -> bool:
+    """Whether ``event_criteria_summary`` follows every criteria write.
+
+    Only the triggers of ``init/15-event-criteria-summary-triggers.sql`` see
+    the legacy app's writes; without them the worklists join ``criterias``.
+    """
+    return _has_table("event_criteria_summary") and _has_trigger("criterias_summary_insert")
+
+
+def _worklist_select_from(where_sql: str):
+    """Return (select_sql, from_sql) for the friendly-column event worklists."""
+    site = _site_column()
+    events_from = _events_from_sql(where_sql)
+    if _criteria_summary_current():
+        select_sql = (
+            "e.id AS `ID`, e.event_date AS `Date`, e.add_date AS `Created`, "
+            "e.upload_date AS `Uploaded`, e.scrub_date AS `Scrubbed`, "
+            f"ecs.criteria AS `Criteria`, {site} AS `Site`"
+        )
+        from_sql = (
+            f"{events_from} "
+            "LEFT JOIN event_criteria_summary ecs ON ecs.event_id = e.id "
+            f"WHERE {where_sql} "
+        )
+        return select_sql, from_sql
+    select_sql = (
+        "e.id AS `ID`, e.event_date AS `Date`, e.add_date AS `Created`, "
+        "e.upload_date AS `Uploaded`, e.scrub_date AS `Scrubbed`, "
+        f"GROUP_CONCAT(c.name ORDER BY c.name SEPARATOR ', ') AS `Criteria`, {site} AS `Site`"
+    )
+    from_sql = (
+        f"{events_from} "
+        "LEFT JOIN criterias c ON e.id = c.event_id "
+        f"WHERE {where_sql} "
+        f"GROUP BY e.id, e.event_date, e.add_date, e.upload_date, e.scrub_date, {site} "
+    )
+    return select_sql, from_sql
+
+
+def _touch_events(session, event_ids: list[int]) -> None:
+    """Set ``last_modified`` on ``event_ids`` to now; the caller commits."""
+    if not event_ids:
+        return
+    session.execute(
+        text(
+            "UPDATE events SET last_modified = CURRENT_TIMESTAMP WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(event_ids)},
+    )
+
+
+def _refresh_event_derived_data(session, event_ids: list[int]) -> None:
+    """Best-effort upkeep of the criteria summary and search index after writes.
+
+    Call this from every path that inserts, updates or deletes events or
+    criterias. It also stamps ``events.last_modified`` so the delta export
+    picks up changes (criteria edits) that do not touch the event row itself.
+    Failures are logged rather than raised because the write itself has
+    already been committed; the rebuild commands repair any gap.
+    """
+    if _has_column("events", "last_modified"):
+        try:
+            _touch_events(session, event_ids)
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.exception("Failed to stamp last_modified for events %s", event_ids)
+    for table, refresh, command in (
+        ("event_criteria_summary", refresh_criteria_summary, "rebuild-criteria-summary"),
+        ("event_search", index_events_for_search, "rebuild-search-index"),
+    ):
+        if not _has_table(table):
+            continue
+        try:
+            refresh(session, event_ids)
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.exception("Failed to update %s for events %s; run %s", table, event_ids, command)
 
 
 def get_table_data(name: str, limit: Optional[int] = None, offset: int = 0):
@@ -46,7 +1160,7 @@ def get_table_data(name: str, limit: Optional[int] = None, offset: int = 0):
         name,
         offset,
     )
-    session = get_session()
+    session = get_read_session()
     stmt = f"SELECT * FROM {name}"
     params = {}
     if limit is not None:
@@ -64,17 +1178,22 @@ def get_table_data(name: str, limit: Optional[int] = None, offset: int = 0):
 
 
 def get_events_by_status_with_total(
-    status: str,
+    status,
     limit: Optional[int] = None,
     offset: int = 0,
     q: Optional[str] = None,
     site: Optional[str] = None,
+    after: Optional[str] = None,
+    match: Optional[str] = None,
 ):
     """Return (rows, total) for events filtered by status, with friendly columns.
 
     Friendly columns: ID, Date, Created, Uploaded, Scrubbed, Criteria, Site.
-    Supports text search (q) across id, event_date, site_patient_id, and criteria name/value,
-    and site filtering.
+    ``status`` is one status or a list of them, read in a single
+    ``status IN (...)`` query with one total.
+    Supports text search (q, see ``_plan_search`` for ``match``) across id,
+    dates, site, site_patient_id and criteria name/value, and site filtering. Rows are ordered by ID; pass ``after`` (see
+    ``next_cursor``) instead of ``offset`` to seek directly to the next page.
     """
     logger.debug(
         "Fetching %sevents with status %s starting at %d",
@@ -82,58 +1201,35 @@ def get_events_by_status_with_total(
         status,
         offset,
     )
-    session = get_session()
-    like = f"%{q}%" if q else None
-    where = ["e.status = :status"]
-    params = {"status": status}
+    if isinstance(status, str):
+        where = ["e.status = :status"]
+        params = {"status": status}
+    else:
+        params = {f"status_{i}": value for i, value in enumerate(status)}
+        where = [f"e.status IN ({', '.join(':' + name for name in params)})"]
     if site:
-        where.append("p.site = :site")
+        where.append(f"{_site_column()} = :site")
         params["site"] = site
     if q:
-        where.append(
-            "(CAST(e.id AS CHAR) LIKE :like "
-            "OR e.event_date LIKE :like "
-            "OR e.add_date LIKE :like "
-            "OR e.upload_date LIKE :like "
-            "OR e.scrub_date LIKE :like "
-            "OR p.site LIKE :like "
-            "OR p.site_patient_id LIKE :like "
-            "OR EXISTS (SELECT 1 FROM criterias c2 WHERE c2.event_id = e.id AND (c2.name LIKE :like OR c2.value LIKE :like)))"
-        )
-        params["like"] = like
+        where.append(_plan_search(q, _STATUS_LIKE_SQL, params, match))
 
     where_sql = " AND ".join(where)
-
-    query = (
-        "SELECT e.id AS `ID`, "
-        "e.event_date AS `Date`, "
-        "e.add_date AS `Created`, "
-        "e.upload_date AS `Uploaded`, "
-        "e.scrub_date AS `Scrubbed`, "
-        "GROUP_CONCAT(c.name ORDER BY c.name SEPARATOR ', ') AS `Criteria`, "
-        "p.site AS `Site` "
-        "FROM events e "
-        "JOIN patients p ON e.patient_id = p.id "
-        "LEFT JOIN criterias c ON e.id = c.event_id "
-        f"WHERE {where_sql} "
-        "GROUP BY e.id, e.event_date, e.add_date, e.upload_date, e.scrub_date, p.site "
-    )
-    if limit is not None:
-        query += " LIMIT :limit OFFSET :offset"
-        params.update({"limit": limit, "offset": offset})
-    elif offset:
-        query += " LIMIT 18446744073709551615 OFFSET :offset"
-        params["offset"] = offset
-    rows = session.execute(text(query), params).mappings().all()
-
-    count_q = text(
-        "SELECT COUNT(DISTINCT e.id) FROM events e JOIN patients p ON e.patient_id = p.id "
-        f"WHERE {where_sql}"
-    )
-    total = session.execute(count_q, params).scalar() or 0
+    page_where_sql = where_sql
+    if after:
+        page_where_sql = f"{where_sql} AND {_seek_sql(ID_KEYSET, after, params)}"
+
+    select_sql, from_sql = _worklist_select_from(page_where_sql)
+    tail_sql = _order_by_sql(ID_KEYSET) + _limit_sql(limit, offset, params, after)
+    count_sql = f"SELECT COUNT(DISTINCT e.id) {_events_from_sql(where_sql)} WHERE {where_sql}"
+    session = get_read_session()
+    try:
+        rows, total = _fetch_page_and_total(
+            session, select_sql, from_sql, tail_sql, count_sql, params, offset, after
+        )
+    finally:
+        session.close()
     logger.debug("Fetched %d/%d events with status %s", len(rows), total, status)
-    session.close()
-    return [dict(r) for r in rows], int(total)
+    return rows, total
 
 
 def get_events_by_status(status: str, limit: Optional[int] = None, offset: int = 0):
@@ -156,381 +1252,1100 @@ def get_events_for_reupload(limit: Optional[int] = None, offset: int = 0):
     return get_events_by_status("rejected", limit, offset)
 
 
-def get_event_status_summary():
-    """Return a mapping of event status names to row counts."""
-    logger.debug("Fetching event status summary")
+def _status_counts_sql() -> str:
+    """Live counts per status and site, keyed like ``event_status_counts``.
+
+    The counter triggers (``init/13-events-site-triggers.sql``) key on
+    ``events.site``; before that column exists they key on the patient's site.
+    """
+    if _has_column("events", "site"):
+        return (
+            "SELECT e.status, COALESCE(e.site, '') AS site, COUNT(*) AS count "
+            "FROM events e GROUP BY e.status, COALESCE(e.site, '')"
+        )
+    return (
+        "SELECT e.status, COALESCE(p.site, '') AS site, COUNT(*) AS count "
+        "FROM events e LEFT JOIN patients p ON p.id = e.patient_id "
+        "GROUP BY e.status, COALESCE(p.site, '')"
+    )
+
+
+def sync_event_sites(batch_size: int = 1000) -> dict:
+    """Copy each event's patient site into ``events.site`` where it differs.
+
+    Sites come from the external patient database when one is configured
+    (it is authoritative there) and from the local ``patients`` table
+    otherwise. Events are walked in id batches; returns
+    ``{"scanned": N, "updated": M}``.
+    """
+    session = get_session()
+    ext_session = _get_external_session_or_none()
+    patients_session = ext_session or session
+    scanned = updated = 0
+    last_id = 0
+    try:
+        while True:
+            events = session.execute(
+                text(
+                    "SELECT id, patient_id, site FROM events WHERE id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not events:
+                break
+            last_id = events[-1][0]
+            scanned += len(events)
+            with _external_guard(ext_session is not None):
+                sites = dict(
+                    patients_session.execute(
+                        text("SELECT id, site FROM patients WHERE id IN :ids").bindparams(
+                            bindparam("ids", expanding=True)
+                        ),
+                        {"ids": list({patient_id for _id, patient_id, _site in events})},
+                    ).all()
+                )
+            changes = [
+                {"id": event_id, "site": sites[patient_id]}
+                for event_id, patient_id, site in events
+                if patient_id in sites and sites[patient_id] != site
+            ]
+            if changes:
+                session.execute(text("UPDATE events SET site = :site WHERE id = :id"), changes)
+                session.commit()
+                updated += len(changes)
+        if updated:
+            bump_table_version("events")
+        logger.info("Synced events.site: %d scanned, %d updated", scanned, updated)
+        return {"scanned": scanned, "updated": updated}
+    finally:
+        session.close()
+        if ext_session is not None:
+            ext_session.close()
+
+
+# ``sync_patients`` keeps the local ``patients`` table a mirror of the
+# external patients database. With ``PATIENTS_SOURCE=local`` patient lookups
+# read the mirror and only new patients go to the external database.
+PATIENTS_SOURCE = os.getenv("PATIENTS_SOURCE", "external")
+PATIENTS_SYNC_OVERLAP = float(os.getenv("PATIENTS_SYNC_OVERLAP", "60"))
+_PATIENT_COLUMNS = ("id", "site_patient_id", "site", "last_update", "create_date")
+_PATIENT_UPSERT_SQL = (
+    "INSERT INTO patients (id, site_patient_id, site, last_update, create_date) "
+    "VALUES (:id, :site_patient_id, :site, :last_update, :create_date) "
+    "ON DUPLICATE KEY UPDATE site_patient_id = VALUES(site_patient_id), "
+    "site = VALUES(site), last_update = VALUES(last_update), "
+    "create_date = VALUES(create_date)"
+)
+# Row count plus an order-independent checksum over every mirrored column.
+_PATIENT_CHECKSUM_SQL = (
+    "SELECT COUNT(*), COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', id, site_patient_id, "
+    "site, last_update, create_date))), 0) FROM patients WHERE id <> 0"
+)
+# The legacy dump uses zero dates, which drivers hand back as None.
+_ZERO_DATETIME = "0000-00-00 00:00:00"
+
+
+def _mirror_row(row) -> dict:
+    values = {col: row[col] for col in _PATIENT_COLUMNS}
+    for col in ("last_update", "create_date"):
+        if values[col] is None:
+            values[col] = _ZERO_DATETIME
+    return values
+
+
+def _external_session_required():
+    ext_session = _get_external_session_or_none()
+    if ext_session is None:
+        raise ValidationError("External patient DB is unavailable")
+    return ext_session
+
+
+def sync_patients(batch_size: int = 1000, full: bool = False) -> dict:
+    """Upsert patients changed in the external database into ``patients``.
+
+    Only rows whose ``last_update`` is at or after the stored watermark (less
+    ``PATIENTS_SYNC_OVERLAP`` seconds of clock slack) are pulled, in id
+    batches, unless ``full``. The new watermark is the external database's
+    time when the run started, so rows changed during a run are pulled again
+    next time rather than missed. Returns ``{"synced": N, "watermark": ...}``.
+    """
+    if not _has_table("sync_watermarks"):
+        raise ValidationError("sync_watermarks is missing; apply init/12-patients-sync.sql")
+    session = get_session()
+    ext_session = _external_session_required()
+    try:
+        since = None
+        if not full:
+            since = session.execute(
+                text("SELECT watermark FROM sync_watermarks WHERE name = 'patients'")
+            ).scalar()
+        if since is not None:
+            since -= datetime.timedelta(seconds=PATIENTS_SYNC_OVERLAP)
+        with _external_guard():
+            watermark = ext_session.execute(text("SELECT CURRENT_TIMESTAMP")).scalar()
+        where = "id > :last_id AND id <> 0"
+        params: dict = {"limit": batch_size}
+        if since is not None:
+            where += " AND last_update >= :since"
+            params["since"] = since
+        query = text(
+            f"SELECT {', '.join(_PATIENT_COLUMNS)} FROM patients WHERE {where} "
+            "ORDER BY id LIMIT :limit"
+        )
+        update_sites = _has_column("events", "site")
+        synced = 0
+        last_id = 0
+        while True:
+            with _external_guard():
+                rows = ext_session.execute(query, {**params, "last_id": last_id}).mappings().all()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            values = [_mirror_row(row) for row in rows]
+            session.execute(text(_PATIENT_UPSERT_SQL), values)
+            if update_sites:
+                session.execute(
+                    text("UPDATE events SET site = :site WHERE patient_id = :id AND NOT site <=> :site"),
+                    [{"id": v["id"], "site": v["site"]} for v in values],
+                )
+            session.commit()
+            for v in values:
+                _patient_cache.pop(("site", v["id"]))
+                _patient_cache.pop(("id", v["site"], v["site_patient_id"]))
+            synced += len(values)
+        session.execute(
+            text(
+                "INSERT INTO sync_watermarks (name, watermark, rows_synced) "
+                "VALUES ('patients', :watermark, :synced) "
+                "ON DUPLICATE KEY UPDATE watermark = VALUES(watermark), "
+                "rows_synced = VALUES(rows_synced)"
+            ),
+            {"watermark": watermark, "synced": synced},
+        )
+        session.commit()
+        if synced:
+            bump_table_version("patients", *(("events",) if update_sites else ()))
+        logger.info("Synced %d patients (%s)", synced, "full" if full else f"since {since}")
+        if isinstance(watermark, datetime.datetime):
+            watermark = watermark.isoformat(timespec="seconds")
+        return {"synced": synced, "watermark": watermark}
+    finally:
+        session.close()
+        ext_session.close()
+
+
+def verify_patients_mirror() -> dict:
+    """Compare row counts and checksums of the local and external patients."""
     session = get_session()
-    stmt = text("SELECT status, COUNT(*) AS count FROM events GROUP BY status")
-    rows = session.execute(stmt).all()
+    ext_session = _external_session_required()
+    try:
+        local = session.execute(text(_PATIENT_CHECKSUM_SQL)).one()
+        with _external_guard():
+            external = ext_session.execute(text(_PATIENT_CHECKSUM_SQL)).one()
+    finally:
+        session.close()
+        ext_session.close()
+    result = {
+        "local": {"count": int(local[0]), "checksum": int(local[1])},
+        "external": {"count": int(external[0]), "checksum": int(external[1])},
+    }
+    result["match"] = result["local"] == result["external"]
+    return result
+
+
+def start_patients_sync_thread(interval: float, batch_size: int = 1000) -> threading.Thread:
+    """Run ``sync_patients`` every ``interval`` seconds in a daemon thread."""
+
+    def run():
+        while True:
+            try:
+                sync_patients(batch_size=batch_size)
+            except Exception:
+                logger.exception("Scheduled patients sync failed")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="patients-sync", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_event_status_summary(by_site: bool = False):
+    """Return a mapping of event status names to row counts.
+
+    With ``by_site`` the counts are broken down further as
+    ``{status: {site: count}}`` (``""`` for events without a known site).
+    Reads the small ``event_status_counts`` table when it exists.
+    """
+    logger.debug("Fetching event status summary")
+    if _has_table("event_status_counts"):
+        if by_site:
+            stmt = "SELECT status, site, count FROM event_status_counts WHERE count > 0"
+        else:
+            stmt = (
+                "SELECT status, SUM(count) AS count FROM event_status_counts "
+                "GROUP BY status HAVING SUM(count) > 0"
+            )
+    elif by_site:
+        stmt = _status_counts_sql()
+    else:
+        stmt = "SELECT status, COUNT(*) AS count FROM events GROUP BY status"
+    session = get_read_session()
+    try:
+        rows = session.execute(text(stmt)).all()
+    finally:
+        session.close()
     logger.debug("Fetched summary for %d statuses", len(rows))
-    session.close()
-    return {row[0]: row[1] for row in rows}
+    if not by_site:
+        return {row[0]: int(row[1]) for row in rows}
+    summary: dict = {}
+    for status, site, count in rows:
+        summary.setdefault(status, {})[site] = int(count)
+    return summary
+
+
+def check_status_counts() -> list[dict]:
+    """Compare ``event_status_counts`` with a fresh count over events.
+
+    Returns one ``{"status", "site", "stored", "actual"}`` entry per
+    disagreeing row, including rows missing from either side.
+    """
+    session = get_session()
+    try:
+        actual = {
+            (status, site): int(count)
+            for status, site, count in session.execute(text(_status_counts_sql())).all()
+        }
+        stored = {
+            (status, site): int(count)
+            for status, site, count in session.execute(
+                text("SELECT status, site, count FROM event_status_counts")
+            ).all()
+        }
+    finally:
+        session.close()
+    drift = []
+    for status, site in sorted(set(actual) | set(stored)):
+        have = stored.get((status, site), 0)
+        want = actual.get((status, site), 0)
+        if have != want:
+            drift.append({"status": status, "site": site, "stored": have, "actual": want})
+    return drift
+
+
+def rebuild_status_counts() -> int:
+    """Recount ``event_status_counts`` from events in one transaction.
+
+    The ``DELETE`` locks the counter rows, so the triggers of concurrent
+    event writes wait and apply on top of the fresh counts. ``events`` is
+    MyISAM, though, so such a write may already be visible to the recount
+    and end up counted twice; a later check corrects it. Returns rows
+    written.
+    """
+    session = get_session()
+    try:
+        session.execute(text("DELETE FROM event_status_counts"))
+        result = session.execute(
+            text("INSERT INTO event_status_counts (status, site, count) " + _status_counts_sql())
+        )
+        session.commit()
+        return result.rowcount
+    finally:
+        session.close()
+
+
+def _cache_patient(patient_id, site, site_patient_id=None) -> None:
+    _patient_cache.set(("site", patient_id), site)
+    if site_patient_id is not None:
+        _patient_cache.set(("id", site, site_patient_id), patient_id)
+
+
+def get_patient_sites(patient_ids, fallback_session=None) -> dict:
+    """Return ``{patient_id: site}``, querying only ids not cached yet.
+
+    Misses are read in one ``IN`` query from the external database, or from
+    ``fallback_session`` (the local ``patients`` copy) when it is unavailable
+    or ``PATIENTS_SOURCE`` is ``local``.
+    """
+    sites = {}
+    missing = []
+    for patient_id in dict.fromkeys(patient_ids):
+        site = _patient_cache.get(("site", patient_id))
+        if site is _MISSING:
+            missing.append(patient_id)
+        else:
+            sites[patient_id] = site
+    if not missing:
+        return sites
+    stmt = text("SELECT id, site FROM patients WHERE id IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    rows = None
+    ext_session = None if PATIENTS_SOURCE == "local" else _get_external_session_or_none()
+    if ext_session is not None:
+        try:
+            with _external_guard():
+                rows = ext_session.execute(stmt, {"ids": missing}).mappings().all()
+        except SQLAlchemyError as exc:
+            logger.warning("External patient lookup failed; using the local copy: %s", exc)
+        finally:
+            ext_session.close()
+    if rows is None:
+        lookup_session = fallback_session or get_session()
+        try:
+            rows = lookup_session.execute(stmt, {"ids": missing}).mappings().all()
+        finally:
+            if lookup_session is not fallback_session:
+                lookup_session.close()
+    logger.debug("Fetched site info for %d of %d uncached patients", len(rows), len(missing))
+    for r in rows:
+        sites[r["id"]] = r["site"]
+        _cache_patient(r["id"], r["site"])
+    return sites
+
+
+# ``get_events_with_patient_site`` resolves sites on a small thread pool so a
+# slow external database cannot hold up the listing for more than
+# ``SITE_LOOKUP_TIMEOUT`` seconds; paginated requests also warm the patient
+# cache for the next page while the current one is looked up. Prefetches run
+# on their own single worker, at most one at a time, so they never queue
+# ahead of a real lookup.
+SITE_LOOKUP_TIMEOUT = float(os.getenv("SITE_LOOKUP_TIMEOUT", "2"))
+SITE_LOOKUP_WORKERS = int(os.getenv("SITE_LOOKUP_WORKERS", "4"))
+SITE_PREFETCH = os.getenv("SITE_PREFETCH", "1") != "0"
+_site_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_site_pool_lock = threading.Lock()
+_prefetch_slot = threading.Semaphore(1)
+
+
+class EventRows(list):
+    """Event rows; ``degraded`` is True when sites could not be resolved in time."""
+
+    degraded = False
+
+
+def _site_lookup_pool() -> ThreadPoolExecutor:
+    global _site_pool
+    with _site_pool_lock:
+        if _site_pool is None:
+            _site_pool = ThreadPoolExecutor(
+                max_workers=SITE_LOOKUP_WORKERS, thread_name_prefix="site-lookup"
+            )
+        return _site_pool
+
+
+def _site_prefetch_pool() -> ThreadPoolExecutor:
+    global _prefetch_pool
+    with _site_pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="site-prefetch")
+        return _prefetch_pool
+
+
+def _events_page_sql(columns: str, limit: Optional[int], offset: int, params: dict) -> str:
+    stmt = f"SELECT {columns} FROM events ORDER BY id"
+    if limit is not None:
+        stmt += " LIMIT :limit OFFSET :offset"
+        params.update({"limit": limit, "offset": offset})
+    elif offset:
+        stmt += " LIMIT 18446744073709551615 OFFSET :offset"
+        params["offset"] = offset
+    return stmt
+
+
+# The next page is read by primary key from the current page's last id, not
+# by OFFSET, so a prefetch is a short index range scan however deep the page.
+_NEXT_PAGE_PATIENTS_SQL = "SELECT patient_id FROM events WHERE id > :after ORDER BY id LIMIT :limit"
+
+
+def _prefetch_patient_sites(after_id: int, limit: int) -> None:
+    """Load the sites of the next page's patients into the cache (worker thread)."""
+    try:
+        session = get_read_session()
+        try:
+            patient_ids = [
+                r[0]
+                for r in session.execute(
+                    text(_NEXT_PAGE_PATIENTS_SQL), {"after": after_id, "limit": limit}
+                ).all()
+            ]
+        finally:
+            session.close()
+        get_patient_sites(patient_ids)
+        _patient_cache.set(("page", after_id, limit), True)
+    except Exception as exc:
+        logger.warning("Prefetching patient sites failed: %s", exc)
+    finally:
+        _prefetch_slot.release()
+
+
+def _submit_prefetch(after_id: int, limit: int) -> None:
+    """Queue a prefetch unless that page is warm, one is running or the external DB is failing."""
+    if _patient_cache.get(("page", after_id, limit)) is not _MISSING:
+        return
+    if external_breaker.state != "closed" or not _prefetch_slot.acquire(blocking=False):
+        return
+    try:
+        _site_prefetch_pool().submit(_prefetch_patient_sites, after_id, limit)
+    except RuntimeError:
+        _prefetch_slot.release()
 
 
 def get_events_with_patient_site(limit: Optional[int] = None, offset: int = 0):
-    """Return events with site info from the external database."""
+    """Return events with site info from the external database.
+
+    If the sites are not resolved within ``SITE_LOOKUP_TIMEOUT`` seconds the
+    rows are returned with ``site`` None and the result's ``degraded`` set.
+    """
     logger.debug(
         "Fetching %sevents with patient site information starting at %d",
         f"up to {limit} " if limit is not None else "all ",
         offset,
     )
-    session = get_session()
+    session = get_read_session()
     try:
-        stmt = "SELECT id, patient_id FROM events"
-        params = {}
-        if limit is not None:
-            stmt += " LIMIT :limit OFFSET :offset"
-            params.update({"limit": limit, "offset": offset})
-        elif offset:
-            stmt += " LIMIT 18446744073709551615 OFFSET :offset"
-            params["offset"] = offset
+        params: dict = {}
+        stmt = _events_page_sql("id, patient_id", limit, offset, params)
         rows = session.execute(text(stmt), params).mappings().all()
-        rows = [dict(r) for r in rows]
-
-        patient_ids = [row["patient_id"] for row in rows]
-        ext_session = _get_external_session_or_none()
-        if patient_ids:
-            stmt = text("SELECT id, site FROM patients WHERE id IN :ids").bindparams(
-                bindparam("ids", expanding=True)
-            )
-            if ext_session is not None:
-                ext_rows = ext_session.execute(stmt, {"ids": patient_ids}).mappings().all()
-                ext_rows = [dict(r) for r in ext_rows]
-            else:
-                ext_rows = session.execute(stmt, {"ids": patient_ids}).mappings().all()
-                ext_rows = [dict(r) for r in ext_rows]
-            logger.debug("Fetched site info for %d patients", len(ext_rows))
-        else:
-            ext_rows = []
-        if ext_session is not None:
-            ext_session.close()
-
-        lookup = {r["id"]: r["site"] for r in ext_rows}
-        for r in rows:
-            r["site"] = lookup.get(r["patient_id"]) 
-        return rows
+        rows = EventRows(dict(r) for r in rows)
     finally:
         session.close()
 
+    # The lookup opens its own sessions: request sessions are not thread-safe.
+    future = _site_lookup_pool().submit(get_patient_sites, [row["patient_id"] for row in rows])
+    # A short page is the last one; there is nothing to prefetch after it.
+    if SITE_PREFETCH and limit and len(rows) == limit:
+        _submit_prefetch(rows[-1]["id"], limit)
+    try:
+        lookup = future.result(timeout=SITE_LOOKUP_TIMEOUT)
+    except FuturesTimeoutError:
+        logger.warning(
+            "Patient site lookup exceeded %ss; returning events without sites",
+            SITE_LOOKUP_TIMEOUT,
+        )
+        lookup = {}
+        rows.degraded = True
+    for r in rows:
+        r["site"] = lookup.get(r["patient_id"])
+    return rows
+
 
 def get_events_with_patient_site_with_total(
     limit: Optional[int] = None,
     offset: int = 0,
     q: Optional[str] = None,
     site: Optional[str] = None,
+    match: Optional[str] = None,
 ):
     """Return (rows, total) for events with patient site, with optional filtering."""
-    session = get_session()
+    session = get_read_session()
     try:
-        like = f"%{q}%" if q else None
         where = ["1=1"]
         params = {}
         if site:
-            where.append("p.site = :site")
+            where.append(f"{_site_column()} = :site")
             params["site"] = site
         if q:
-            where.append(
-                "(CAST(e.id AS CHAR) LIKE :like OR CAST(e.patient_id AS CHAR) LIKE :like OR e.event_date LIKE :like OR p.site_patient_id LIKE :like OR EXISTS (SELECT 1 FROM criterias c2 WHERE c2.event_id = e.id AND (c2.name LIKE :like OR c2.value LIKE :like)))"
-            )
-            params["like"] = like
+            where.append(_plan_search(q, _EVENTS_LIKE_SQL, params, match))
         where_sql = " AND ".join(where)
 
-        stmt = (
-            "SELECT e.id, e.patient_id, p.site FROM events e JOIN patients p ON e.patient_id = p.id "
-            f"WHERE {where_sql} "
-        )
-        if limit is not None:
-            stmt += " LIMIT :limit OFFSET :offset"
-            params.update({"limit": limit, "offset": offset})
-        elif offset:
-            stmt += " LIMIT 18446744073709551615 OFFSET :offset"
-            params["offset"] = offset
-        rows = session.execute(text(stmt), params).mappings().all()
-        rows = [dict(r) for r in rows]
-
-        count_q = text(
-            "SELECT COUNT(*) FROM events e JOIN patients p ON e.patient_id = p.id "
-            f"WHERE {where_sql}"
+        from_sql = f"{_events_from_sql(where_sql)} WHERE {where_sql} "
+        count_sql = f"SELECT COUNT(*) {_events_from_sql(where_sql)} WHERE {where_sql}"
+        return _fetch_page_and_total(
+            session,
+            f"e.id, e.patient_id, {_site_column()} AS site",
+            from_sql,
+            _limit_sql(limit, offset, params),
+            count_sql,
+            params,
+            offset,
         )
-        total = session.execute(count_q, params).scalar() or 0
-        return rows, int(total)
     finally:
         session.close()
 
 
+# Workflow phases as date-nullness predicates on ``e``, shared by the phase
+# worklists and the one-pass pipeline summary. ``init/09-events-phase.sql``
+# stores the same classification as ``events.phase`` (checked latest phase
+# first) and queries use it when present, see ``_phase_where``.
+PHASE_PREDICATES = {
+    # Uploaded but not scrubbed
+    "to_be_scrubbed": "e.upload_date IS NOT NULL AND e.scrub_date IS NULL",
+    # Scrubbed but not screened
+    "to_be_screened": "e.scrub_date IS NOT NULL AND e.screen_date IS NULL",
+    # Screened but not assigned
+    "to_be_assigned": "e.screen_date IS NOT NULL AND e.assign_date IS NULL",
+    # Assigned but not sent
+    "to_be_sent": "e.assign_date IS NOT NULL AND e.send_date IS NULL",
+    # Sent but not yet fully reviewed (at least one reviewer pending)
+    "to_be_reviewed": "e.send_date IS NOT NULL AND (e.review1_date IS NULL OR e.review2_date IS NULL)",
+}
+
+
+def _phase_where(phase: str, keyset, params: dict):
+    """Return ``(where_sql, keyset)`` selecting the events waiting in ``phase``.
+
+    With the generated ``phase``/``phase_date`` columns this is an equality
+    lookup ordered along the ``(phase, phase_date DESC, id)`` index, the date
+    in ``keyset`` being read from ``phase_date``; otherwise the date
+    predicates of ``PHASE_PREDICATES`` are used as they are.
+    """
+    if not _has_column("events", "phase"):
+        return PHASE_PREDICATES[phase], keyset
+    params["phase"] = phase
+    if keyset == ID_KEYSET:
+        # phase_date is NULL for id-sorted phases; saying so lets the index
+        # deliver the id order.
+        return "e.phase = :phase AND e.phase_date IS NULL", keyset
+    keyset = tuple(
+        (column, expr if expr == "e.id" else "e.phase_date", direction)
+        for column, expr, direction in keyset
+    )
+    return "e.phase = :phase", keyset
+
+
 def _phase_rows_with_total(
-    where_clause: str,
+    phase: str,
     params: dict,
     limit: Optional[int],
     offset: int,
     q: Optional[str],
     site: Optional[str],
-    order_by: Optional[str] = None,
+    keyset=ID_KEYSET,
+    after: Optional[str] = None,
+    match: Optional[str] = None,
 ):
-    like = f"%{q}%" if q else None
+    where_clause, keyset = _phase_where(phase, keyset, params)
     filt = []
     if site:
-        filt.append("p.site = :site")
+        filt.append(f"{_site_column()} = :site")
         params["site"] = site
     if q:
-        filt.append(
-            "(CAST(e.id AS CHAR) LIKE :like "
-            "OR CAST(e.patient_id AS CHAR) LIKE :like "
-            "OR e.event_date LIKE :like "
-            "OR e.add_date LIKE :like "
-            "OR e.upload_date LIKE :like "
-            "OR e.scrub_date LIKE :like "
-            "OR p.site LIKE :like "
-            "OR p.site_patient_id LIKE :like "
-            "OR EXISTS (SELECT 1 FROM criterias c2 WHERE c2.event_id = e.id AND (c2.name LIKE :like OR c2.value LIKE :like)))"
-        )
-        params["like"] = like
+        filt.append(_plan_search(q, _PHASE_LIKE_SQL, params, match))
     where_sql = where_clause
     if filt:
         where_sql = f"{where_clause} AND {' AND '.join(filt)}"
+    page_where_sql = where_sql
+    if after:
+        page_where_sql = f"{where_sql} AND {_seek_sql(keyset, after, params)}"
 
-    session = get_session()
+    session = get_read_session()
     try:
-        query = (
-            "SELECT e.id AS `ID`, e.event_date AS `Date`, e.add_date AS `Created`, "
-            "e.upload_date AS `Uploaded`, e.scrub_date AS `Scrubbed`, "
-            "GROUP_CONCAT(c.name ORDER BY c.name SEPARATOR ', ') AS `Criteria`, p.site AS `Site` "
-            "FROM events e JOIN patients p ON e.patient_id = p.id "
-            "LEFT JOIN criterias c ON e.id = c.event_id "
-            f"WHERE {where_sql} "
-            "GROUP BY e.id, e.event_date, e.add_date, e.upload_date, e.scrub_date, p.site "
-        )
-        if order_by:
-            query += order_by + " "
-        if limit is not None:
-            query += " LIMIT :limit OFFSET :offset"
-            params.update({"limit": limit, "offset": offset})
-        elif offset:
-            query += " LIMIT 18446744073709551615 OFFSET :offset"
-            params["offset"] = offset
-        rows = session.execute(text(query), params).mappings().all()
-
-        count_q = text(
-            "SELECT COUNT(DISTINCT e.id) FROM events e JOIN patients p ON e.patient_id = p.id "
-            f"WHERE {where_sql}"
+        select_sql, from_sql = _worklist_select_from(page_where_sql)
+        tail_sql = _order_by_sql(keyset) + _limit_sql(limit, offset, params, after)
+        count_sql = f"SELECT COUNT(DISTINCT e.id) {_events_from_sql(where_sql)} WHERE {where_sql}"
+        return _fetch_page_and_total(
+            session, select_sql, from_sql, tail_sql, count_sql, params, offset, after
         )
-        total = session.execute(count_q, params).scalar() or 0
-        return [dict(r) for r in rows], int(total)
     finally:
         session.close()
 
 
-def get_to_be_scrubbed_with_total(limit: Optional[int], offset: int, q: Optional[str], site: Optional[str]):
-    # Uploaded but not scrubbed
+def get_to_be_scrubbed_with_total(
+    limit: Optional[int],
+    offset: int,
+    q: Optional[str],
+    site: Optional[str],
+    after: Optional[str] = None,
+    match: Optional[str] = None,
+):
     return _phase_rows_with_total(
-        "e.upload_date IS NOT NULL AND e.scrub_date IS NULL",
+        "to_be_scrubbed",
         {},
         limit,
         offset,
         q,
         site,
-        "ORDER BY e.upload_date DESC, e.id ASC",
+        UPLOADED_KEYSET,
+        after,
+        match,
     )
 
 
-def get_to_be_screened_with_total(limit: Optional[int], offset: int, q: Optional[str], site: Optional[str]):
-    # Scrubbed but not screened
+def get_to_be_screened_with_total(
+    limit: Optional[int],
+    offset: int,
+    q: Optional[str],
+    site: Optional[str],
+    after: Optional[str] = None,
+    match: Optional[str] = None,
+):
     return _phase_rows_with_total(
-        "e.scrub_date IS NOT NULL AND e.screen_date IS NULL",
+        "to_be_screened",
         {},
         limit,
         offset,
         q,
         site,
-        "ORDER BY e.scrub_date DESC, e.id ASC",
+        SCRUBBED_KEYSET,
+        after,
+        match,
     )
 
 
-def get_to_be_assigned_with_total(limit: Optional[int], offset: int, q: Optional[str], site: Optional[str]):
-    # Screened but not assigned
+def get_to_be_assigned_with_total(
+    limit: Optional[int],
+    offset: int,
+    q: Optional[str],
+    site: Optional[str],
+    after: Optional[str] = None,
+    match: Optional[str] = None,
+):
     return _phase_rows_with_total(
-        "e.screen_date IS NOT NULL AND e.assign_date IS NULL",
+        "to_be_assigned",
         {},
         limit,
         offset,
         q,
         site,
-        None,
+        ID_KEYSET,
+        after,
+        match,
     )
 
 
-def get_to_be_sent_with_total(limit: Optional[int], offset: int, q: Optional[str], site: Optional[str]):
-    # Assigned but not sent
+def get_to_be_sent_with_total(
+    limit: Optional[int],
+    offset: int,
+    q: Optional[str],
+    site: Optional[str],
+    after: Optional[str] = None,
+    match: Optional[str] = None,
+):
     return _phase_rows_with_total(
-        "e.assign_date IS NOT NULL AND e.send_date IS NULL",
+        "to_be_sent",
         {},
         limit,
         offset,
         q,
         site,
-        None,
+        ID_KEYSET,
+        after,
+        match,
     )
 
 
-def get_to_be_reviewed_with_total(limit: Optional[int], offset: int, q: Optional[str], site: Optional[str]):
-    # Sent but not yet fully reviewed (at least one reviewer pending)
+def get_to_be_reviewed_with_total(
+    limit: Optional[int],
+    offset: int,
+    q: Optional[str],
+    site: Optional[str],
+    after: Optional[str] = None,
+    match: Optional[str] = None,
+):
     return _phase_rows_with_total(
-        "e.send_date IS NOT NULL AND (e.review1_date IS NULL OR e.review2_date IS NULL)",
+        "to_be_reviewed",
         {},
         limit,
         offset,
         q,
         site,
-        None,
+        ID_KEYSET,
+        after,
+        match,
     )
 
 
-def get_events_export_rows() -> list[dict]:
-    """Return rows suitable for CSV export, with criteria pivots and user names."""
-    session = get_session()
+def get_pipeline_summary(by_site: bool = False) -> dict:
+    """Return the number of events in every workflow phase from one scan.
+
+    Keys are those of ``PHASE_PREDICATES``; counts match the totals of the
+    phase worklists. With ``by_site`` the result is ``{site: {phase: count}}``
+    (``""`` for events without a known site).
+    """
+    if _has_column("events", "phase"):
+        predicates = {phase: f"e.phase = '{phase}'" for phase in PHASE_PREDICATES}
+    else:
+        predicates = PHASE_PREDICATES
+    columns = ", ".join(
+        f"SUM(CASE WHEN {predicate} THEN 1 ELSE 0 END) AS `{phase}`"
+        for phase, predicate in predicates.items()
+    )
+    # Keyed like ``event_status_counts``: ``""`` for events without a site.
+    site = f"COALESCE({_site_column()}, '')"
+    from_sql = _events_from_sql("")
+    if by_site:
+        query = f"SELECT {site} AS site, {columns} {from_sql} GROUP BY {site} ORDER BY {site}"
+    else:
+        query = f"SELECT {columns} {from_sql}"
+    session = get_read_session()
     try:
-        query = text(
-            """
-            WITH crit AS (
-              SELECT
-                event_id,
-                MAX(CASE WHEN LOWER(name) IN ('diagnosis','mi_dx','dx') THEN value END) AS mi_dx,
-                MAX(CASE WHEN LOWER(name) = 'creatine kinase mb quotient' THEN value END) AS ckmb_q,
-                MAX(CASE WHEN LOWER(name) = 'creatine kinase mb mass' THEN value END) AS ckmb_m,
-                MAX(CASE WHEN LOWER(name) = 'ckmb' THEN value END) AS ckmb,
-                MAX(CASE WHEN LOWER(name) IN ('troponin','troponin t','troponin i','trop_i','trop_t','troponin i (tni)','troponin t (tnt)') THEN value END) AS troponin,
-                GROUP_CONCAT(CASE WHEN LOWER(name) NOT IN (
-                    'diagnosis','mi_dx','dx','creatine kinase mb quotient','creatine kinase mb mass','ckmb','troponin','troponin t','troponin i','trop_i','trop_t','troponin i (tni)','troponin t (tnt)'
-                ) THEN CONCAT(name, ':', value) END SEPARATOR ';') AS other
-              FROM criterias
-              GROUP BY event_id
-            )
-            SELECT
-              e.id,
-              e.patient_id,
-              p.site_patient_id,
-              p.site,
-              e.event_date,
-              e.status,
-              cu.username AS creator,
-              crit.mi_dx,
-              crit.ckmb_q,
-              crit.ckmb_m,
-              crit.ckmb,
-              crit.troponin,
-              crit.other,
-              e.add_date,
-              uu.username AS uploader,
-              e.upload_date,
-              mk.username AS marker,
-              e.no_packet_reason,
-              e.two_attempts_flag,
-              e.prior_event_date,
-              e.prior_event_onsite_flag,
-              e.other_cause,
-              e.markNoPacket_date,
-              sb.username AS scrubber,
-              e.scrub_date,
-              sc.username AS screener,
-              e.screen_date,
-              e.rescrub_message,
-              e.reject_message,
-              asn.username AS assigner,
-              e.assign_date,
-              snd.username AS sender,
-              e.send_date,
-              r1.username AS reviewer1,
-              rv1.mci AS review1_mci,
-              rv1.abnormal_ce_values_flag AS review1_abnormal_ce,
-              rv1.ce_criteria AS review1_ce_criteria,
-              rv1.chest_pain_flag AS review1_chest_pain,
-              rv1.ecg_changes_flag AS review1_ecg_changes,
-              rv1.lvm_by_imaging_flag AS review1_lvm,
-              rv1.ci AS review1_ci,
-              rv1.type AS review1_type,
-              rv1.secondary_cause AS review1_secondary_cause,
-              rv1.other_cause AS review1_other_cause,
-              rv1.false_positive_flag AS review1_false_positive,
-              rv1.false_positive_reason AS review1_false_positive_reason,
-              rv1.false_positive_other_cause AS review1_false_positive_other_cause,
-              rv1.current_tobacco_use_flag AS review1_current_tobacco,
-              rv1.past_tobacco_use_flag AS review1_past_tobacco,
-              rv1.cocaine_use_flag AS review1_cocaine,
-              rv1.family_history_flag AS review1_family_history,
-              e.review1_date,
-              r2.username AS reviewer2,
-              rv2.mci AS review2_mci,
-              rv2.abnormal_ce_values_flag AS review2_abnormal_ce,
-              rv2.ce_criteria AS review2_ce_criteria,
-              rv2.chest_pain_flag AS review2_chest_pain,
-              rv2.ecg_changes_flag AS review2_ecg_changes,
-              rv2.lvm_by_imaging_flag AS review2_lvm,
-              rv2.ci AS review2_ci,
-              rv2.type AS review2_type,
-              rv2.secondary_cause AS review2_secondary_cause,
-              rv2.other_cause AS review2_other_cause,
-              rv2.false_positive_flag AS review2_false_positive,
-              rv2.false_positive_reason AS review2_false_positive_reason,
-              rv2.false_positive_other_cause AS review2_false_positive_other_cause,
-              rv2.current_tobacco_use_flag AS review2_current_tobacco,
-              rv2.past_tobacco_use_flag AS review2_past_tobacco,
-              rv2.cocaine_use_flag AS review2_cocaine,
-              rv2.family_history_flag AS review2_family_history,
-              e.review2_date,
-              a3.username AS assigner3rd,
-              e.assign3rd_date,
-              r3.username AS reviewer3,
-              rv3.mci AS review3_mci,
-              rv3.abnormal_ce_values_flag AS review3_abnormal_ce,
-              rv3.ce_criteria AS review3_ce_criteria,
-              rv3.chest_pain_flag AS review3_chest_pain,
-              rv3.ecg_changes_flag AS review3_ecg_changes,
-              rv3.lvm_by_imaging_flag AS review3_lvm,
-              rv3.ci AS review3_ci,
-              rv3.type AS review3_type,
-              rv3.secondary_cause AS review3_secondary_cause,
-              rv3.other_cause AS review3_other_cause,
-              rv3.false_positive_flag AS review3_false_positive,
-              rv3.false_positive_reason AS review3_false_positive_reason,
-              rv3.false_positive_other_cause AS review3_false_positive_other_cause,
-              rv3.current_tobacco_use_flag AS review3_current_tobacco,
-              rv3.past_tobacco_use_flag AS review3_past_tobacco,
-              rv3.cocaine_use_flag AS review3_cocaine,
-              rv3.family_history_flag AS review3_family_history,
-              e.review3_date,
-              edd.outcome AS overall_outcome,
-              edd.primary_secondary AS overall_primary_secondary,
-              edd.false_positive_event AS overall_false_positive_event,
-              edd.secondary_cause AS overall_secondary_cause,
-              edd.secondary_cause_other AS overall_secondary_cause_other,
-              edd.false_positive_reason AS overall_false_positive_reason,
-              edd.ci AS overall_ci
-            FROM events e
-            LEFT JOIN patients p ON p.id = e.patient_id
-            LEFT JOIN crit ON crit.event_id = e.id
-            LEFT JOIN users cu ON cu.id = e.creator_id
-            LEFT JOIN users uu ON uu.id = e.uploader_id
-            LEFT JOIN users mk ON mk.id = e.marker_id
-            LEFT JOIN users sb ON sb.id = e.scrubber_id
-            LEFT JOIN users sc ON sc.id = e.screener_id
-            LEFT JOIN users asn ON asn.id = e.assigner_id
-            LEFT JOIN users snd ON snd.id = e.sender_id
-            LEFT JOIN users r1 ON r1.id = e.reviewer1_id
-            LEFT JOIN users r2 ON r2.id = e.reviewer2_id
-            LEFT JOIN users a3 ON a3.id = e.assigner3rd_id
-            LEFT JOIN users r3 ON r3.id = e.reviewer3_id
-            LEFT JOIN reviews rv1 ON rv1.event_id = e.id AND rv1.reviewer_id = e.reviewer1_id
-            LEFT JOIN reviews rv2 ON rv2.event_id = e.id AND rv2.reviewer_id = e.reviewer2_id
-            LEFT JOIN reviews rv3 ON rv3.event_id = e.id AND rv3.reviewer_id = e.reviewer3_id
-            LEFT JOIN event_derived_datas edd ON edd.event_id = e.id
-            """
+        rows = session.execute(text(query)).mappings().all()
+    finally:
+        session.close()
+
+    def phase_counts(row) -> dict:
+        # SUM() over no rows is NULL
+        return {phase: int(row[phase] or 0) for phase in PHASE_PREDICATES}
+
+    if by_site:
+        return {row["site"] or "": phase_counts(row) for row in rows}
+    return phase_counts(rows[0]) if rows else {phase: 0 for phase in PHASE_PREDICATES}
+
+
+def get_pipeline_summary_cached(by_site: bool = False) -> dict:
+    """:func:`get_pipeline_summary` served from the versioned result cache."""
+    key = ("pipeline", by_site, _table_versions_for(("events", "patients")))
+    cached = _result_cache.get(key)
+    if cached is _MISSING:
+        cached = get_pipeline_summary(by_site)
+        if not _replica_may_lag():
+            _result_cache.set(key, cached)
+    return copy.deepcopy(cached)
+
+
+# Adjudication export: one row per event with criteria pivots, user names
+# and all three reviews. ``{crit_where}``/``{where}`` restrict the criteria
+# pivot and the events to an id range so the export can be read in chunks.
+_EXPORT_SQL = """
+WITH crit AS (
+  SELECT
+    event_id,
+    MAX(CASE WHEN LOWER(name) IN ('diagnosis','mi_dx','dx') THEN value END) AS mi_dx,
+    MAX(CASE WHEN LOWER(name) = 'creatine kinase mb quotient' THEN value END) AS ckmb_q,
+    MAX(CASE WHEN LOWER(name) = 'creatine kinase mb mass' THEN value END) AS ckmb_m,
+    MAX(CASE WHEN LOWER(name) = 'ckmb' THEN value END) AS ckmb,
+    MAX(CASE WHEN LOWER(name) IN ('troponin','troponin t','troponin i','trop_i','trop_t','troponin i (tni)','troponin t (tnt)') THEN value END) AS troponin,
+    GROUP_CONCAT(CASE WHEN LOWER(name) NOT IN (
+        'diagnosis','mi_dx','dx','creatine kinase mb quotient','creatine kinase mb mass','ckmb','troponin','troponin t','troponin i','trop_i','trop_t','troponin i (tni)','troponin t (tnt)'
+    ) THEN CONCAT(name, ':', value) END SEPARATOR ';') AS other
+  FROM criterias
+  {crit_where}
+  GROUP BY event_id
+)
+SELECT
+  e.id,
+  e.patient_id,
+  p.site_patient_id,
+  p.site,
+  e.event_date,
+  e.status,
+  cu.username AS creator,
+  crit.mi_dx,
+  crit.ckmb_q,
+  crit.ckmb_m,
+  crit.ckmb,
+  crit.troponin,
+  crit.other,
+  e.add_date,
+  uu.username AS uploader,
+  e.upload_date,
+  mk.username AS marker,
+  e.no_packet_reason,
+  e.two_attempts_flag,
+  e.prior_event_date,
+  e.prior_event_onsite_flag,
+  e.other_cause,
+  e.markNoPacket_date,
+  sb.username AS scrubber,
+  e.scrub_date,
+  sc.username AS screener,
+  e.screen_date,
+  e.rescrub_message,
+  e.reject_message,
+  asn.username AS assigner,
+  e.assign_date,
+  snd.username AS sender,
+  e.send_date,
+  r1.username AS reviewer1,
+  rv1.mci AS review1_mci,
+  rv1.abnormal_ce_values_flag AS review1_abnormal_ce,
+  rv1.ce_criteria AS review1_ce_criteria,
+  rv1.chest_pain_flag AS review1_chest_pain,
+  rv1.ecg_changes_flag AS review1_ecg_changes,
+  rv1.lvm_by_imaging_flag AS review1_lvm,
+  rv1.ci AS review1_ci,
+  rv1.type AS review1_type,
+  rv1.secondary_cause AS review1_secondary_cause,
+  rv1.other_cause AS review1_other_cause,
+  rv1.false_positive_flag AS review1_false_positive,
+  rv1.false_positive_reason AS review1_false_positive_reason,
+  rv1.false_positive_other_cause AS review1_false_positive_other_cause,
+  rv1.current_tobacco_use_flag AS review1_current_tobacco,
+  rv1.past_tobacco_use_flag AS review1_past_tobacco,
+  rv1.cocaine_use_flag AS review1_cocaine,
+  rv1.family_history_flag AS review1_family_history,
+  e.review1_date,
+  r2.username AS reviewer2,
+  rv2.mci AS review2_mci,
+  rv2.abnormal_ce_values_flag AS review2_abnormal_ce,
+  rv2.ce_criteria AS review2_ce_criteria,
+  rv2.chest_pain_flag AS review2_chest_pain,
+  rv2.ecg_changes_flag AS review2_ecg_changes,
+  rv2.lvm_by_imaging_flag AS review2_lvm,
+  rv2.ci AS review2_ci,
+  rv2.type AS review2_type,
+  rv2.secondary_cause AS review2_secondary_cause,
+  rv2.other_cause AS review2_other_cause,
+  rv2.false_positive_flag AS review2_false_positive,
+  rv2.false_positive_reason AS review2_false_positive_reason,
+  rv2.false_positive_other_cause AS review2_false_positive_other_cause,
+  rv2.current_tobacco_use_flag AS review2_current_tobacco,
+  rv2.past_tobacco_use_flag AS review2_past_tobacco,
+  rv2.cocaine_use_flag AS review2_cocaine,
+  rv2.family_history_flag AS review2_family_history,
+  e.review2_date,
+  a3.username AS assigner3rd,
+  e.assign3rd_date,
+  r3.username AS reviewer3,
+  rv3.mci AS review3_mci,
+  rv3.abnormal_ce_values_flag AS review3_abnormal_ce,
+  rv3.ce_criteria AS review3_ce_criteria,
+  rv3.chest_pain_flag AS review3_chest_pain,
+  rv3.ecg_changes_flag AS review3_ecg_changes,
+  rv3.lvm_by_imaging_flag AS review3_lvm,
+  rv3.ci AS review3_ci,
+  rv3.type AS review3_type,
+  rv3.secondary_cause AS review3_secondary_cause,
+  rv3.other_cause AS review3_other_cause,
+  rv3.false_positive_flag AS review3_false_positive,
+  rv3.false_positive_reason AS review3_false_positive_reason,
+  rv3.false_positive_other_cause AS review3_false_positive_other_cause,
+  rv3.current_tobacco_use_flag AS review3_current_tobacco,
+  rv3.past_tobacco_use_flag AS review3_past_tobacco,
+  rv3.cocaine_use_flag AS review3_cocaine,
+  rv3.family_history_flag AS review3_family_history,
+  e.review3_date,
+  edd.outcome AS overall_outcome,
+  edd.primary_secondary AS overall_primary_secondary,
+  edd.false_positive_event AS overall_false_positive_event,
+  edd.secondary_cause AS overall_secondary_cause,
+  edd.secondary_cause_other AS overall_secondary_cause_other,
+  edd.false_positive_reason AS overall_false_positive_reason,
+  edd.ci AS overall_ci
+FROM events e
+LEFT JOIN patients p ON p.id = e.patient_id
+LEFT JOIN crit ON crit.event_id = e.id
+LEFT JOIN users cu ON cu.id = e.creator_id
+LEFT JOIN users uu ON uu.id = e.uploader_id
+LEFT JOIN users mk ON mk.id = e.marker_id
+LEFT JOIN users sb ON sb.id = e.scrubber_id
+LEFT JOIN users sc ON sc.id = e.screener_id
+LEFT JOIN users asn ON asn.id = e.assigner_id
+LEFT JOIN users snd ON snd.id = e.sender_id
+LEFT JOIN users r1 ON r1.id = e.reviewer1_id
+LEFT JOIN users r2 ON r2.id = e.reviewer2_id
+LEFT JOIN users a3 ON a3.id = e.assigner3rd_id
+LEFT JOIN users r3 ON r3.id = e.reviewer3_id
+LEFT JOIN reviews rv1 ON rv1.event_id = e.id AND rv1.reviewer_id = e.reviewer1_id
+LEFT JOIN reviews rv2 ON rv2.event_id = e.id AND rv2.reviewer_id = e.reviewer2_id
+LEFT JOIN reviews rv3 ON rv3.event_id = e.id AND rv3.reviewer_id = e.reviewer3_id
+LEFT JOIN event_derived_datas edd ON edd.event_id = e.id
+{where}
+ORDER BY e.id
+"""
+
+# Events per range query when streaming the export, and how many ranges may
+# be read concurrently (1 keeps the export on a single connection).
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "1"))
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", "8"))
+
+
+# Workflow date columns used to detect changed events when
+# ``events.last_modified`` (``init/07-events-last-modified.sql``) is missing.
+_EXPORT_DATE_COLUMNS = (
+    "add_date",
+    "upload_date",
+    "markNoPacket_date",
+    "scrub_date",
+    "screen_date",
+    "assign_date",
+    "send_date",
+    "review1_date",
+    "review2_date",
+    "assign3rd_date",
+    "review3_date",
+)
+
+
+def _parse_since(since) -> Optional[datetime.datetime]:
+    if since is None or since == "":
+        return None
+    if isinstance(since, datetime.datetime):
+        return since
+    try:
+        return datetime.datetime.fromisoformat(str(since))
+    except ValueError:
+        raise ValidationError("since must be an ISO 8601 timestamp")
+
+
+def _export_delta_sql(since: Optional[datetime.datetime], params: dict) -> str:
+    """Return the predicate on ``e`` selecting events changed at or after ``since``.
+
+    ``last_modified`` is stamped by the database on every row update and by
+    the ``table_service`` write paths for criteria changes, so it also covers
+    edits such as ``reject_message`` that leave the date columns alone.
+    Without that column the workflow dates are compared by day, which may
+    re-send events already exported on that day but never misses one.
+    """
+    if since is None:
+        return ""
+    if _has_column("events", "last_modified"):
+        params["since"] = since
+        return "e.last_modified >= :since"
+    params["since_date"] = since.date()
+    return "(" + " OR ".join(f"e.{col} >= :since_date" for col in _EXPORT_DATE_COLUMNS) + ")"
+
+
+def _export_range_sql(delta_sql: str = "") -> str:
+    where = "WHERE e.id >= :lo AND e.id < :hi"
+    if delta_sql:
+        where += f" AND {delta_sql}"
+    return _EXPORT_SQL.format(
+        crit_where="WHERE event_id >= :lo AND event_id < :hi",
+        where=where,
+    )
+
+
+def _export_id_bounds(session, delta_sql: str = "", params: Optional[dict] = None):
+    where = f" e WHERE {delta_sql}" if delta_sql else ""
+    return session.execute(
+        text(f"SELECT MIN(id), MAX(id) FROM events{where}"), params or {}
+    ).one()
+
+
+def _export_ranges(lo: Optional[int], hi: Optional[int], chunk_size: int):
+    """Yield half-open ``(start, end)`` id ranges covering ``lo..hi``."""
+    if lo is None or hi is None:
+        return
+    for start in range(lo, hi + 1, chunk_size):
+        yield start, min(start + chunk_size, hi + 1)
+
+
+def _export_range_rows(
+    start: int,
+    end: int,
+    delta_sql: str = "",
+    params: Optional[dict] = None,
+    replica: bool = False,
+) -> list[dict]:
+    """Read one id range of the export on a dedicated session (worker thread)."""
+    session = get_read_session(replica)
+    try:
+        result = session.execute(
+            text(_export_range_sql(delta_sql)), {**(params or {}), "lo": start, "hi": end}
         )
-        rows = session.execute(query).mappings().all()
-        return [dict(r) for r in rows]
+        return [dict(r) for r in result.mappings()]
     finally:
         session.close()
 
 
+def _iter_export_parallel(
+    ranges,
+    workers: int,
+    delta_sql: str = "",
+    params: Optional[dict] = None,
+    replica: bool = False,
+):
+    """Yield rows of ``ranges`` read concurrently, merged back in id order.
+
+    At most ``2 * workers`` ranges are in flight or buffered at once, so memory
+    stays bounded by the chunk size rather than the export size.
+    """
+    ranges = iter(ranges)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+        try:
+            for start, end in ranges:
+                pending.append(pool.submit(_export_range_rows, start, end, delta_sql, params, replica))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                rows = pending.popleft().result()
+                nxt = next(ranges, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_export_range_rows, *nxt, delta_sql, params, replica))
+                yield from rows
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def export_watermark() -> str:
+    """Return the database's current time as the next delta export's ``since``.
+
+    Take it *before* reading the export: anything changed while the export
+    runs is then included again by the next pull rather than skipped. On a
+    lagging replica the newest replicated change is used instead, so changes
+    not yet replicated are picked up by the next pull.
+    """
+    replica = _replica_available()
+    sql = "SELECT CURRENT_TIMESTAMP"
+    if replica and _has_column("events", "last_modified"):
+        sql = "SELECT COALESCE(MAX(last_modified), CURRENT_TIMESTAMP) FROM events"
+    session = get_read_session(replica)
+    try:
+        now = session.execute(text(sql)).scalar()
+    finally:
+        session.close()
+    if isinstance(now, datetime.datetime):
+        return now.isoformat(timespec="seconds")
+    return str(now)
+
+
+def iter_events_export_rows(
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    since=None,
+):
+    """Return an iterator of export rows in id order, read lazily in chunks.
+
+    Events are read in id ranges of ``chunk_size`` so only one chunk is held
+    at a time, whatever the driver; drivers with server-side cursors also
+    stream within a chunk (``stream_results``/``yield_per``). With
+    ``workers`` > 1 the ranges are read concurrently, each on its own session,
+    and the output is identical to the serial export. ``since`` (an ISO
+    timestamp, normally a previous :func:`export_watermark`) restricts the
+    export to events changed at or after that point.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    workers = max(1, min(workers or EXPORT_WORKERS, EXPORT_MAX_WORKERS))
+    params: dict = {}
+    # Resolved eagerly so a bad ``since`` raises before any output is streamed.
+    delta_sql = _export_delta_sql(_parse_since(since), params)
+    return _iter_export(chunk_size, workers, delta_sql, params)
+
+
+def _iter_export(chunk_size: int, workers: int, delta_sql: str, params: dict):
+    # Decided once: worker threads do not see the request's read actor.
+    replica = _replica_available()
+    session = get_read_session(replica)
+    try:
+        lo, hi = _export_id_bounds(session, delta_sql, params)
+        if workers == 1:
+            query = text(_export_range_sql(delta_sql))
+            for start, end in _export_ranges(lo, hi, chunk_size):
+                result = session.execute(
+                    query,
+                    {**params, "lo": start, "hi": end},
+                    execution_options={"stream_results": True, "yield_per": chunk_size},
+                )
+                for row in result.mappings():
+                    yield dict(row)
+            return
+    finally:
+        session.close()
+    yield from _iter_export_parallel(
+        _export_ranges(lo, hi, chunk_size), workers, delta_sql, params, replica
+    )
+
+
+def get_events_export_rows(since=None) -> list[dict]:
+    """Return rows suitable for CSV export, with criteria pivots and user names.
+
+    With ``since`` only events changed at or after that watermark are returned.
+    """
+    return list(iter_events_export_rows(since=since))
+
+
+def get_events_export_delta(since=None) -> dict:
+    """Return ``{"rows": [...], "watermark": ...}`` for chaining delta pulls."""
+    watermark = export_watermark()
+    return {"rows": get_events_export_rows(since), "watermark": watermark}
+
+
 def assign_events(event_ids: list[int], reviewer_id: int, slot: str, assigner_id: int) -> dict:
     """Assign a reviewer to many events for the given slot (first|second|third).
 
@@ -566,6 +2381,7 @@ def assign_events(event_ids: list[int], reviewer_id: int, slot: str, assigner_id
                 e.assign3rd_date = now
             updated += 1
         session.commit()
+        bump_table_version("events")
         return {"updated": updated}
     finally:
         session.close()
@@ -589,6 +2405,7 @@ def send_events(event_ids: list[int], sender_id: int) -> dict:
             e.send_date = now
             updated += 1
         session.commit()
+        bump_table_version("events")
         return {"updated": updated}
     finally:
         session.close()
@@ -599,7 +2416,7 @@ def get_event_details(event_id: int) -> dict:
     Includes core dates, status, creator/uploader/screener/assigner/sender usernames,
     and patient `site_patient_id` and `site`.
     """
-    session = get_session()
+    session = get_read_session()
     try:
         query = text(
             """
@@ -654,8 +2471,7 @@ def get_event_details(event_id: int) -> dict:
 def create_event(data: dict) -> dict:
     """Create a new event and associated criteria."""
     session = get_session()
-    ext_session = _get_external_session_or_none()
-    patients_session = ext_session or session
+    ext_session = None
     try:
         site_patient_id = (data.get("site_patient_id") or "").strip()
         site = (data.get("site") or "").strip()
@@ -663,22 +2479,69 @@ def create_event(data: dict) -> dict:
             raise ValidationError("site_patient_id is required")
         if not site:
             raise ValidationError("site is required")
-        patient = (
-            patients_session.query(models.Patients)
-            .filter_by(site_patient_id=site_patient_id, site=site)
-            .first()
-        )
-        if not patient:
-            if ext_session is None:
-                # Primary DB's patients table is not designed for writes; without
-                # the external DB, we cannot create a new patient safely.
-                raise ValidationError(
-                    "Patient not found and external patient DB is unavailable"
+        patient_id = _patient_cache.get(("id", site, site_patient_id))
+        if patient_id is _MISSING:
+            patient = None
+            if PATIENTS_SOURCE == "local":
+                patient = (
+                    session.query(models.Patients)
+                    .filter_by(site_patient_id=site_patient_id, site=site)
+                    .first()
                 )
-            patient = models.Patients(site_patient_id=site_patient_id, site=site)
-            patients_session.add(patient)
-            patients_session.commit()
-        patient_id = patient.id
+            if not patient:
+                ext_session = _get_external_session_or_none()
+                if ext_session is not None:
+                    try:
+                        with _external_guard():
+                            patient = (
+                                ext_session.query(models.Patients)
+                                .filter_by(site_patient_id=site_patient_id, site=site)
+                                .first()
+                            )
+                    except SQLAlchemyError as exc:
+                        logger.warning("External patient lookup failed; using the local copy: %s", exc)
+                        ext_session.close()
+                        ext_session = None
+                if ext_session is None and PATIENTS_SOURCE != "local":
+                    patient = (
+                        session.query(models.Patients)
+                        .filter_by(site_patient_id=site_patient_id, site=site)
+                        .first()
+                    )
+            if not patient:
+                if ext_session is None:
+                    # Primary DB's patients table is not designed for writes; without
+                    # the external DB, we cannot create a new patient safely.
+                    raise ValidationError(
+                        "Patient not found and external patient DB is unavailable"
+                    )
+                # Stamp the row explicitly: the legacy defaults are zero dates,
+                # which sync_patients' ``last_update >= :since`` would skip.
+                now = datetime.datetime.now().replace(microsecond=0)
+                patient = models.Patients(
+                    site_patient_id=site_patient_id,
+                    site=site,
+                    last_update=now,
+                    create_date=now,
+                )
+                with _external_guard():
+                    ext_session.add(patient)
+                    ext_session.commit()
+                if PATIENTS_SOURCE == "local":
+                    # Mirror it at once rather than waiting for the next sync.
+                    session.execute(
+                        text(_PATIENT_UPSERT_SQL),
+                        {
+                            "id": patient.id,
+                            "site_patient_id": site_patient_id,
+                            "site": site,
+                            "last_update": now,
+                            "create_date": now,
+                        },
+                    )
+                bump_table_version("patients")
+            patient_id = patient.id
+            _cache_patient(patient_id, site, site_patient_id)
 
         event_date_str = (data.get("event_date") or "").strip()
         if not event_date_str:
@@ -695,7 +2558,14 @@ def create_event(data: dict) -> dict:
             add_date=datetime.date.today(),
         )
         session.add(event)
+        if _has_column("events", "site"):
+            session.flush()
+            session.execute(
+                text("UPDATE events SET site = :site WHERE id = :id"),
+                {"site": site, "id": event.id},
+            )
         session.commit()
+        bump_table_version("events")
 
         if data.get("criterion_name") and data.get("criterion_value"):
             crit = models.Criterias(
@@ -705,6 +2575,9 @@ def create_event(data: dict) -> dict:
             )
             session.add(crit)
             session.commit()
+            bump_table_version("criterias")
+
+        _refresh_event_derived_data(session, [event.id])
 
         result = {
             "id": event.id,
@@ -734,6 +2607,8 @@ def create_user(data: dict) -> dict:
     )
     session.add(user)
     session.commit()
+    bump_table_version("users")
+    invalidate_auth_user(user.login)
     result = {
         "id": user.id,
         "username": user.username,
@@ -0,0 +1,28 @@
+import pytest
+
+import flask_backend.table_service as ts
+
+
+@pytest.fixture(autouse=True)
+def _clear_table_service_caches():
+    # Process-wide caches would otherwise leak results between mocked sessions.
+    ts.clear_caches()
+    ts.external_breaker.reset()
+    yield
+    ts.clear_caches()
+    ts.external_breaker.reset()
+
+
+@pytest.fixture(autouse=True)
+def _baseline_schema(monkeypatch):
+    # Mocked sessions cannot answer information_schema probes; tests see the
+    # baseline schema unless they patch ``_has_table``/``_has_column``/``_has_trigger``.
+    monkeypatch.setattr(ts, '_has_table', lambda name: False)
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: False)
+    monkeypatch.setattr(ts, '_has_trigger', lambda name: False)
+
+
+@pytest.fixture(autouse=True)
+def _no_site_prefetch(monkeypatch):
+    # Background prefetches could outlive a test's mocks; tests opt back in.
+    monkeypatch.setattr(ts, 'SITE_PREFETCH', False)
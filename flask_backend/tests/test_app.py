@@ -1,5 +1,6 @@
 from flask_backend.app import app
 from unittest.mock import patch
+import csv
 
 @patch('flask_backend.table_service.get_table_data')
 def test_get_table_route(mock_service):
@@ -138,6 +139,24 @@ def test_status_summary_route(mock_service):
     res = client.get('/api/events/status_summary')
     assert res.status_code == 200
     assert res.get_json() == {'data': {'uploaded': 5}}
+    mock_service.assert_called_with(by_site=False)
+
+    res = client.get('/api/events/status_summary?by_site=1')
+    assert res.status_code == 200
+    mock_service.assert_called_with(by_site=True)
+
+
+@patch('flask_backend.table_service.get_pipeline_summary_cached')
+def test_pipeline_summary_route(mock_service):
+    mock_service.return_value = {'UW': {'to_be_sent': 3}}
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/pipeline_summary?by_site=true')
+    assert res.status_code == 200
+    assert res.get_json() == {'data': {'UW': {'to_be_sent': 3}}}
+    mock_service.assert_called_with(by_site=True)
 
 
 @patch('flask_backend.table_service.get_event_status_summary')
@@ -205,3 +224,252 @@ def test_auth_required_add_user(mock_service):
     client = app_mod.app.test_client()
     res = client.post('/api/users', json={})
     assert res.status_code == 401
+
+
+@patch('flask_backend.table_service.get_events_by_status_with_total')
+def test_events_by_status_route_cursor(mock_service):
+    mock_service.return_value = ([{'ID': 5}, {'ID': 9}], 30)
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/by_status/sent?limit=2&after=abc')
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body['data'] == [{'ID': 5}, {'ID': 9}]
+    assert body['total'] == 30
+    assert body['next'] == app_mod.table_service.encode_cursor({'ID': 9})
+    mock_service.assert_called_with('sent', 2, 0, None, None, 'abc', None)
+
+    # A short page is the last one.
+    mock_service.return_value = ([{'ID': 11}], 30)
+    assert client.get('/api/events/by_status/sent?limit=2&after=abc').get_json()['next'] is None
+
+
+@patch('flask_backend.table_service.get_events_by_status_with_total')
+def test_events_by_status_route_accepts_several_statuses(mock_service):
+    mock_service.return_value = ([{'ID': 5}], 1)
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/by_status?status=sent,reviewer1_done,sent&limit=20')
+    assert res.status_code == 200
+    assert res.get_json()['total'] == 1
+    mock_service.assert_called_with(['sent', 'reviewer1_done'], 20, 0, None, None, None, None)
+
+    assert client.get('/api/events/by_status?status=sent,bogus').status_code == 400
+    assert client.get('/api/events/by_status').status_code == 400
+
+
+def test_health_cache_route():
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/health/cache')
+    assert res.status_code == 200
+    assert set(res.get_json()['data']['results']) >= {'hits', 'misses', 'hit_rate'}
+
+
+def _synthetic_export_rows(ids):
+    from flask_backend import arrow_export
+    names = arrow_export.export_column_names()
+    for i in ids:
+        yield {name: f'value-{i}-{j}' for j, name in enumerate(names)}
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+@patch('flask_backend.table_service.iter_events_export_rows')
+def test_export_csv_streams_rows(mock_iter, _mock_watermark):
+    mock_iter.return_value = iter([{'id': 1, 'site': 'UW'}, {'id': 2, 'site': None}])
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/export.csv')
+    assert res.status_code == 200
+    assert res.mimetype == 'text/csv'
+    lines = res.get_data(as_text=True).splitlines()
+    assert lines[0] == ','.join(app_mod.arrow_export.export_column_names())
+    assert [(r['id'], r['site']) for r in csv.DictReader(lines)] == [('1', 'UW'), ('2', '')]
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+@patch('flask_backend.table_service.iter_events_export_rows')
+def test_export_csv_delta_returns_watermark(mock_iter, _mock_watermark):
+    mock_iter.return_value = iter([{'id': 7}])
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/export.csv?since=2024-02-29T12:00:00')
+    assert res.status_code == 200
+    assert res.headers['X-Export-Watermark'] == '2024-03-01T12:00:00'
+    mock_iter.assert_called_with(None, None, since='2024-02-29T12:00:00')
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+@patch('flask_backend.table_service.iter_events_export_rows')
+def test_empty_delta_export_csv_has_header(mock_iter, _mock_watermark):
+    mock_iter.return_value = iter([])
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/export.csv?since=2024-03-01T12:00:00')
+    assert res.status_code == 200
+    lines = res.get_data(as_text=True).splitlines()
+    assert lines == [','.join(app_mod.arrow_export.export_column_names())]
+    assert lines[0].startswith('id,patient_id,site_patient_id,site,event_date,status')
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+def test_export_csv_rejects_bad_since(_mock_watermark):
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/export.csv?since=yesterday')
+    assert res.status_code == 400
+    assert 'since' in res.get_json()['error']
+class _ExportRangeResult:
+    def __init__(self, rows=(), bounds=None):
+        self._rows = rows
+        self._bounds = bounds
+
+    def one(self):
+        return self._bounds
+
+    def mappings(self):
+        return self._rows
+
+
+class _GeneratedExportSession:
+    """Serves ``count`` export rows, generating each id range on demand."""
+
+    def __init__(self, count):
+        self._count = count
+
+    def execute(self, stmt, params=None, **kwargs):
+        if 'MIN(id)' in str(stmt):
+            return _ExportRangeResult(bounds=(1, self._count))
+        ids = range(params['lo'], min(params['hi'], self._count + 1))
+        return _ExportRangeResult(_synthetic_export_rows(ids))
+
+    def close(self):
+        pass
+
+
+def _export_csv_peak(app_mod, row_count):
+    """Stream the CSV export of ``row_count`` rows; return (bytes, lines, peak)."""
+    import tracemalloc
+    client = app_mod.app.test_client()
+    with patch('flask_backend.table_service.models.get_session',
+               side_effect=lambda: _GeneratedExportSession(row_count)):
+        tracemalloc.start()
+        try:
+            res = client.get('/api/events/export.csv?chunk_size=250&workers=1', buffered=False)
+            total_bytes = lines = 0
+            for chunk in res.response:
+                total_bytes += len(chunk)
+                lines += chunk.count(b'\n') if isinstance(chunk, bytes) else chunk.count('\n')
+            res.close()
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return total_bytes, lines, peak
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+def test_export_csv_memory_stays_bounded(_mock_watermark):
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+
+    small_bytes, small_lines, small_peak = _export_csv_peak(app_mod, 1000)
+    large_bytes, large_lines, large_peak = _export_csv_peak(app_mod, 8000)
+
+    # Every row is read through the chunked id ranges and written out...
+    assert (small_lines, large_lines) == (1001, 8001)
+    assert large_bytes > 7 * small_bytes
+    # ...while peak memory stays near one chunk instead of growing with rows.
+    assert large_peak < 2 * 1024 * 1024
+    assert large_peak < 1.5 * small_peak
+
+
+class _FakeExportSession:
+    """Answers the export's bounds and id-range queries from an in-memory table."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, stmt, params=None, **kwargs):
+        from unittest.mock import MagicMock
+        result = MagicMock()
+        if 'MIN(id)' in str(stmt):
+            ids = [r['id'] for r in self._rows]
+            result.one.return_value = (min(ids), max(ids))
+        else:
+            result.mappings.return_value = [
+                r for r in self._rows if params['lo'] <= r['id'] < params['hi']
+            ]
+        return result
+
+    def close(self):
+        pass
+
+
+def test_parallel_export_csv_is_byte_identical_to_serial():
+    import importlib
+    import datetime
+    app_mod = importlib.import_module('flask_backend.app')
+    ts = app_mod.table_service
+    rows = [
+        {'id': i, 'site': 'UW' if i % 3 else None, 'event_date': datetime.date(2024, 1, 1 + i % 28),
+         'other': 'a,b;"c"'}
+        for i in range(1, 500) if i % 7
+    ]
+    with patch('flask_backend.table_service.models.get_session', side_effect=lambda: _FakeExportSession(rows)):
+        serial = ''.join(app_mod._csv_chunks(ts.iter_events_export_rows(chunk_size=16, workers=1)))
+        parallel = ''.join(app_mod._csv_chunks(ts.iter_events_export_rows(chunk_size=16, workers=4)))
+    assert serial.encode() == parallel.encode()
+    assert serial.count('\n') == len(rows) + 1
+
+
+def test_health_db_route(monkeypatch):
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    monkeypatch.setattr(app_mod.models, 'get_pool_stats', lambda: {'primary': {'checked_out': 2}})
+    res = app_mod.app.test_client().get('/api/health/db')
+    assert res.status_code == 200
+    assert res.get_json()['data'] == {'primary': {'checked_out': 2}}
+
+
+def test_health_cache_purge_route():
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.post('/api/health/cache/purge?name=patient_sites')
+    assert res.status_code == 200
+    assert res.get_json() == {'data': {'purged': ['patient_sites']}}
+    assert client.post('/api/health/cache/purge?name=bogus').status_code == 400
+
+
+def test_patients_sync_thread_starts_with_first_request(monkeypatch):
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    started = []
+    monkeypatch.setattr(app_mod, '_patients_sync_interval', 60)
+    monkeypatch.setattr(app_mod, '_patients_sync_thread', None)
+    monkeypatch.setattr(app_mod.table_service, 'start_patients_sync_thread',
+                        lambda interval: started.append(interval) or object())
+    with app_mod.app.app_context():
+        assert started == []
+    client = app_mod.app.test_client()
+    client.post('/api/health/cache/purge?name=patient_sites')
+    client.post('/api/health/cache/purge?name=patient_sites')
+    assert started == [60]
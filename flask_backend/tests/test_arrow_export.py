@@ -0,0 +1,99 @@
+import csv
+import datetime
+import io
+from unittest.mock import patch
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+
+from flask_backend import arrow_export
+
+
+def _export_rows(count):
+    statuses = ['created', 'uploaded', 'scrubbed', 'sent', 'done']
+    for i in range(count):
+        yield {
+            'id': i + 1,
+            'patient_id': 5000 + i % 700,
+            'site_patient_id': f'P{i % 700:06d}',
+            'site': ['UW', 'UAB', 'JH', 'CWRU'][i % 4],
+            'event_date': datetime.date(2020, 1, 1) + datetime.timedelta(days=i % 900),
+            'status': '' if i % 97 == 96 else statuses[i % 5],
+            'creator': 'uw_coordinator',
+            'add_date': datetime.date(2021, 6, 1) + datetime.timedelta(days=i % 300),
+            'two_attempts_flag': i % 2 if i % 3 else None,
+            'review1_mci': 'Definite' if i % 4 else 'No',
+            'review1_chest_pain': 1 if i % 5 else 0,
+            'review1_date': None,
+            'other': 'Troponin I:0.04;CK:210',
+        }
+
+
+def test_schema_maps_model_types():
+    schema = arrow_export.export_schema()
+    assert schema.field('status').type == pa.dictionary(pa.int8(), pa.string())
+    assert schema.field('review2_chest_pain').type == pa.bool_()
+    assert schema.field('event_date').type == pa.date32()
+    assert schema.field('id').type == pa.int32()
+    assert schema.field('mi_dx').type == pa.string()
+    assert schema.names[:3] == ['id', 'patient_id', 'site_patient_id']
+    assert schema.names[-1] == 'overall_ci'
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_columnar_export_round_trips_in_batches(fmt):
+    rows = list(_export_rows(25))
+    chunks = list(arrow_export.iter_export_chunks(iter(rows), fmt, batch_size=10))
+    data = b''.join(chunks)
+    if fmt == 'parquet':
+        table = pq.read_table(io.BytesIO(data))
+        assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    assert len(chunks) > 2
+    assert table.num_rows == 25
+    assert table.column('id').to_pylist() == list(range(1, 26))
+    assert table.column('status').to_pylist()[:2] == ['created', 'uploaded']
+    assert table.column('review1_chest_pain').to_pylist()[:2] == [False, True]
+    assert table.column('two_attempts_flag').to_pylist()[:3] == [None, True, False]
+    assert table.column('event_date').to_pylist()[1] == datetime.date(2020, 1, 2)
+    assert table.column('reviewer1').null_count == 25
+
+
+def test_invalid_enum_values_export_as_null():
+    rows = list(_export_rows(98))
+    table = pq.read_table(io.BytesIO(b''.join(arrow_export.iter_export_chunks(iter(rows)))))
+    # MySQL's '' for an invalid enum value is exported as null.
+    assert table.column('status').to_pylist()[95:] == ['created', None, 'scrubbed']
+
+
+def test_parquet_is_much_smaller_than_csv():
+    rows = list(_export_rows(5000))
+    schema = arrow_export.export_schema()
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=schema.names)
+    writer.writeheader()
+    writer.writerows(rows)
+    parquet = b''.join(arrow_export.iter_export_chunks(iter(rows), 'parquet'))
+    assert len(parquet) * 3 < len(buf.getvalue().encode())
+
+
+@patch('flask_backend.table_service.export_watermark', return_value='2024-03-01T12:00:00')
+@patch('flask_backend.table_service.iter_events_export_rows')
+def test_export_parquet_route(mock_iter, _mock_watermark):
+    mock_iter.return_value = _export_rows(3)
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    client = app_mod.app.test_client()
+    res = client.get('/api/events/export.parquet')
+    assert res.status_code == 200
+    assert res.mimetype == 'application/vnd.apache.parquet'
+    assert pq.read_table(io.BytesIO(res.data)).num_rows == 3
+
+    mock_iter.return_value = _export_rows(2)
+    res = client.get('/api/events/export?format=arrow')
+    assert res.mimetype == 'application/vnd.apache.arrow.stream'
+    assert pa.ipc.open_stream(res.data).read_all().num_rows == 2
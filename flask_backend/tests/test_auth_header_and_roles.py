@@ -216,3 +216,46 @@ def test_no_roles_user_blocked_from_any_role_endpoint(mock_get_session, mock_svc
     assert res.status_code == 403
 
 
+
+
+@patch("flask_backend.models.get_session")
+def test_request_shares_one_session_between_auth_and_service(mock_get_session):
+    from unittest.mock import MagicMock
+
+    session = MagicMock()
+    session.query.return_value.filter_by.return_value.first.return_value = FakeUser(admin=True)
+    session.execute.return_value.all.return_value = [("sent", 3)]
+    mock_get_session.return_value = session
+
+    import importlib
+    app_mod = importlib.import_module("flask_backend.app")
+    client = app_mod.app.test_client()
+
+    res = client.get("/api/events/status_summary", headers={"X-Remote-User": "alice"})
+    assert res.status_code == 200
+    assert res.get_json() == {"data": {"sent": 3}}
+    # One session for the user lookup and the summary, closed at teardown.
+    assert mock_get_session.call_count == 1
+    session.close.assert_called_once()
+
+
+@patch("flask_backend.table_service.get_event_status_summary", return_value={})
+@patch("flask_backend.models.get_session")
+def test_header_auth_roles_are_cached_but_unknown_users_are_not(mock_get_session, _mock_summary):
+    import importlib
+    app_mod = importlib.import_module("flask_backend.app")
+    client = app_mod.app.test_client()
+
+    mock_get_session.return_value = _session_for(None)
+    assert client.get("/api/events/status_summary", headers={"X-Remote-User": "alice"}).status_code == 403
+
+    mock_get_session.return_value = _session_for(FakeUser(admin=True))
+    for _ in range(3):
+        res = client.get("/api/events/status_summary", headers={"X-Remote-User": "alice"})
+        assert res.status_code == 200
+    # The 403 lookup and the first success hit the database; the rest are cached.
+    assert mock_get_session.call_count == 2
+
+    app_mod.table_service.invalidate_auth_user("alice")
+    mock_get_session.return_value = _session_for(None)
+    assert client.get("/api/events/status_summary", headers={"X-Remote-User": "alice"}).status_code == 403
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+from flask_backend import circuit_breaker
+from flask_backend.circuit_breaker import CircuitBreaker
+import flask_backend.table_service as ts
+
+
+def test_breaker_opens_half_opens_and_closes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker('db', failure_threshold=2, cooldown=10)
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] += 10
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.snapshot()['state'] == 'closed'
+    assert breaker.snapshot()['rejected'] == 2
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_unreachable_external_db_falls_back_without_retrying(mock_get_session, mock_get_external_session):
+    local = MagicMock()
+    local.execute.return_value.mappings.return_value.all.return_value = [{'id': 10, 'site': 'UW'}]
+    mock_get_session.return_value = local
+    ext = MagicMock()
+    ext.connection.side_effect = ConnectionError('timed out')
+    mock_get_external_session.return_value = ext
+
+    for _ in range(ts.external_breaker.failure_threshold + 2):
+        ts.purge_cache('patient_sites')
+        assert ts.get_patient_sites([10]) == {10: 'UW'}
+
+    assert ext.connection.call_count == ts.external_breaker.failure_threshold
+    assert ts.external_breaker.state == 'open'
+
+
+def test_health_external_route():
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    app_mod.keycloak_openid = None
+    res = app_mod.app.test_client().get('/api/health/external')
+    assert res.status_code == 200
+    assert res.get_json()['data']['state'] == 'closed'
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_failing_external_queries_open_the_breaker(mock_get_session, mock_get_external_session):
+    from sqlalchemy.exc import OperationalError
+
+    local = MagicMock()
+    local.execute.return_value.mappings.return_value.all.return_value = [{'id': 10, 'site': 'UW'}]
+    mock_get_session.return_value = local
+    ext = MagicMock()
+    ext.execute.side_effect = OperationalError('SELECT', {}, Exception('lost connection'))
+    mock_get_external_session.return_value = ext
+
+    for _ in range(ts.external_breaker.failure_threshold + 2):
+        ts.purge_cache('patient_sites')
+        assert ts.get_patient_sites([10]) == {10: 'UW'}
+
+    # Connects succeed, but query failures still count and open the circuit.
+    assert ext.execute.call_count == ts.external_breaker.failure_threshold
+    assert ts.external_breaker.state == 'open'
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_create_event_external_lookup_failure_counts(mock_get_session, mock_get_external_session):
+    from types import SimpleNamespace
+    from sqlalchemy.exc import OperationalError
+
+    local = MagicMock()
+    local.query.return_value.filter_by.return_value.first.return_value = SimpleNamespace(id=10, site='UW')
+    mock_get_session.return_value = local
+    ext = MagicMock()
+    ext.query.side_effect = OperationalError('SELECT', {}, Exception('lost connection'))
+    mock_get_external_session.return_value = ext
+
+    data = {'site_patient_id': 'P1', 'site': 'UW', 'event_date': '2024-01-15'}
+    assert ts.create_event(data)['patient_id'] == 10
+    assert ts.external_breaker.snapshot()['consecutive_failures'] == 1
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import bindparam, text
+
+import flask_backend.table_service as ts
+from flask_backend import explain_check
+
+
+def _session_with_plan(plan_rows):
+    def execute(stmt, params=None, **kwargs):
+        result = MagicMock()
+        if str(stmt).startswith('EXPLAIN'):
+            result.mappings.return_value.all.return_value = plan_rows
+        else:
+            result.mappings.return_value.all.return_value = []
+            result.scalar.return_value = 0
+        return result
+
+    session = MagicMock()
+    session.execute.side_effect = execute
+    return session
+
+
+def test_explain_statement_only_wraps_reads():
+    stmt = text('SELECT id FROM events WHERE id IN :ids').bindparams(bindparam('ids', expanding=True))
+    explain = explain_check._explain_statement(stmt)
+    assert str(explain).startswith('EXPLAIN SELECT id FROM events')
+    assert explain._bindparams['ids'].expanding
+    assert explain_check._explain_statement(text('DELETE FROM events')) is None
+    assert explain_check._explain_statement(text('SELECT VERSION()')) is None
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_full_scans_are_violations_unless_allowed(mock_get_session):
+    mock_get_session.return_value = _session_with_plan([
+        {'table': 'e', 'type': 'ALL', 'key': None, 'rows': 90000},
+        {'table': 'p', 'type': 'eq_ref', 'key': 'PRIMARY', 'rows': 1},
+        {'table': '<derived2>', 'type': 'ALL', 'key': None, 'rows': 10},
+    ])
+    probes = [
+        ('to_be_sent', lambda: ts.get_to_be_sent_with_total(20, 0, None, None), set()),
+        ('pipeline', lambda: ts.get_pipeline_summary(), {'e'}),
+    ]
+    with patch.object(explain_check, '_probes', return_value=probes):
+        results = explain_check.run_explain_checks()
+
+    violations = [(r['probe'], r['table']) for r in results if r['violation']]
+    # Page and count query of the worklist each scan events; the pipeline
+    # summary is allowed to.
+    assert violations == [('to_be_sent', 'e'), ('to_be_sent', 'e')]
+    assert {r['probe'] for r in results} == {'to_be_sent', 'pipeline'}
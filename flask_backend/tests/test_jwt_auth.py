@@ -0,0 +1,100 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from jwcrypto import jwk, jwt
+
+from flask_backend import jwt_auth
+
+ISSUER = 'https://keycloak.example.org/realms/cnics'
+
+
+def _key(kid):
+    return jwk.JWK.generate(kty='RSA', size=2048, kid=kid)
+
+
+def _jwks(*keys):
+    return {'keys': [json.loads(k.export_public()) for k in keys]}
+
+
+def _token(key, **claims):
+    payload = {'iss': ISSUER, 'azp': 'cnics-frontend', 'exp': time.time() + 300, 'sub': 'u1'}
+    payload.update(claims)
+    token = jwt.JWT(header={'alg': 'RS256', 'kid': key.get('kid')}, claims=payload)
+    token.make_signed_token(key)
+    return token.serialize()
+
+
+def _verifier(fetch, **kwargs):
+    return jwt_auth.TokenVerifier(
+        jwt_auth.JWKSCache(fetch, min_refresh_interval=0),
+        issuer=ISSUER,
+        audience='cnics-frontend',
+        **kwargs,
+    )
+
+
+def test_verifies_signature_and_claims_locally():
+    key = _key('k1')
+    verifier = _verifier(lambda: _jwks(key))
+    assert verifier.verify(_token(key))['sub'] == 'u1'
+    assert verifier.verify(_token(key, azp='other', aud=['account', 'cnics-frontend']))['sub'] == 'u1'
+
+    for bad in (
+        _token(key, exp=time.time() - 120),
+        _token(key, iss='https://evil.example.org/realms/cnics'),
+        _token(key, azp='other', aud='account'),
+        _token(_key('k1')),  # same kid, different key
+        'not-a-token',
+    ):
+        with pytest.raises(jwt_auth.TokenInvalid):
+            verifier.verify(bad)
+
+
+def test_unknown_kid_refetches_keys_once():
+    old, new = _key('old'), _key('new')
+    keysets = [_jwks(old), _jwks(old, new)]
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return keysets[min(len(calls), 2) - 1]
+
+    verifier = _verifier(fetch)
+    verifier.verify(_token(old))
+    verifier.verify(_token(old))
+    assert len(calls) == 1
+    verifier.verify(_token(new))
+    assert len(calls) == 2
+
+
+def test_introspection_only_when_keys_unavailable():
+    key = _key('k1')
+
+    def unavailable():
+        raise ConnectionError('keycloak down')
+
+    introspect = lambda token: {'active': True, 'sub': 'u2'}
+    assert _verifier(unavailable, introspect=introspect).verify(_token(key))['sub'] == 'u2'
+    with pytest.raises(jwt_auth.KeysUnavailable):
+        _verifier(unavailable).verify(_token(key))
+    with pytest.raises(jwt_auth.TokenInvalid):
+        _verifier(unavailable, introspect=lambda token: {'active': False}).verify(_token(key))
+
+
+@patch('flask_backend.table_service.get_events_with_patient_site', return_value=[])
+def test_bearer_tokens_verified_without_userinfo(_mock_service, monkeypatch):
+    import importlib
+    app_mod = importlib.import_module('flask_backend.app')
+    key = _key('k1')
+    monkeypatch.setattr(app_mod, 'keycloak_openid', object())
+    monkeypatch.setattr(app_mod, 'token_verifier', _verifier(lambda: _jwks(key)))
+    client = app_mod.app.test_client()
+
+    res = client.get('/api/events', headers={'Authorization': f'Bearer {_token(key)}'})
+    assert res.status_code == 200
+    expired = _token(key, exp=time.time() - 120)
+    res = client.get('/api/events', headers={'Authorization': f'Bearer {expired}'})
+    assert res.status_code == 401
+    assert client.get('/api/events').status_code == 401
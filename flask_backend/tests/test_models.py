@@ -0,0 +1,44 @@
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+import pytest
+
+from flask_backend import models
+
+
+def test_pool_options_read_env_with_db_fallback(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '12')
+    monkeypatch.setenv('DB_POOL_PRE_PING', '0')
+    monkeypatch.setenv('EXTERNAL_DB_POOL_SIZE', '3')
+    monkeypatch.setenv('EXTERNAL_DB_POOL_RECYCLE', '600')
+
+    primary = models.pool_options('DB_')
+    assert primary['pool_size'] == 12 and primary['pool_pre_ping'] is False
+    assert primary['max_overflow'] == 10 and primary['pool_timeout'] == 30
+
+    external = models.pool_options('EXTERNAL_DB_')
+    assert external['pool_size'] == 3 and external['pool_recycle'] == 600
+    assert external['pool_pre_ping'] is False
+
+
+def test_pool_stats_track_checkouts_and_timeouts(monkeypatch, tmp_path):
+    monkeypatch.setenv('TEST_POOL_SIZE', '1')
+    monkeypatch.setenv('TEST_MAX_OVERFLOW', '0')
+    monkeypatch.setenv('TEST_POOL_TIMEOUT', '0.05')
+    monkeypatch.setattr(models, '_pool_stats', {})
+    engine = models._create_engine(f"sqlite:///{tmp_path / 'pool.db'}", 'test', 'TEST_')
+
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+        stats = models.get_pool_stats()['test']
+        assert stats['checked_out'] == 1
+        with pytest.raises(PoolTimeout):
+            engine.connect()
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    stats = models.get_pool_stats()['test']
+    assert stats['checked_out'] == 0
+    assert stats['checkouts'] == 2 and stats['connects'] == 2
+    assert stats['checkout_timeouts'] == 1
+    assert stats['wait_ms_max'] >= 50
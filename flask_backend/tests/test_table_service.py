@@ -1,4 +1,10 @@
 from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+import datetime
+import json
+import pytest
+import threading
+import time
 import flask_backend.table_service as ts
 
 
@@ -117,6 +123,51 @@ def test_get_event_status_summary(mock_get_session):
     assert summary == {'created': 3}
 
 
+@patch('flask_backend.table_service.models.get_session')
+def test_event_status_summary_reads_counts_table(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_table', lambda name: name == 'event_status_counts')
+    mock_session = MagicMock()
+    mock_session.execute.return_value.all.return_value = [('sent', 'UW', 2), ('sent', '', 1), ('done', 'UAB', 4)]
+    mock_get_session.return_value = mock_session
+
+    summary = ts.get_event_status_summary(by_site=True)
+
+    assert summary == {'sent': {'UW': 2, '': 1}, 'done': {'UAB': 4}}
+    query = str(mock_session.execute.call_args.args[0])
+    assert 'FROM event_status_counts' in query
+    assert 'FROM events' not in query
+    mock_session.close.assert_called()
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_check_status_counts_reports_drift(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.all.side_effect = [
+        [('sent', 'UW', 2), ('done', 'UW', 5)],
+        [('sent', 'UW', 2), ('done', 'UW', 4), ('created', '', 1)],
+    ]
+    mock_get_session.return_value = mock_session
+
+    assert ts.check_status_counts() == [
+        {'status': 'created', 'site': '', 'stored': 1, 'actual': 0},
+        {'status': 'done', 'site': 'UW', 'stored': 4, 'actual': 5},
+    ]
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_status_counts_use_event_site(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: (table, column) == ('events', 'site'))
+    mock_session = MagicMock()
+    mock_session.execute.return_value.all.return_value = []
+    mock_get_session.return_value = mock_session
+
+    ts.check_status_counts()
+
+    recount = str(mock_session.execute.call_args_list[0].args[0])
+    assert "COALESCE(e.site, '')" in recount
+    assert 'patients' not in recount
+
+
 @patch('flask_backend.table_service.models.get_external_session')
 @patch('flask_backend.table_service.models.get_session')
 def test_get_events_with_patient_site(mock_get_session, mock_get_external_session):
@@ -187,3 +238,875 @@ def test_create_user(mock_get_session, mock_users):
         admin_flag=1,
     )
     assert result['id'] == 1
+
+
+def test_cursor_round_trip():
+    row = {'ID': 42, 'Uploaded': datetime.date(2024, 1, 15)}
+    cursor = ts.encode_cursor(row, ts.UPLOADED_KEYSET)
+    assert ts._decode_cursor(cursor, ts.UPLOADED_KEYSET) == ['2024-01-15', 42]
+    assert ts.next_cursor([]) is None
+    assert ts.next_cursor([row], ts.UPLOADED_KEYSET, limit=2) is None
+    assert ts.next_cursor([row], ts.UPLOADED_KEYSET, limit=1) == cursor
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ts.ValidationError):
+        ts._decode_cursor('not-a-cursor', ts.ID_KEYSET)
+    with pytest.raises(ts.ValidationError):
+        ts._decode_cursor(ts.encode_cursor({'ID': 1}), ts.UPLOADED_KEYSET)
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_to_be_scrubbed_seeks_after_cursor(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    cursor = ts.encode_cursor({'ID': 7, 'Uploaded': '2024-02-01'}, ts.UPLOADED_KEYSET)
+    ts.get_to_be_scrubbed_with_total(20, 400, None, None, after=cursor)
+
+    page_call = mock_session.execute.call_args_list[0]
+    query = str(page_call.args[0])
+    params = page_call.args[1]
+    assert '((e.upload_date < :after_0) OR (e.upload_date = :after_0 AND e.id > :after_1))' in query
+    assert 'ORDER BY e.upload_date DESC, e.id ASC' in query
+    assert 'OFFSET' not in query.upper()
+    assert params['after_0'] == '2024-02-01' and params['after_1'] == 7
+    assert params['limit'] == 20 and 'offset' not in params
+    count_query = str(mock_session.execute.call_args_list[-1].args[0])
+    assert ':after_0' not in count_query
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_events_by_status_offset_paging_unchanged(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    ts.get_events_by_status_with_total('sent', 20, 40)
+
+    query = str(mock_session.execute.call_args_list[0].args[0])
+    assert 'ORDER BY e.id ASC LIMIT :limit OFFSET :offset' in query
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'window')
+@patch('flask_backend.table_service.models.get_session')
+def test_phase_rows_single_round_trip_with_window_total(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {'ID': 1, '_total': 57},
+        {'ID': 2, '_total': 57},
+    ]
+    mock_get_session.return_value = mock_session
+
+    rows, total = ts.get_to_be_reviewed_with_total(2, 0, 'UW', None)
+
+    assert mock_session.execute.call_count == 1
+    assert 'COUNT(*) OVER()' in str(mock_session.execute.call_args.args[0])
+    assert rows == [{'ID': 1}, {'ID': 2}]
+    assert total == 57
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'window')
+@patch('flask_backend.table_service.models.get_session')
+def test_window_total_counts_separately_past_last_page(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 12
+    mock_get_session.return_value = mock_session
+
+    rows, total = ts.get_events_by_status_with_total('sent', 20, 40)
+
+    assert mock_session.execute.call_count == 2
+    assert rows == [] and total == 12
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_phase_worklists_use_generated_phase_column(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: (table, column) == ('events', 'phase'))
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    cursor = ts.encode_cursor({'ID': 7, 'Uploaded': '2024-02-01'}, ts.UPLOADED_KEYSET)
+    ts.get_to_be_scrubbed_with_total(20, 0, None, None, after=cursor)
+    page_call, count_call = mock_session.execute.call_args_list
+    query = str(page_call.args[0])
+    assert 'e.phase = :phase' in query and 'upload_date IS NOT NULL' not in query
+    assert '((e.phase_date < :after_0) OR (e.phase_date = :after_0 AND e.id > :after_1))' in query
+    assert 'ORDER BY e.phase_date DESC, e.id ASC' in query
+    assert page_call.args[1]['phase'] == 'to_be_scrubbed'
+    assert 'WHERE e.phase = :phase' in str(count_call.args[0])
+
+    ts.get_to_be_sent_with_total(20, 0, None, None)
+    query = str(mock_session.execute.call_args_list[2].args[0])
+    assert 'e.phase = :phase AND e.phase_date IS NULL' in query
+    assert 'ORDER BY e.id ASC' in query
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_events_by_several_statuses_use_one_query(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [{'ID': 1}, {'ID': 4}]
+    mock_session.execute.return_value.scalar.return_value = 9
+    mock_get_session.return_value = mock_session
+
+    rows, total = ts.get_events_by_status_with_total(['sent', 'reviewer1_done'], 20, 0)
+
+    page_call, count_call = mock_session.execute.call_args_list
+    assert 'e.status IN (:status_0, :status_1)' in str(page_call.args[0])
+    assert 'e.status IN (:status_0, :status_1)' in str(count_call.args[0])
+    assert page_call.args[1]['status_1'] == 'reviewer1_done'
+    assert rows == [{'ID': 1}, {'ID': 4}] and total == 9
+
+
+@patch('flask_backend.table_service._window_totals_supported', None)
+@patch('flask_backend.table_service.TOTALS_MODE', 'auto')
+@patch('flask_backend.table_service.models.get_session')
+def test_auto_totals_falls_back_on_old_server(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.scalar.side_effect = ['10.1.48-MariaDB', 3]
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [{'ID': 1}]
+    mock_get_session.return_value = mock_session
+
+    rows, total = ts.get_events_by_status_with_total('sent', 20, 0)
+
+    queries = [str(c.args[0]) for c in mock_session.execute.call_args_list]
+    assert queries[0] == 'SELECT VERSION()'
+    assert 'OVER()' not in queries[1]
+    assert 'COUNT(DISTINCT e.id)' in queries[2]
+    assert total == 3
+
+
+def test_window_function_version_detection():
+    assert ts._version_supports_window_functions('10.11.6-MariaDB-1:10.11.6+maria~ubu2204')
+    assert ts._version_supports_window_functions('8.0.36')
+    assert not ts._version_supports_window_functions('10.1.48-MariaDB')
+    assert not ts._version_supports_window_functions('5.7.44-log')
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_totals_cache_hits_until_write_bumps_version(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [{'ID': 1}]
+    mock_session.execute.return_value.scalar.return_value = 40
+    mock_get_session.return_value = mock_session
+
+    assert ts.get_to_be_reviewed_with_total(20, 0, None, None) == ([{'ID': 1}], 40)
+    assert mock_session.execute.call_count == 2
+
+    # Same first page again: served entirely from cache
+    assert ts.get_to_be_reviewed_with_total(20, 0, None, None) == ([{'ID': 1}], 40)
+    assert mock_session.execute.call_count == 2
+
+    # Next page reuses the cached total and only runs the page query
+    ts.get_to_be_reviewed_with_total(20, 20, None, None)
+    assert mock_session.execute.call_count == 3
+
+    ts.send_events([1], sender_id=2)
+    mock_session.execute.reset_mock()
+    ts.get_to_be_reviewed_with_total(20, 0, None, None)
+    assert mock_session.execute.call_count == 2
+
+    stats = ts.get_cache_stats()['results']
+    assert stats['hits'] >= 2 and stats['misses'] >= 2
+
+
+def test_search_grams_normalize_values():
+    assert ts._search_grams('UW-Ab') == {'uw-', 'w-a', '-ab'}
+    assert ts._search_grams(datetime.date(2024, 1, 5)) >= {'202', '-05'}
+    assert ts._search_grams('Café') == {'caf', 'afe'}
+    assert ts._query_grams('ab') == []
+    assert ts._query_grams('a%bc') == []
+
+
+def test_search_filter_uses_index_when_present():
+    params = {}
+    with patch('flask_backend.table_service._has_table', return_value=True):
+        sql = ts._search_filter('Trop', ts._PHASE_LIKE_SQL, params)
+    assert 'event_search' in sql and ts._PHASE_LIKE_SQL in sql
+    assert params['like'] == '%Trop%'
+    assert sorted(params[f'gram_{i}'] for i in range(params['gram_count'])) == ['rop', 'tro']
+
+
+def test_search_filter_falls_back_to_like_scan():
+    params = {}
+    with patch('flask_backend.table_service._has_table', return_value=False):
+        sql = ts._search_filter('Trop', ts._PHASE_LIKE_SQL, params)
+    assert sql == ts._PHASE_LIKE_SQL
+    assert params == {'like': '%Trop%'}
+
+
+def test_search_filter_checks_pending_events_with_like():
+    params = {}
+    with patch('flask_backend.table_service._has_table', side_effect=lambda name: name == 'event_search'):
+        assert 'event_search_pending' not in ts._search_filter('Trop', ts._PHASE_LIKE_SQL, params)
+    with patch('flask_backend.table_service._has_table', return_value=True):
+        sql = ts._search_filter('Trop', ts._PHASE_LIKE_SQL, params)
+    assert 'OR e.id IN (SELECT esp.event_id FROM event_search_pending esp))' in sql
+    assert sql.endswith(f'AND {ts._PHASE_LIKE_SQL})')
+
+
+@patch('flask_backend.table_service.index_events_for_search')
+@patch('flask_backend.table_service.models.get_session')
+def test_reindex_pending_search_drains_queue(mock_get_session, mock_index):
+    session = MagicMock()
+    session.execute.return_value.scalar.return_value = 7
+    session.execute.return_value.scalars.return_value.all.return_value = [3, 4, 9]
+    mock_get_session.return_value = session
+
+    assert ts.reindex_pending_search(batch_size=2) == 3
+
+    assert [c.args[1] for c in mock_index.call_args_list] == [[3, 4], [9]]
+    delete = session.execute.call_args_list[-1]
+    assert str(delete.args[0]).startswith('DELETE FROM event_search_pending WHERE id <= :upto')
+    assert delete.args[1] == {'upto': 7}
+
+
+def test_index_events_for_search_replaces_rows():
+    session = MagicMock()
+    session.execute.return_value.mappings.return_value.all.side_effect = [
+        [{'id': 3, 'patient_id': 10, 'event_date': datetime.date(2024, 1, 5), 'add_date': None,
+          'upload_date': None, 'scrub_date': None, 'site': 'UW', 'site_patient_id': 'P123'}],
+        [{'event_id': 3, 'name': 'Troponin', 'value': '0.5'}],
+    ]
+
+    written = ts.index_events_for_search(session, [3])
+
+    statements = [str(c.args[0]) for c in session.execute.call_args_list]
+    assert statements[2].startswith('DELETE FROM event_search')
+    inserted = session.execute.call_args_list[3].args[1]
+    grams = {row['gram'] for row in inserted}
+    assert {'p12', '123', 'tro', '0.5', '202'} <= grams
+    assert 'uw' not in grams
+    assert written == len(inserted)
+
+
+def test_plan_search_numeric_input():
+    params = {}
+    sql = ts._plan_search(' 1234 ', ts._PHASE_LIKE_SQL, params)
+    assert sql == ('(e.id = :q_int OR e.patient_id = :q_int OR e.patient_id IN '
+                   '(SELECT id FROM patients WHERE site_patient_id LIKE :q_prefix))')
+    assert params == {'q_int': 1234, 'q_prefix': '1234%'}
+
+
+def test_plan_search_dates():
+    params = {}
+    assert ts._plan_search('2024-01-15', ts._PHASE_LIKE_SQL, params) == 'e.event_date = :q_date'
+    assert params == {'q_date': datetime.date(2024, 1, 15)}
+    params = {}
+    sql = ts._plan_search('2024-12', ts._PHASE_LIKE_SQL, params)
+    assert 'e.event_date >= :q_from AND e.event_date < :q_to' in sql
+    assert params == {'q_from': datetime.date(2024, 12, 1), 'q_to': datetime.date(2025, 1, 1)}
+
+
+def test_plan_search_text_is_escaped_prefix():
+    params = {}
+    assert ts._plan_search('UW_10%', ts._PHASE_LIKE_SQL, params) == 'p.site_patient_id LIKE :q_prefix'
+    assert params == {'q_prefix': 'UW\\_10\\%%'}
+
+
+def test_plan_search_contains_opt_in():
+    params = {}
+    with patch('flask_backend.table_service._has_table', return_value=False):
+        sql = ts._plan_search('2024', ts._PHASE_LIKE_SQL, params, 'contains')
+    assert sql == ts._PHASE_LIKE_SQL
+    assert params == {'like': '%2024%'}
+    with pytest.raises(ts.ValidationError):
+        ts._plan_search('x', ts._PHASE_LIKE_SQL, {}, 'fuzzy')
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_worklist_reads_criteria_summary_when_present(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_table', lambda name: name == 'event_criteria_summary')
+    monkeypatch.setattr(ts, '_has_trigger', lambda name: name == 'criterias_summary_insert')
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    ts.get_to_be_sent_with_total(20, 0, None, None)
+
+    query = str(mock_session.execute.call_args_list[0].args[0])
+    assert 'ecs.criteria AS `Criteria`' in query
+    assert 'GROUP BY' not in query
+    assert 'LEFT JOIN criterias' not in query
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_worklist_joins_criterias_without_summary_triggers(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_table', lambda name: name == 'event_criteria_summary')
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    ts.get_to_be_sent_with_total(20, 0, None, None)
+
+    query = str(mock_session.execute.call_args_list[0].args[0])
+    assert 'event_criteria_summary' not in query
+    assert 'LEFT JOIN criterias' in query
+
+
+def test_refresh_criteria_summary_rewrites_rows():
+    session = MagicMock()
+    ts.refresh_criteria_summary(session, [4, 5])
+    statements = [str(c.args[0]) for c in session.execute.call_args_list]
+    assert statements[0].startswith('DELETE FROM event_criteria_summary WHERE event_id IN')
+    assert statements[1].startswith('INSERT INTO event_criteria_summary (event_id, criteria) SELECT event_id, GROUP_CONCAT(')
+    assert session.execute.call_args_list[1].args[1] == {'ids': [4, 5]}
+    session.commit.assert_not_called()
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_check_criteria_summary_reports_drift(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.scalars.return_value.all.side_effect = [[7], [99]]
+    mock_get_session.return_value = mock_session
+
+    assert ts.check_criteria_summary() == {'mismatched': [7], 'orphaned': [99]}
+    assert '<=>' in str(mock_session.execute.call_args_list[0].args[0])
+
+
+@patch('flask_backend.table_service.repair_criteria_summary')
+@patch('flask_backend.table_service.check_criteria_summary')
+def test_repair_all_criteria_summaries_loops_until_clean(mock_check, mock_repair):
+    mock_check.side_effect = [
+        {'mismatched': [1, 2], 'orphaned': []},
+        {'mismatched': [3], 'orphaned': [99]},
+        {'mismatched': [], 'orphaned': []},
+    ]
+    assert ts.repair_all_criteria_summaries(limit=2) == 4
+    assert [c.args[0] for c in mock_repair.call_args_list] == [[1, 2], [3, 99]]
+
+
+@patch('flask_backend.table_service.repair_criteria_summary')
+@patch('flask_backend.table_service.check_criteria_summary')
+def test_repair_all_criteria_summaries_stops_when_stuck(mock_check, mock_repair):
+    mock_check.return_value = {'mismatched': [5], 'orphaned': []}
+    with pytest.raises(RuntimeError):
+        ts.repair_all_criteria_summaries()
+    assert mock_repair.call_count == 1
+
+
+def test_export_ranges_cover_ids():
+    assert list(ts._export_ranges(1, 10, 4)) == [(1, 5), (5, 9), (9, 11)]
+    assert list(ts._export_ranges(None, None, 4)) == []
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_iter_events_export_rows_reads_by_id_range(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.one.return_value = (1, 5)
+    mock_session.execute.return_value.mappings.side_effect = [
+        [{'id': 1}, {'id': 2}], [{'id': 3}], [{'id': 5}],
+    ]
+    mock_get_session.return_value = mock_session
+
+    rows = list(ts.iter_events_export_rows(chunk_size=2))
+
+    assert [r['id'] for r in rows] == [1, 2, 3, 5]
+    range_calls = mock_session.execute.call_args_list[1:]
+    assert [c.args[1] for c in range_calls] == [{'lo': 1, 'hi': 3}, {'lo': 3, 'hi': 5}, {'lo': 5, 'hi': 6}]
+    assert 'WHERE e.id >= :lo AND e.id < :hi' in str(range_calls[0].args[0])
+    assert range_calls[0].kwargs['execution_options']['stream_results'] is True
+    mock_session.close.assert_called()
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_delta_export_filters_on_last_modified(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: (table, column) == ('events', 'last_modified'))
+    mock_session = MagicMock()
+    mock_session.execute.return_value.one.return_value = (4, 4)
+    mock_session.execute.return_value.mappings.return_value = [{'id': 4}]
+    mock_get_session.return_value = mock_session
+
+    rows = ts.get_events_export_rows(since='2024-03-01T08:30:00')
+
+    assert rows == [{'id': 4}]
+    bounds_call, range_call = mock_session.execute.call_args_list
+    assert 'WHERE e.last_modified >= :since' in str(bounds_call.args[0])
+    assert 'AND e.last_modified >= :since' in str(range_call.args[0])
+    assert range_call.args[1]['since'] == datetime.datetime(2024, 3, 1, 8, 30)
+
+
+def test_export_delta_takes_watermark_before_reading(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ts, 'export_watermark', lambda: calls.append('watermark') or '2024-03-02T00:00:00')
+    monkeypatch.setattr(ts, 'get_events_export_rows', lambda since: calls.append(since) or [{'id': 4}])
+
+    assert ts.get_events_export_delta('2024-03-01T08:30:00') == {
+        'rows': [{'id': 4}], 'watermark': '2024-03-02T00:00:00',
+    }
+    assert calls == ['watermark', '2024-03-01T08:30:00']
+
+
+def test_delta_export_falls_back_to_workflow_dates():
+    params = {}
+    sql = ts._export_delta_sql(datetime.datetime(2024, 3, 1, 8, 30), params)
+    assert 'e.reject_message' not in sql
+    assert 'e.review3_date >= :since_date' in sql and sql.count(' OR ') == 10
+    assert params == {'since_date': datetime.date(2024, 3, 1)}
+    assert ts._export_delta_sql(None, params) == ''
+    with pytest.raises(ts.ValidationError):
+        ts.iter_events_export_rows(since='not-a-date')
+
+
+def test_refresh_event_derived_data_touches_last_modified(monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: True)
+    session = MagicMock()
+    ts._refresh_event_derived_data(session, [3])
+    statement = str(session.execute.call_args_list[0].args[0])
+    assert statement.startswith('UPDATE events SET last_modified = CURRENT_TIMESTAMP WHERE id IN')
+    session.commit.assert_called_once()
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_pipeline_summary_counts_all_phases_in_one_query(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {'to_be_scrubbed': 4, 'to_be_screened': 2, 'to_be_assigned': 0,
+         'to_be_sent': None, 'to_be_reviewed': 7},
+    ]
+    mock_get_session.return_value = mock_session
+
+    summary = ts.get_pipeline_summary()
+
+    assert summary == {'to_be_scrubbed': 4, 'to_be_screened': 2, 'to_be_assigned': 0,
+                       'to_be_sent': 0, 'to_be_reviewed': 7}
+    assert mock_session.execute.call_count == 1
+    query = str(mock_session.execute.call_args.args[0])
+    assert query.count('SUM(CASE WHEN') == 5
+    assert 'GROUP BY' not in query
+    assert ts.PHASE_PREDICATES['to_be_sent'] in query
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_pipeline_summary_cached_until_events_change(mock_get_session):
+    mock_session = MagicMock()
+    row = {phase: 1 for phase in ts.PHASE_PREDICATES}
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [dict(row, site='UW')]
+    mock_get_session.return_value = mock_session
+
+    first = ts.get_pipeline_summary_cached(by_site=True)
+    first['UW']['to_be_sent'] = 99
+    assert ts.get_pipeline_summary_cached(by_site=True) == {'UW': row}
+    assert mock_session.execute.call_count == 1
+    assert "GROUP BY COALESCE(p.site, '')" in str(mock_session.execute.call_args.args[0])
+
+    ts.bump_table_version('events')
+    ts.get_pipeline_summary_cached(by_site=True)
+    assert mock_session.execute.call_count == 2
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_pipeline_summary_by_site_keys_missing_site_as_blank(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: (table, column) == ('events', 'site'))
+    mock_session = MagicMock()
+    row = {phase: 1 for phase in ts.PHASE_PREDICATES}
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        dict(row, site=None), dict(row, site='UW'),
+    ]
+    mock_get_session.return_value = mock_session
+
+    summary = ts.get_pipeline_summary(by_site=True)
+
+    assert summary == {'': row, 'UW': row}
+    query = str(mock_session.execute.call_args.args[0])
+    assert "SELECT COALESCE(e.site, '') AS site" in query
+    assert "GROUP BY COALESCE(e.site, '')" in query
+    # The route's jsonify sorts the keys, which fails on mixed None/str keys.
+    assert json.dumps(summary, sort_keys=True)
+
+
+@patch('flask_backend.table_service.TOTALS_MODE', 'separate')
+@patch('flask_backend.table_service.models.get_session')
+def test_site_filter_uses_events_site_without_join(mock_get_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_column', lambda table, column: (table, column) == ('events', 'site'))
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 0
+    mock_get_session.return_value = mock_session
+
+    ts.get_events_by_status_with_total('sent', 20, 0, None, 'UW')
+    page_query, count_query = [str(c.args[0]) for c in mock_session.execute.call_args_list]
+    assert 'e.site = :site' in page_query and 'e.site AS `Site`' in page_query
+    assert 'JOIN patients' not in page_query and 'JOIN patients' not in count_query
+
+    # site_patient_id searches still need the patients join.
+    ts.get_events_by_status_with_total('sent', 20, 0, 'UW12', 'UW')
+    assert 'JOIN patients p' in str(mock_session.execute.call_args_list[2].args[0])
+
+
+@patch('flask_backend.table_service.models.get_external_session', side_effect=RuntimeError('no external db'))
+@patch('flask_backend.table_service.models.get_session')
+def test_sync_event_sites_updates_changed_rows(mock_get_session, _mock_external):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.all.side_effect = [
+        [(1, 10, 'UW'), (2, 11, None), (3, 12, 'UAB')],
+        [(10, 'UW'), (11, 'JH'), (12, 'CWRU')],
+        [],
+    ]
+    mock_get_session.return_value = mock_session
+
+    assert ts.sync_event_sites(batch_size=3) == {'scanned': 3, 'updated': 2}
+    update = mock_session.execute.call_args_list[2]
+    assert str(update.args[0]) == 'UPDATE events SET site = :site WHERE id = :id'
+    assert update.args[1] == [{'id': 2, 'site': 'JH'}, {'id': 3, 'site': 'CWRU'}]
+    assert mock_session.execute.call_args_list[3].args[1] == {'last_id': 3, 'limit': 3}
+
+
+def _list_session():
+    session = MagicMock()
+    session.execute.return_value.mappings.return_value.all.return_value = []
+    session.execute.return_value.scalar.return_value = 0
+    return session
+
+
+@patch('flask_backend.table_service.models.get_read_engine', return_value=object())
+@patch('flask_backend.table_service.models.get_read_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_reads_use_replica_until_own_write(mock_get_session, mock_read_session, _engine):
+    primary, replica = _list_session(), _list_session()
+    mock_get_session.return_value = primary
+    mock_read_session.return_value = replica
+
+    token = ts.set_read_actor('user:alice')
+    try:
+        ts.get_events_by_status_with_total('sent', 20, 0)
+        assert replica.execute.called and not primary.execute.called
+
+        ts.bump_table_version('events')
+        ts.get_events_by_status_with_total('sent', 20, 0)
+        assert primary.execute.called
+    finally:
+        ts.reset_read_actor(token)
+
+    # Other actors keep reading from the replica.
+    token = ts.set_read_actor('user:bob')
+    try:
+        assert ts.get_read_session() is replica
+    finally:
+        ts.reset_read_actor(token)
+
+
+@patch('flask_backend.table_service.models.get_read_engine', return_value=object())
+@patch('flask_backend.table_service.models.get_read_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_replica_failure_falls_back_to_primary(mock_get_session, mock_read_session, _engine):
+    replica = MagicMock()
+    replica.connection.side_effect = RuntimeError('replica down')
+    mock_read_session.return_value = replica
+    mock_get_session.return_value = primary = MagicMock()
+
+    assert ts.get_read_session() is primary
+    replica.close.assert_called_once()
+    # The replica is not retried until the retry period has passed.
+    assert ts.get_read_session() is primary
+    assert mock_read_session.call_count == 1
+
+
+@patch('flask_backend.table_service.models.get_read_engine', return_value=None)
+@patch('flask_backend.table_service.models.get_session')
+def test_reads_use_primary_without_replica(mock_get_session, _engine):
+    mock_get_session.return_value = primary = MagicMock()
+    assert ts.get_read_session() is primary
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_request_sessions_are_shared_and_closed_once(mock_get_session):
+    mock_get_session.side_effect = lambda: MagicMock()
+    assert ts.get_session() is not ts.get_session()
+
+    token = ts.begin_request_sessions()
+    first, second = ts.get_session(), ts.get_session()
+    first.close()
+    assert first._session is second._session
+    assert not first._session.close.called
+    ts.end_request_sessions(token)
+    first._session.close.assert_called_once()
+    assert mock_get_session.call_count == 3
+
+
+@patch('flask_backend.table_service.models.get_session')
+def test_create_user_invalidates_cached_roles(mock_get_session):
+    mock_session = MagicMock()
+    mock_session.query.return_value.filter_by.return_value.first.return_value = SimpleNamespace(
+        id=1, username='alice', admin_flag=0, uploader_flag=0, reviewer_flag=1,
+        third_reviewer_flag=0, site='UW',
+    )
+    mock_get_session.return_value = mock_session
+
+    assert ts.get_auth_user('alice')['reviewer'] is True
+    ts.get_auth_user('alice')
+    assert mock_session.query.call_count == 1
+    assert ts.get_cache_stats()['auth_users']['hits'] == 1
+
+    ts.create_user({'username': 'alice', 'login': 'alice', 'admin': True})
+    ts.get_auth_user('alice')
+    assert mock_session.query.call_count == 2
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_patient_sites_cached_between_pages(mock_get_session, mock_get_external_session):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.side_effect = [
+        [{'id': 1, 'patient_id': 10}, {'id': 2, 'patient_id': 11}],
+        [{'id': 3, 'patient_id': 10}, {'id': 4, 'patient_id': 12}],
+        [{'id': 5, 'patient_id': 11}],
+    ]
+    mock_get_session.return_value = mock_session
+    mock_ext_session = MagicMock()
+    mock_ext_session.execute.return_value.mappings.return_value.all.side_effect = [
+        [{'id': 10, 'site': 'UW'}, {'id': 11, 'site': 'UAB'}],
+        [{'id': 12, 'site': 'JH'}],
+    ]
+    mock_get_external_session.return_value = mock_ext_session
+
+    ts.get_events_with_patient_site(2, 0)
+    rows = ts.get_events_with_patient_site(2, 2)
+    assert [r['site'] for r in rows] == ['UW', 'JH']
+    assert mock_ext_session.execute.call_args_list[1].args[1] == {'ids': [12]}
+
+    # Fully cached page: no external session at all.
+    assert ts.get_events_with_patient_site(2, 4)[0]['site'] == 'UAB'
+    assert mock_get_external_session.call_count == 2
+
+    assert ts.purge_cache('patient_sites') == ['patient_sites']
+    assert ts.get_cache_stats()['patient_sites']['size'] == 0
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_create_event_reuses_cached_patient(mock_get_session, mock_get_external_session):
+    mock_session = MagicMock()
+    mock_get_session.return_value = mock_session
+    mock_ext_session = MagicMock()
+    mock_ext_session.query.return_value.filter_by.return_value.first.return_value = SimpleNamespace(
+        id=10, site='UW'
+    )
+    mock_get_external_session.return_value = mock_ext_session
+
+    data = {'site_patient_id': 'P1', 'site': 'UW', 'event_date': '2024-01-15'}
+    assert ts.create_event(data)['patient_id'] == 10
+    assert ts.create_event(data)['patient_id'] == 10
+    assert mock_get_external_session.call_count == 1
+    assert ts.get_patient_sites([10]) == {10: 'UW'}
+
+
+@patch('flask_backend.table_service.SITE_LOOKUP_TIMEOUT', 0.05)
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_slow_site_lookup_returns_degraded_rows(mock_get_session, mock_get_external_session):
+    release = threading.Event()
+    mock_session = MagicMock()
+    mock_session.execute.return_value.mappings.return_value.all.return_value = [
+        {'id': 1, 'patient_id': 10}
+    ]
+    mock_get_session.return_value = mock_session
+    mock_ext_session = MagicMock()
+
+    def slow_lookup(*_args, **_kwargs):
+        release.wait(5)
+        return MagicMock(**{'mappings.return_value.all.return_value': [{'id': 10, 'site': 'UW'}]})
+
+    mock_ext_session.execute.side_effect = slow_lookup
+    mock_get_external_session.return_value = mock_ext_session
+
+    try:
+        rows = ts.get_events_with_patient_site(20, 0)
+        assert rows.degraded is True
+        assert rows == [{'id': 1, 'patient_id': 10, 'site': None}]
+    finally:
+        release.set()
+    ts._site_lookup_pool().submit(lambda: None).result(5)
+
+
+@patch('flask_backend.table_service.models.get_external_session', side_effect=RuntimeError('no external db'))
+@patch('flask_backend.table_service.models.get_session')
+def test_next_page_sites_are_prefetched(mock_get_session, _mock_external, monkeypatch):
+    monkeypatch.setattr(ts, 'SITE_PREFETCH', True)
+    sites = {10: 'UW', 11: 'UAB', 12: 'JH'}
+
+    def execute(stmt, params):
+        result = MagicMock()
+        sql = str(stmt)
+        if sql.startswith('SELECT patient_id'):
+            result.all.return_value = [(11,), (12,)]
+        elif sql.startswith('SELECT id, patient_id'):
+            result.mappings.return_value.all.return_value = [{'id': 1, 'patient_id': 10}]
+        else:
+            result.mappings.return_value.all.return_value = [
+                {'id': i, 'site': sites[i]} for i in params['ids']
+            ]
+        return result
+
+    mock_session = MagicMock()
+    mock_session.execute.side_effect = execute
+    mock_get_session.return_value = mock_session
+
+    rows = ts.get_events_with_patient_site(1, 0)
+    # Wait for the prefetch: it runs on its own worker alongside the lookup.
+    for _ in range(100):
+        if ts.get_cache_stats()['patient_sites']['size'] == 4:
+            break
+        time.sleep(0.01)
+    assert rows == [{'id': 1, 'patient_id': 10, 'site': 'UW'}] and not rows.degraded
+    next_page = [c for c in mock_session.execute.call_args_list if 'SELECT patient_id' in str(c.args[0])]
+    assert next_page[0].args[1] == {'after': 1, 'limit': 1}
+    assert 'WHERE id > :after ORDER BY id' in str(next_page[0].args[0])
+    assert 'OFFSET' not in str(next_page[0].args[0])
+    assert ts.get_patient_sites([11, 12]) == {11: 'UAB', 12: 'JH'}
+
+    # The next page is warm now, so paging back to this one reads nothing extra.
+    ts.get_events_with_patient_site(1, 0)
+    ts._site_prefetch_pool().submit(lambda: None).result(5)
+    assert len([c for c in mock_session.execute.call_args_list if 'SELECT patient_id' in str(c.args[0])]) == 1
+
+
+@patch('flask_backend.table_service.SITE_LOOKUP_TIMEOUT', 1)
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_slow_prefetch_does_not_starve_lookups(mock_get_session, mock_get_external_session, monkeypatch):
+    monkeypatch.setattr(ts, 'SITE_PREFETCH', True)
+    monkeypatch.setattr(ts, 'SITE_LOOKUP_WORKERS', 1)
+    monkeypatch.setattr(ts, '_site_pool', None)
+    release = threading.Event()
+    prefetches = []
+
+    def execute(stmt, params):
+        result = MagicMock()
+        if str(stmt).startswith('SELECT patient_id'):
+            prefetches.append(params)
+            release.wait(5)
+            result.all.return_value = []
+        else:
+            result.mappings.return_value.all.return_value = [{'id': 1, 'patient_id': 10}]
+        return result
+
+    mock_get_session.return_value.execute.side_effect = execute
+    mock_get_external_session.return_value.execute.return_value.mappings.return_value.all.return_value = [
+        {'id': 10, 'site': 'UW'}
+    ]
+    try:
+        first = ts.get_events_with_patient_site(1, 0)
+        second = ts.get_events_with_patient_site(1, 1)
+        assert [first.degraded, second.degraded] == [False, False]
+        # The second prefetch was skipped while the first was still running.
+        assert len(prefetches) == 1
+    finally:
+        release.set()
+    ts._site_prefetch_pool().submit(lambda: None).result(5)
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_no_prefetch_while_breaker_open(mock_get_session, _mock_external, monkeypatch):
+    monkeypatch.setattr(ts, 'SITE_PREFETCH', True)
+    def execute(stmt, params=None):
+        result = MagicMock()
+        if str(stmt).startswith('SELECT id, patient_id'):
+            result.mappings.return_value.all.return_value = [{'id': 1, 'patient_id': 10}]
+        else:
+            result.mappings.return_value.all.return_value = [{'id': 10, 'site': 'UW'}]
+        return result
+
+    mock_get_session.return_value.execute.side_effect = execute
+    for _ in range(ts.external_breaker.failure_threshold):
+        ts.external_breaker.record_failure()
+    ts.get_events_with_patient_site(1, 0)
+    ts._site_prefetch_pool().submit(lambda: None).result(5)
+    assert not any('SELECT patient_id' in str(c.args[0])
+                   for c in mock_get_session.return_value.execute.call_args_list)
+
+
+def _patient_row(pid, site, last_update=datetime.datetime(2024, 5, 1, 12, 0)):
+    return {'id': pid, 'site_patient_id': f'P{pid}', 'site': site,
+            'last_update': last_update, 'create_date': None}
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_sync_patients_pulls_rows_since_watermark(mock_get_session, mock_get_external_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_table', lambda name: name == 'sync_watermarks')
+    local = MagicMock()
+    local.execute.return_value.scalar.return_value = datetime.datetime(2024, 5, 1, 11, 0)
+    mock_get_session.return_value = local
+    ext = MagicMock()
+    ext.execute.return_value.scalar.return_value = datetime.datetime(2024, 5, 2, 8, 0)
+    ext.execute.return_value.mappings.return_value.all.side_effect = [
+        [_patient_row(10, 'UW'), _patient_row(11, 'UAB')],
+        [_patient_row(12, 'JH', None)],
+        [],
+    ]
+    mock_get_external_session.return_value = ext
+    ts._cache_patient(10, 'CWRU')
+
+    assert ts.sync_patients(batch_size=2) == {'synced': 3, 'watermark': '2024-05-02T08:00:00'}
+
+    pulls = [c for c in ext.execute.call_args_list if 'FROM patients WHERE' in str(c.args[0])]
+    assert 'last_update >= :since' in str(pulls[0].args[0])
+    assert pulls[0].args[1]['since'] == datetime.datetime(2024, 5, 1, 10, 59)
+    assert [c.args[1]['last_id'] for c in pulls] == [0, 11, 12]
+    upserts = [c.args[1] for c in local.execute.call_args_list if 'ON DUPLICATE KEY' in str(c.args[0])]
+    assert [v['id'] for v in upserts[0]] == [10, 11]
+    assert upserts[1][0]['last_update'] == '0000-00-00 00:00:00'
+    assert upserts[-1] == {'watermark': datetime.datetime(2024, 5, 2, 8, 0), 'synced': 3}
+    # The stale cached site was dropped.
+    assert ts.get_cache_stats()['patient_sites']['size'] == 0
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_full_patients_sync_ignores_watermark(mock_get_session, mock_get_external_session, monkeypatch):
+    monkeypatch.setattr(ts, '_has_table', lambda name: name == 'sync_watermarks')
+    mock_get_session.return_value = local = MagicMock()
+    ext = MagicMock()
+    ext.execute.return_value.mappings.return_value.all.return_value = []
+    mock_get_external_session.return_value = ext
+
+    assert ts.sync_patients(full=True)['synced'] == 0
+    assert not any('SELECT watermark' in str(c.args[0]) for c in local.execute.call_args_list)
+    assert not any('last_update >=' in str(c.args[0]) for c in ext.execute.call_args_list)
+
+
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_verify_patients_mirror(mock_get_session, mock_get_external_session):
+    mock_get_session.return_value.execute.return_value.one.return_value = (3, 12345)
+    mock_get_external_session.return_value.execute.return_value.one.return_value = (4, 999)
+    result = ts.verify_patients_mirror()
+    assert result['local'] == {'count': 3, 'checksum': 12345}
+    assert result['match'] is False
+
+
+@patch('flask_backend.table_service.PATIENTS_SOURCE', 'local')
+@patch('flask_backend.table_service.models.get_external_session')
+@patch('flask_backend.table_service.models.get_session')
+def test_create_event_stamps_and_mirrors_new_patient(mock_get_session, mock_get_external_session):
+    local = MagicMock()
+    local.query.return_value.filter_by.return_value.first.return_value = None
+    mock_get_session.return_value = local
+    ext = MagicMock()
+    ext.query.return_value.filter_by.return_value.first.return_value = None
+    ext.add.side_effect = lambda patient: setattr(patient, 'id', 42)
+    mock_get_external_session.return_value = ext
+
+    ts.create_event({'site_patient_id': 'P9', 'site': 'UW', 'event_date': '2024-01-15'})
+
+    patient = ext.add.call_args.args[0]
+    assert patient.last_update is not None and patient.create_date == patient.last_update
+    upserts = [c.args[1] for c in local.execute.call_args_list if 'ON DUPLICATE KEY' in str(c.args[0])]
+    assert upserts == [{'id': 42, 'site_patient_id': 'P9', 'site': 'UW',
+                        'last_update': patient.last_update, 'create_date': patient.create_date}]
@@ -4,11 +4,12 @@ import DataTable from '../components/DataTable'
 const API_BASE = import.meta.env.VITE_API_URL || ''
 const PAGE_SIZE = 20
 
-function TableSection({ title, endpoint, columns, renderActions, augmentRows, mergeEndpoints }) {
+function TableSection({ title, endpoint, columns, renderActions, augmentRows }) {
   const [rows, setRows] = useState([])
   const [totalCount, setTotalCount] = useState(null)
   const [open, setOpen] = useState(false)
   const [search, setSearch] = useState('')
+  const [matchAnywhere, setMatchAnywhere] = useState(false)
   const [siteFilter, setSiteFilter] = useState('')
   const [colFilters, setColFilters] = useState({})
 
@@ -18,29 +19,18 @@ function TableSection({ title, endpoint, columns, renderActions, augmentRows, me
       offset: String((p - 1) * PAGE_SIZE),
     })
     if (search) params.set('q', search)
+    if (search && matchAnywhere) params.set('match', 'contains')
     if (siteFilter) params.set('site', siteFilter)
-    const urlFor = (ep) => `${API_BASE}${ep}?${params.toString()}`
-    const endpoints = [endpoint, ...(mergeEndpoints || [])]
-    Promise.all(endpoints.map((ep) => fetch(urlFor(ep), { credentials: 'include' })))
-      .then(async (responses) => {
-        for (const res of responses) {
-          if (!res.ok) {
-            if (res.status === 401) alert('Login required');
-            else if (res.status === 403) alert('Not authorized');
-            throw new Error('auth')
-          }
-        }
-        const payloads = await Promise.all(responses.map((r) => r.json()))
-        const allRows = payloads.flatMap((pl) => (pl && pl.data) ? pl.data : [])
-        const dedup = []
-        const seen = new Set()
-        for (const r of allRows) {
-          const id = r['ID'] || r.id
-          if (id == null || seen.has(id)) continue
-          seen.add(id)
-          dedup.push(r)
+    const sep = endpoint.includes('?') ? '&' : '?'
+    fetch(`${API_BASE}${endpoint}${sep}${params.toString()}`, { credentials: 'include' })
+      .then(async (res) => {
+        if (!res.ok) {
+          if (res.status === 401) alert('Login required');
+          else if (res.status === 403) alert('Not authorized');
+          throw new Error('auth')
         }
-        let data = dedup
+        const payload = await res.json()
+        let data = (payload && payload.data) ? payload.data : []
         if (augmentRows) {
           try {
             const augmented = await augmentRows(data)
@@ -48,17 +38,7 @@ function TableSection({ title, endpoint, columns, renderActions, augmentRows, me
           } catch {}
         }
         setRows(data)
-        // Derive totalCount from API payloads when available. For merged endpoints,
-        // sum totals (assuming disjoint result sets per endpoint).
-        const totals = payloads.map((pl) => (pl && typeof pl.total === 'number') ? pl.total : null)
-        if (totals.every((t) => typeof t === 'number')) {
-          const sum = totals.reduce((a, b) => a + (b || 0), 0)
-          setTotalCount(sum)
-        } else if (typeof (payloads[0] && payloads[0].total) === 'number') {
-          setTotalCount(payloads[0].total)
-        } else {
-          setTotalCount(null)
-        }
+        setTotalCount((payload && typeof payload.total === 'number') ? payload.total : null)
       })
       .catch(() => {})
   }
@@ -72,7 +52,7 @@ function TableSection({ title, endpoint, columns, renderActions, augmentRows, me
   useEffect(() => {
     if (open) fetchPage(1)
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [endpoint, search, siteFilter, open])
+  }, [endpoint, search, matchAnywhere, siteFilter, open])
 
   const headers = (columns && columns.length) ? columns : (rows[0] ? Object.keys(rows[0]) : [])
   const filteredByColumns = rows.filter((r) => {
@@ -99,10 +79,18 @@ function TableSection({ title, endpoint, columns, renderActions, augmentRows, me
             <div style={{ display: 'flex', gap: '8px' }}>
               <input
                 type="text"
-                placeholder="Search all columns (ID, dates, criteria, site, etc.) — e.g., 'UW' or '2024-01-15'"
+                placeholder="Event ID, patient ID or date — e.g., '1234' or '2024-01-15'"
                 value={search}
                 onChange={(e) => setSearch(e.target.value)}
               />
+              <label style={{ whiteSpace: 'nowrap' }}>
+                <input
+                  type="checkbox"
+                  checked={matchAnywhere}
+                  onChange={(e) => setMatchAnywhere(e.target.checked)}
+                />
+                {' '}Match anywhere (slower)
+              </label>
               {Array.from(new Set(rows.map((r) => r['Site'] || r['site']).filter(Boolean))).length > 0 && (
                 <select value={siteFilter} onChange={(e) => setSiteFilter(e.target.value)}>
                   <option value="">All Sites</option>
@@ -191,8 +179,7 @@ function EventViewAll() {
       />
       <TableSection
         title="Not Yet Reviewed"
-        endpoint="/api/events/by_status/sent"
-        mergeEndpoints={["/api/events/by_status/reviewer1_done", "/api/events/by_status/reviewer2_done"]}
+        endpoint="/api/events/by_status?status=sent,reviewer1_done,reviewer2_done"
         columns={['Event Number', 'Event Date', 'Sent/Last Review', 'Yet to review']}
         augmentRows={async (rows) => {
           const fetchDetails = async (id) => {
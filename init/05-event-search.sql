@@ -0,0 +1,11 @@
+-- Trigram search index for the event worklists' `q` filter.
+-- One row per distinct lowercase 3-character substring of each searchable
+-- field (event id/patient id, workflow dates, patient site/site_patient_id,
+-- criteria name/value). Populate or repair it with:
+--   flask --app flask_backend.app rebuild-search-index
+CREATE TABLE IF NOT EXISTS `event_search` (
+  `event_id` int(11) NOT NULL,
+  `gram` char(3) CHARACTER SET utf8 COLLATE utf8_bin NOT NULL,
+  PRIMARY KEY (`gram`, `event_id`),
+  KEY `event_id` (`event_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
@@ -0,0 +1,17 @@
+-- Precomputed per-event criteria list shown in the worklists' `Criteria`
+-- column, so list queries no longer join `criterias` and GROUP BY.
+-- Maintained by the triggers of init/15 for every writer (the worklists
+-- only read it once those exist); rebuild or verify with:
+--   flask --app flask_backend.app rebuild-criteria-summary
+--   flask --app flask_backend.app check-criteria-summary
+CREATE TABLE IF NOT EXISTS `event_criteria_summary` (
+  `event_id` int(11) NOT NULL,
+  `criteria` text,
+  PRIMARY KEY (`event_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
+
+INSERT INTO `event_criteria_summary` (`event_id`, `criteria`)
+SELECT `event_id`, GROUP_CONCAT(`name` ORDER BY `name` SEPARATOR ', ')
+FROM `criterias`
+WHERE NOT EXISTS (SELECT 1 FROM `event_criteria_summary` LIMIT 1)
+GROUP BY `event_id`;
@@ -0,0 +1,8 @@
+-- Change tracking for the delta export (`/api/events/export.csv?since=`).
+-- The database stamps `last_modified` whenever an events row changes; the
+-- backend write paths also stamp it after criteria edits. Existing rows take
+-- the time of this migration, so the first delta pull after it is a full one.
+ALTER TABLE `events`
+  ADD COLUMN IF NOT EXISTS `last_modified` timestamp NOT NULL
+    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD KEY IF NOT EXISTS `last_modified` (`last_modified`);
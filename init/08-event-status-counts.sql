@@ -0,0 +1,54 @@
+-- Event counts per status and patient site, read by
+-- `/api/events/status_summary` instead of `GROUP BY status` over `events`.
+-- Kept current by the triggers below for every writer (backend and legacy
+-- app alike). `events` is MyISAM, so a trigger's counter update is not atomic
+-- with the event write: a failed statement can leave a counter off by one.
+-- init/13 re-keys the counters on `events.site`. Recount periodically (e.g.
+-- nightly from cron) with:
+--   flask --app flask_backend.app check-status-counts --fix
+CREATE TABLE IF NOT EXISTS `event_status_counts` (
+  `status` varchar(32) NOT NULL,
+  `site` varchar(20) NOT NULL DEFAULT '',
+  `count` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`status`, `site`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
+
+DELIMITER ;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_insert` AFTER INSERT ON `events`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+  VALUES (NEW.`status`, COALESCE((SELECT `site` FROM `patients` WHERE `id` = NEW.`patient_id`), ''), 1)
+  ON DUPLICATE KEY UPDATE `count` = `count` + 1;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_update` AFTER UPDATE ON `events`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`status` <=> OLD.`status`) OR NOT (NEW.`patient_id` <=> OLD.`patient_id`) THEN
+    UPDATE `event_status_counts` SET `count` = `count` - 1
+    WHERE `status` = OLD.`status`
+      AND `site` = COALESCE((SELECT `site` FROM `patients` WHERE `id` = OLD.`patient_id`), '');
+    INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+    VALUES (NEW.`status`, COALESCE((SELECT `site` FROM `patients` WHERE `id` = NEW.`patient_id`), ''), 1)
+    ON DUPLICATE KEY UPDATE `count` = `count` + 1;
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_delete` AFTER DELETE ON `events`
+FOR EACH ROW
+BEGIN
+  UPDATE `event_status_counts` SET `count` = `count` - 1
+  WHERE `status` = OLD.`status`
+    AND `site` = COALESCE((SELECT `site` FROM `patients` WHERE `id` = OLD.`patient_id`), '');
+END;;
+
+DELIMITER ;
+
+INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+SELECT e.`status`, COALESCE(p.`site`, ''), COUNT(*)
+FROM `events` e
+LEFT JOIN `patients` p ON p.`id` = e.`patient_id`
+WHERE NOT EXISTS (SELECT 1 FROM `event_status_counts` LIMIT 1)
+GROUP BY e.`status`, COALESCE(p.`site`, '');
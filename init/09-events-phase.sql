@@ -0,0 +1,26 @@
+-- Workflow phase of each event as STORED generated columns, so the phase
+-- worklists are equality lookups on one composite index instead of
+-- date-nullness scans. `phase` names the worklist an event waits in (the
+-- furthest one along when dates were filled out of order) and `phase_date`
+-- is that worklist's sort date (NULL for the worklists sorted by id).
+-- Must stay in step with PHASE_PREDICATES in flask_backend/table_service.py.
+ALTER TABLE `events`
+  ADD COLUMN IF NOT EXISTS `phase` varchar(16) GENERATED ALWAYS AS (
+    CASE
+      WHEN `send_date` IS NOT NULL AND (`review1_date` IS NULL OR `review2_date` IS NULL) THEN 'to_be_reviewed'
+      WHEN `assign_date` IS NOT NULL AND `send_date` IS NULL THEN 'to_be_sent'
+      WHEN `screen_date` IS NOT NULL AND `assign_date` IS NULL THEN 'to_be_assigned'
+      WHEN `scrub_date` IS NOT NULL AND `screen_date` IS NULL THEN 'to_be_screened'
+      WHEN `upload_date` IS NOT NULL AND `scrub_date` IS NULL THEN 'to_be_scrubbed'
+    END
+  ) STORED,
+  ADD COLUMN IF NOT EXISTS `phase_date` date GENERATED ALWAYS AS (
+    CASE
+      WHEN `send_date` IS NOT NULL AND (`review1_date` IS NULL OR `review2_date` IS NULL) THEN NULL
+      WHEN `assign_date` IS NOT NULL AND `send_date` IS NULL THEN NULL
+      WHEN `screen_date` IS NOT NULL AND `assign_date` IS NULL THEN NULL
+      WHEN `scrub_date` IS NOT NULL AND `screen_date` IS NULL THEN `scrub_date`
+      WHEN `upload_date` IS NOT NULL AND `scrub_date` IS NULL THEN `upload_date`
+    END
+  ) STORED,
+  ADD KEY IF NOT EXISTS `phase` (`phase`, `phase_date` DESC, `id`);
@@ -0,0 +1,35 @@
+-- Composite indexes for the access patterns in flask_backend/table_service.py.
+-- Safe to re-run; each applied pack is recorded in `schema_migrations`.
+-- Check the query plans against a seeded database with:
+--   flask --app flask_backend.app explain-queries
+CREATE TABLE IF NOT EXISTS `schema_migrations` (
+  `version` varchar(64) NOT NULL,
+  `applied_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
+
+-- Status worklists (`status = ? ORDER BY id`), smart date search and the
+-- date predicates used when `events.phase` is absent.
+ALTER TABLE `events`
+  ADD KEY IF NOT EXISTS `status_id` (`status`, `id`),
+  ADD KEY IF NOT EXISTS `event_date_id` (`event_date`, `id`),
+  ADD KEY IF NOT EXISTS `upload_scrub` (`upload_date`, `scrub_date`),
+  ADD KEY IF NOT EXISTS `scrub_screen` (`scrub_date`, `screen_date`),
+  ADD KEY IF NOT EXISTS `screen_assign` (`screen_date`, `assign_date`),
+  ADD KEY IF NOT EXISTS `assign_send` (`assign_date`, `send_date`),
+  ADD KEY IF NOT EXISTS `send_reviews` (`send_date`, `review1_date`, `review2_date`);
+
+-- Site filters and the site_patient_id prefix search / patient lookup.
+ALTER TABLE `patients`
+  ADD KEY IF NOT EXISTS `site_id` (`site`, `id`),
+  ADD KEY IF NOT EXISTS `site_patient_id` (`site_patient_id`, `site`);
+
+-- Criteria pivots and summaries read by event, then name.
+ALTER TABLE `criterias`
+  ADD KEY IF NOT EXISTS `event_id_name` (`event_id`, `name`);
+
+-- Export joins reviews on (event_id, reviewer_id).
+ALTER TABLE `reviews`
+  ADD KEY IF NOT EXISTS `event_reviewer` (`event_id`, `reviewer_id`);
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('10-composite-indexes');
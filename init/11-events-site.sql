@@ -0,0 +1,14 @@
+-- Denormalized patient site on events so worklists filter and show the site
+-- without joining `patients`. Set by the backend when events are created;
+-- backfill or resync (e.g. from the external patient database) with:
+--   flask --app flask_backend.app sync-event-sites
+ALTER TABLE `events`
+  ADD COLUMN IF NOT EXISTS `site` varchar(20) DEFAULT NULL,
+  ADD KEY IF NOT EXISTS `site_id` (`site`, `id`);
+
+UPDATE `events` e
+JOIN `patients` p ON p.`id` = e.`patient_id`
+SET e.`site` = p.`site`
+WHERE e.`site` IS NULL;
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('11-events-site');
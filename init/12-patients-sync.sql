@@ -0,0 +1,17 @@
+-- Incremental mirror of the external patients database into `patients`.
+-- `sync_watermarks` remembers, per sync job, the external database time a
+-- run started; the next run only pulls rows with a newer `last_update`:
+--   flask --app flask_backend.app sync-patients [--full] [--verify]
+-- The external `patients` table needs the same `last_update` index.
+CREATE TABLE IF NOT EXISTS `sync_watermarks` (
+  `name` varchar(64) NOT NULL,
+  `watermark` datetime DEFAULT NULL,
+  `rows_synced` int(10) unsigned NOT NULL DEFAULT 0,
+  `synced_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
+
+ALTER TABLE `patients`
+  ADD KEY IF NOT EXISTS `last_update_id` (`last_update`, `id`);
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('12-patients-sync');
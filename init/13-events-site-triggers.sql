@@ -0,0 +1,71 @@
+-- Keep `events.site` (init/11) filled for every writer: events inserted by
+-- the legacy app, or moved to another patient, take the patient's site.
+-- `event_status_counts` (init/08) is keyed on the same `events.site`, so the
+-- status summary and the pipeline summary count sites from one source.
+DELIMITER ;;
+
+CREATE OR REPLACE TRIGGER `events_site_insert` BEFORE INSERT ON `events`
+FOR EACH ROW
+BEGIN
+  IF NEW.`site` IS NULL THEN
+    SET NEW.`site` = (SELECT `site` FROM `patients` WHERE `id` = NEW.`patient_id`);
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_site_update` BEFORE UPDATE ON `events`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`patient_id` <=> OLD.`patient_id`) AND NEW.`site` <=> OLD.`site` THEN
+    SET NEW.`site` = (SELECT `site` FROM `patients` WHERE `id` = NEW.`patient_id`);
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_insert` AFTER INSERT ON `events`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+  VALUES (NEW.`status`, COALESCE(NEW.`site`, ''), 1)
+  ON DUPLICATE KEY UPDATE `count` = `count` + 1;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_update` AFTER UPDATE ON `events`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`status` <=> OLD.`status`) OR NOT (NEW.`site` <=> OLD.`site`) THEN
+    UPDATE `event_status_counts` SET `count` = `count` - 1
+    WHERE `status` = OLD.`status` AND `site` = COALESCE(OLD.`site`, '');
+    INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+    VALUES (NEW.`status`, COALESCE(NEW.`site`, ''), 1)
+    ON DUPLICATE KEY UPDATE `count` = `count` + 1;
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `events_status_counts_delete` AFTER DELETE ON `events`
+FOR EACH ROW
+BEGIN
+  UPDATE `event_status_counts` SET `count` = `count` - 1
+  WHERE `status` = OLD.`status` AND `site` = COALESCE(OLD.`site`, '');
+END;;
+
+DELIMITER ;
+
+UPDATE `events` e
+JOIN `patients` p ON p.`id` = e.`patient_id`
+SET e.`site` = p.`site`
+WHERE e.`site` IS NULL;
+
+-- Re-key the stored counts on `events.site` the first time this runs.
+DELETE FROM `event_status_counts`
+WHERE NOT EXISTS (
+  SELECT 1 FROM `schema_migrations` WHERE `version` = '13-events-site-triggers'
+);
+
+INSERT INTO `event_status_counts` (`status`, `site`, `count`)
+SELECT `status`, COALESCE(`site`, ''), COUNT(*)
+FROM `events`
+WHERE NOT EXISTS (
+  SELECT 1 FROM `schema_migrations` WHERE `version` = '13-events-site-triggers'
+)
+GROUP BY `status`, COALESCE(`site`, '');
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('13-events-site-triggers');
@@ -0,0 +1,76 @@
+-- Events whose `event_search` rows (init/05) may be stale. The triggers below
+-- queue an event whenever a searchable field changes, whoever writes it
+-- (backend, legacy app or the patients sync). The `q` search confirms queued
+-- events with its LIKE checks instead of trusting their trigrams, so a stale
+-- index never hides a match. Reindex and drain the queue with:
+--   flask --app flask_backend.app rebuild-search-index --pending
+CREATE TABLE IF NOT EXISTS `event_search_pending` (
+  `id` bigint(20) unsigned NOT NULL AUTO_INCREMENT,
+  `event_id` int(11) NOT NULL,
+  PRIMARY KEY (`id`),
+  KEY `event_id` (`event_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_general_ci;
+
+DELIMITER ;;
+
+CREATE OR REPLACE TRIGGER `events_search_pending_insert` AFTER INSERT ON `events`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_search_pending` (`event_id`) VALUES (NEW.`id`);
+END;;
+
+CREATE OR REPLACE TRIGGER `events_search_pending_update` AFTER UPDATE ON `events`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`patient_id` <=> OLD.`patient_id`)
+     OR NOT (NEW.`event_date` <=> OLD.`event_date`)
+     OR NOT (NEW.`add_date` <=> OLD.`add_date`)
+     OR NOT (NEW.`upload_date` <=> OLD.`upload_date`)
+     OR NOT (NEW.`scrub_date` <=> OLD.`scrub_date`) THEN
+    INSERT INTO `event_search_pending` (`event_id`) VALUES (NEW.`id`);
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_search_pending_insert` AFTER INSERT ON `criterias`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_search_pending` (`event_id`) VALUES (NEW.`event_id`);
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_search_pending_update` AFTER UPDATE ON `criterias`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_search_pending` (`event_id`) VALUES (NEW.`event_id`);
+  IF NOT (NEW.`event_id` <=> OLD.`event_id`) THEN
+    INSERT INTO `event_search_pending` (`event_id`) VALUES (OLD.`event_id`);
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_search_pending_delete` AFTER DELETE ON `criterias`
+FOR EACH ROW
+BEGIN
+  INSERT INTO `event_search_pending` (`event_id`) VALUES (OLD.`event_id`);
+END;;
+
+CREATE OR REPLACE TRIGGER `patients_search_pending_update` AFTER UPDATE ON `patients`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`site` <=> OLD.`site`)
+     OR NOT (NEW.`site_patient_id` <=> OLD.`site_patient_id`) THEN
+    INSERT INTO `event_search_pending` (`event_id`)
+    SELECT `id` FROM `events` WHERE `patient_id` = NEW.`id`;
+  END IF;
+END;;
+
+DELIMITER ;
+
+-- Events written since the index was last built have no trigram rows yet.
+INSERT INTO `event_search_pending` (`event_id`)
+SELECT e.`id`
+FROM `events` e
+WHERE NOT EXISTS (SELECT 1 FROM `event_search` es WHERE es.`event_id` = e.`id`)
+  AND NOT EXISTS (
+    SELECT 1 FROM `schema_migrations` WHERE `version` = '14-event-search-pending'
+  );
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('14-event-search-pending');
@@ -0,0 +1,63 @@
+-- Keep `event_criteria_summary` (init/06) current for every writer: the
+-- triggers below recompute an event's summary whenever one of its criteria
+-- is inserted, updated or deleted, including writes from the legacy app, and
+-- drop the summary when the event itself is deleted. The backend's own
+-- refresh and `check-criteria-summary --fix` remain as a repair path.
+DELIMITER ;;
+
+CREATE OR REPLACE PROCEDURE `refresh_event_criteria_summary` (IN `p_event_id` int)
+BEGIN
+  DELETE FROM `event_criteria_summary` WHERE `event_id` = p_event_id;
+  INSERT INTO `event_criteria_summary` (`event_id`, `criteria`)
+  SELECT `event_id`, GROUP_CONCAT(`name` ORDER BY `name` SEPARATOR ', ')
+  FROM `criterias`
+  WHERE `event_id` = p_event_id
+  GROUP BY `event_id`;
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_summary_insert` AFTER INSERT ON `criterias`
+FOR EACH ROW
+BEGIN
+  CALL `refresh_event_criteria_summary`(NEW.`event_id`);
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_summary_update` AFTER UPDATE ON `criterias`
+FOR EACH ROW
+BEGIN
+  IF NOT (NEW.`name` <=> OLD.`name`) OR NOT (NEW.`event_id` <=> OLD.`event_id`) THEN
+    CALL `refresh_event_criteria_summary`(NEW.`event_id`);
+    IF NOT (NEW.`event_id` <=> OLD.`event_id`) THEN
+      CALL `refresh_event_criteria_summary`(OLD.`event_id`);
+    END IF;
+  END IF;
+END;;
+
+CREATE OR REPLACE TRIGGER `criterias_summary_delete` AFTER DELETE ON `criterias`
+FOR EACH ROW
+BEGIN
+  CALL `refresh_event_criteria_summary`(OLD.`event_id`);
+END;;
+
+CREATE OR REPLACE TRIGGER `events_criteria_summary_delete` AFTER DELETE ON `events`
+FOR EACH ROW
+BEGIN
+  DELETE FROM `event_criteria_summary` WHERE `event_id` = OLD.`id`;
+END;;
+
+DELIMITER ;
+
+-- Summaries may have drifted before the triggers existed; rebuild them once.
+DELETE FROM `event_criteria_summary`
+WHERE NOT EXISTS (
+  SELECT 1 FROM `schema_migrations` WHERE `version` = '15-event-criteria-summary-triggers'
+);
+
+INSERT INTO `event_criteria_summary` (`event_id`, `criteria`)
+SELECT `event_id`, GROUP_CONCAT(`name` ORDER BY `name` SEPARATOR ', ')
+FROM `criterias`
+WHERE NOT EXISTS (
+  SELECT 1 FROM `schema_migrations` WHERE `version` = '15-event-criteria-summary-triggers'
+)
+GROUP BY `event_id`;
+
+INSERT IGNORE INTO `schema_migrations` (`version`) VALUES ('15-event-criteria-summary-triggers');